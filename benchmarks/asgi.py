@@ -0,0 +1,97 @@
+"""
+Compares the per-request overhead of the ASGI application in :mod:`venom.rpc.comms.asgi` against the aiohttp
+application in :mod:`venom.rpc.comms.aiohttp`, without a network or HTTP parser in between.
+
+Usage::
+
+    python benchmarks/asgi.py [requests]
+
+The ASGI application is called directly with in-memory ``receive`` and ``send`` callables; the aiohttp application
+handles a request created with :func:`aiohttp.test_utils.make_mocked_request`.
+"""
+import asyncio
+import json
+import sys
+import time
+
+from venom import Message
+from venom.rpc import Service, Venom, http
+from venom.rpc.comms import aiohttp as http_transport
+from venom.rpc.comms.asgi import create_asgi_app
+
+BODY = json.dumps({'text': 'venom'}).encode('utf-8')
+
+
+class EchoRequest(Message):
+    id: int
+    text: str
+
+
+class EchoService(Service):
+    class Meta:
+        name = 'echo'
+
+    @http.POST('./{id}', request=EchoRequest)
+    def echo(self, request: EchoRequest) -> EchoRequest:
+        return request
+
+
+def create_venom():
+    venom = Venom()
+    venom.add(EchoService)
+    return venom.freeze()
+
+
+async def measure_asgi(count: int) -> float:
+    app = create_asgi_app(create_venom())
+    scope = {'type': 'http', 'method': 'POST', 'path': '/echo/1', 'raw_path': b'/echo/1', 'query_string': b''}
+    request = {'type': 'http.request', 'body': BODY, 'more_body': False}
+
+    async def receive():
+        return request
+
+    async def send(message):
+        pass
+
+    start = time.perf_counter()
+    for _ in range(count):
+        await app(scope, receive, send)
+    return time.perf_counter() - start
+
+
+class _Payload(object):
+    def __init__(self) -> None:
+        self._chunks = [BODY]
+
+    async def readany(self) -> bytes:
+        return self._chunks.pop() if self._chunks else b''
+
+
+async def measure_aiohttp(count: int) -> float:
+    from aiohttp.test_utils import make_mocked_request
+
+    app = http_transport.create_app(create_venom())
+    app.freeze()
+    # the mocked request is expensive to create, so one is reused; its body is read once and then cached
+    request = make_mocked_request('POST', '/echo/1', headers={'Content-Type': 'application/json'}, app=app,
+                                  payload=_Payload())
+
+    start = time.perf_counter()
+    for _ in range(count):
+        response = await app._handle(request)
+        assert response.status == 200, response.status
+    return time.perf_counter() - start
+
+
+def main(count: int = 20000):
+    loop = asyncio.get_event_loop()
+    print(f'{count} requests')
+
+    for name, measure in (('aiohttp', measure_aiohttp), ('asgi', measure_asgi)):
+        loop.run_until_complete(measure(count // 10))  # warm up
+        elapsed = loop.run_until_complete(measure(count))
+        print(f'{name:>8}: {count / elapsed:8.0f} requests/s, {elapsed / count * 1e6:6.1f} us per request')
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,171 @@
+"""
+Compares throughput and latency of the gRPC transport built on ``grpc.aio`` against the previous implementation built
+on the deprecated ``grpc.beta`` API, using a server on localhost.
+
+Usage::
+
+    python benchmarks/grpc_transport.py [concurrent calls] [rounds]
+
+The previous implementation is reproduced below: its server hopped from a gRPC pool thread to a separate event loop
+thread for every call and its client ran blocking calls in the default executor. Each server runs in a forked process.
+"""
+import asyncio
+import os
+import signal
+import statistics
+import sys
+import time
+from functools import partial
+from threading import Thread
+
+from venom import Message
+from venom.protocol import JSONProtocol
+from venom.rpc import Service, Stub, Venom, rpc
+from venom.rpc.comms.grpc import Client, create_server
+
+PORT = 50071
+
+
+class EchoRequest(Message):
+    text: str
+
+
+class EchoStub(Stub):
+    class Meta:
+        name = 'echo'
+
+    @rpc
+    def echo(self, request: EchoRequest) -> EchoRequest:
+        raise NotImplementedError
+
+
+class EchoService(Service):
+    class Meta:
+        name = 'echo'
+
+    @rpc
+    async def echo(self, request: EchoRequest) -> EchoRequest:
+        await asyncio.sleep(0.001)
+        return request
+
+
+def create_venom():
+    venom = Venom()
+    venom.add(EchoService)
+    return venom
+
+
+def serve_aio():
+    async def serve():
+        server = create_server(create_venom())
+        server.add_insecure_port(f'127.0.0.1:{PORT}')
+        await server.start()
+        await server.wait_for_termination()
+
+    asyncio.set_event_loop(asyncio.new_event_loop())
+    asyncio.get_event_loop().run_until_complete(serve())
+
+
+def serve_beta():
+    from grpc.beta import implementations
+    from grpc.framework.interfaces.face import utilities
+
+    venom = create_venom()
+    loop = asyncio.new_event_loop()
+
+    def grpc_unary_unary(method, request, context):
+        instance = venom.get_instance(method.service)
+        return asyncio.run_coroutine_threadsafe(method.invoke(instance, request), loop).result()
+
+    request_deserializers, response_serializers, method_implementations = {}, {}, {}
+    for entry in venom.dispatch_table:
+        name = (entry.service.__meta__.name, entry.method.name)
+        request_protocol, response_protocol = entry.protocols(JSONProtocol)
+        request_deserializers[name] = request_protocol.unpack
+        response_serializers[name] = response_protocol.pack
+        method_implementations[name] = utilities.unary_unary_inline(partial(grpc_unary_unary, entry.method))
+
+    options = implementations.server_options(request_deserializers=request_deserializers,
+                                             response_serializers=response_serializers)
+    server = implementations.server(method_implementations, options=options)
+    server.add_insecure_port(f'127.0.0.1:{PORT}')
+
+    Thread(target=loop.run_forever, daemon=True).start()
+    server.start()
+    signal.pause()
+
+
+class BetaClient(object):
+    def __init__(self):
+        from grpc.beta import implementations
+
+        channel = implementations.insecure_channel('127.0.0.1', PORT)
+        options = implementations.stub_options(
+            request_serializers={('echo', 'echo'): JSONProtocol(EchoRequest).pack},
+            response_deserializers={('echo', 'echo'): JSONProtocol(EchoRequest).unpack})
+        self._stub = implementations.generic_stub(channel, options)
+
+    async def invoke(self, method, request):
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(None, partial(self._stub.blocking_unary_unary, 'echo', method.name, request,
+                                                          timeout=None))
+
+    async def close(self):
+        pass
+
+
+def start_server(target):
+    pid = os.fork()
+    if pid == 0:
+        try:
+            target()
+        finally:
+            os._exit(0)
+    time.sleep(1)
+    return pid
+
+
+async def measure(client, concurrency: int, rounds: int):
+    latencies = []
+
+    async def call(i):
+        start = time.perf_counter()
+        await client.invoke(EchoStub.echo, EchoRequest(f'message {i}'))
+        latencies.append(time.perf_counter() - start)
+
+    await asyncio.gather(*[call(i) for i in range(10)])  # warm up
+    latencies.clear()
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        await asyncio.gather(*[call(i) for i in range(concurrency)])
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return (concurrency * rounds / elapsed,
+            statistics.median(latencies) * 1000,
+            latencies[int(len(latencies) * 0.99)] * 1000)
+
+
+def main(concurrency: int = 1000, rounds: int = 5):
+    print(f'{concurrency} concurrent calls, {rounds} rounds')
+
+    for name, serve, client_factory in (('grpc.beta', serve_beta, BetaClient),
+                                        ('grpc.aio', serve_aio, lambda: Client(EchoStub, '127.0.0.1', PORT))):
+        pid = start_server(serve)
+        try:
+            loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(loop)
+            client = client_factory()
+            throughput, median, p99 = loop.run_until_complete(measure(client, concurrency, rounds))
+            loop.run_until_complete(client.close())
+            loop.close()
+        finally:
+            os.kill(pid, signal.SIGKILL)
+            os.waitpid(pid, 0)
+
+        print(f'{name:>10}: {throughput:8.0f} calls/s, median {median:7.1f} ms, p99 {p99:7.1f} ms')
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,134 @@
+"""
+Compares the lean HTTP/1.1 server in :mod:`venom.rpc.comms.httpserver` against the aiohttp application from
+:func:`venom.rpc.comms.aiohttp.create_app` for small messages, using a server on localhost.
+
+Usage::
+
+    python benchmarks/http_server.py [connections] [requests per connection] [pipeline depth]
+
+Each server runs in a forked process. The client writes raw HTTP/1.1 requests over keep-alive connections, so that
+client overhead is small and the same for both servers; with a pipeline depth above one, that many requests are
+written on a connection before the responses are read.
+"""
+import asyncio
+import json
+import os
+import signal
+import statistics
+import sys
+import time
+
+from venom import Message
+from venom.rpc import Service, Venom, http
+from venom.rpc.comms import aiohttp as http_transport
+from venom.rpc.comms import httpserver
+
+AIOHTTP_PORT = 50075
+LEAN_PORT = 50076
+
+BODY = json.dumps({'text': 'venom'}).encode('utf-8')
+
+
+class EchoRequest(Message):
+    id: int
+    text: str
+
+
+class EchoService(Service):
+    class Meta:
+        name = 'echo'
+
+    @http.POST('./{id}', request=EchoRequest)
+    def echo(self, request: EchoRequest) -> EchoRequest:
+        return request
+
+
+def create_venom():
+    venom = Venom()
+    venom.add(EchoService)
+    return venom.freeze()
+
+
+def serve_aiohttp():
+    from aiohttp import web
+
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    web.run_app(http_transport.create_app(create_venom()), host='127.0.0.1', port=AIOHTTP_PORT, print=None)
+
+
+def serve_lean():
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    loop.run_until_complete(httpserver.create_server(create_venom(), '127.0.0.1', LEAN_PORT))
+    loop.run_forever()
+
+
+def start_server(target):
+    pid = os.fork()
+    if pid == 0:
+        try:
+            target()
+        finally:
+            os._exit(0)
+    time.sleep(1)
+    return pid
+
+
+def request(i: int) -> bytes:
+    return (b'POST /echo/%d HTTP/1.1\r\nHost: localhost\r\nContent-Type: application/json\r\n'
+            b'Content-Length: %d\r\n\r\n%s' % (i, len(BODY), BODY))
+
+
+async def read_response(reader: asyncio.StreamReader) -> None:
+    head = await reader.readuntil(b'\r\n\r\n')
+    assert head.startswith(b'HTTP/1.1 200'), head
+    length = next(int(line.split(b':')[1]) for line in head.split(b'\r\n')
+                  if line.lower().startswith(b'content-length'))
+    await reader.readexactly(length)
+
+
+async def connection(port: int, count: int, depth: int, latencies: list) -> None:
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    for i in range(0, count, depth):
+        start = time.perf_counter()
+        writer.write(b''.join(request(i + j) for j in range(depth)))
+        for _ in range(depth):
+            await read_response(reader)
+        latencies.append((time.perf_counter() - start) / depth)
+    writer.close()
+
+
+async def measure(port: int, connections: int, count: int, depth: int):
+    await connection(port, 100, 1, [])  # warm up
+
+    latencies = []
+    start = time.perf_counter()
+    await asyncio.gather(*(connection(port, count, depth, latencies) for _ in range(connections)))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return (connections * count / elapsed,
+            statistics.median(latencies) * 1000,
+            latencies[int(len(latencies) * 0.99)] * 1000)
+
+
+def main(connections: int = 10, count: int = 2000, depth: int = 1):
+    print(f'{connections} connections, {count} requests each, pipeline depth {depth}')
+
+    for name, serve, port in (('aiohttp', serve_aiohttp, AIOHTTP_PORT), ('lean', serve_lean, LEAN_PORT)):
+        pid = start_server(serve)
+        try:
+            loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(loop)
+            throughput, median, p99 = loop.run_until_complete(measure(port, connections, count, depth))
+            loop.close()
+        finally:
+            os.kill(pid, signal.SIGKILL)
+            os.waitpid(pid, 0)
+
+        print(f'{name:>8}: {throughput:8.0f} requests/s, median {median:6.3f} ms, p99 {p99:6.3f} ms')
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
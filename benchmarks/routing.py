@@ -0,0 +1,104 @@
+"""
+Compares the time aiohttp takes to resolve requests with Venom's radix-tree router against aiohttp's default
+``UrlDispatcher`` with one dynamic resource per method.
+
+Usage::
+
+    python benchmarks/routing.py [number of services]
+
+Each service has five methods, so the default of 100 services registers 500 routes.
+"""
+import asyncio
+import sys
+import timeit
+
+from aiohttp import web
+from aiohttp.test_utils import make_mocked_request
+
+from venom import Message
+from venom.fields import Int64, String
+from venom.protocol import JSONProtocol
+from venom.rpc import Service, Venom, http
+from venom.rpc.comms.aiohttp import create_app, _route_handler, _path_field_template
+
+
+class Item(Message):
+    id = Int64()
+    name = String()
+
+
+def make_service(i: int):
+    class ItemService(Service):
+        class Meta:
+            name = f'items{i}'
+
+        @http.GET('./{id}', request=Item)
+        def read(self) -> Item:
+            pass
+
+        @http.PUT('./{id}', request=Item)
+        def update(self) -> Item:
+            pass
+
+        @http.DELETE('./{id}', request=Item)
+        def delete(self) -> None:
+            pass
+
+        @http.POST('.', request=Item)
+        def create(self) -> Item:
+            pass
+
+        @http.GET('./by-name/{name}', request=Item)
+        def read_by_name(self) -> Item:
+            pass
+
+    return ItemService
+
+
+def create_default_app(venom: Venom) -> web.Application:
+    app = web.Application()
+    for entry in venom.dispatch_table:
+        method = entry.method
+        app.router.add_route(method.http_method.value,
+                             method.format_http_path(json_names=True, field_template_hook=_path_field_template),
+                             _route_handler(venom, entry, JSONProtocol))
+    return app
+
+
+def benchmark(app: web.Application, requests, number: int) -> float:
+    loop = asyncio.get_event_loop()
+    resolve = app.router.resolve
+
+    async def run():
+        for _ in range(number):
+            for request in requests:
+                await resolve(request)
+
+    start = timeit.default_timer()
+    loop.run_until_complete(run())
+    return (timeit.default_timer() - start) / (number * len(requests))
+
+
+def main(services: int = 100, number: int = 200):
+    venom = Venom()
+    for i in range(services):
+        venom.add(make_service(i))
+
+    apps = {
+        'aiohttp UrlDispatcher': create_default_app(venom),
+        'venom Router': create_app(venom)
+    }
+
+    paths = [('GET', '/items0/1'),
+             ('POST', f'/items{services // 2}'),
+             ('GET', f'/items{services - 1}/by-name/foo'),
+             ('DELETE', f'/items{services - 1}/42')]
+
+    print(f'{len(venom.dispatch_table)} routes')
+    for name, app in apps.items():
+        requests = [make_mocked_request(verb, path, app=app) for verb, path in paths]
+        print(f'{name:>24}: {benchmark(app, requests, number) * 10 ** 6:8.2f} us per request')
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
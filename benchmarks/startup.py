@@ -0,0 +1,78 @@
+"""
+Measures the time from defining services to serving the first request, with and without ``Meta.lazy``.
+
+Usage::
+
+    python benchmarks/startup.py [number of services] [methods per service]
+
+For each mode, the script defines stubs and matching services with auto-generated request messages, adds them to a
+Venom ("ready") and then invokes one method ("first call"). Each mode runs in a fresh interpreter so neither benefits
+from caches of the other.
+"""
+import subprocess
+import sys
+import textwrap
+
+_TEMPLATE = '''
+import asyncio
+import timeit
+
+start = timeit.default_timer()
+
+from venom import Empty
+from venom.rpc import Service, Stub, Venom, rpc
+
+lazy = {lazy}
+services = []
+
+for i in range({services}):
+    stub_members = {{}}
+    service_members = {{}}
+
+    for j in range({methods}):
+        def method(self, name: str, count: int = 1, flag: bool = False) -> str:
+            raise NotImplementedError
+
+        def implementation(self, name: str, count: int = 1, flag: bool = False) -> str:
+            return name * count
+
+        stub_members[f'method{{j}}'] = rpc(auto=True)(method)
+        service_members[f'method{{j}}'] = rpc(implementation)
+
+    stub_members['Meta'] = type('Meta', (), {{'name': f'svc{{i}}', 'lazy': lazy}})
+    stub = type(f'Svc{{i}}Stub', (Stub,), stub_members)
+
+    service_members['Meta'] = type('Meta', (), {{'name': f'svc{{i}}', 'stub': stub, 'lazy': lazy}})
+    services.append(type(f'Svc{{i}}Service', (Service,), service_members))
+
+venom = Venom()
+for service in services:
+    venom.add(service)
+
+ready = timeit.default_timer()
+
+entry = venom.get_method('svc0', 'method0')
+loop = asyncio.get_event_loop()
+loop.run_until_complete(venom.invoke(entry.method, entry.method.request(name='a')))
+
+first_call = timeit.default_timer()
+print(ready - start, first_call - start)
+'''
+
+
+def measure(lazy: bool, services: int, methods: int):
+    source = textwrap.dedent(_TEMPLATE.format(lazy=lazy, services=services, methods=methods))
+    output = subprocess.check_output([sys.executable, '-c', source])
+    return tuple(float(value) for value in output.split())
+
+
+def main(services: int = 200, methods: int = 5):
+    print(f'{services} services with {methods} methods each')
+    for lazy in (False, True):
+        ready, first_call = measure(lazy, services, methods)
+        print(f"{'lazy' if lazy else 'eager':>6}: ready after {ready * 1000:8.1f} ms, "
+              f"first call after {first_call * 1000:8.1f} ms")
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,125 @@
+"""
+Compares the latency and throughput of the binary TCP transport in :mod:`venom.rpc.comms.tcp` against HTTP with
+:mod:`venom.rpc.comms.aiohttp`, using a server on localhost.
+
+Usage::
+
+    python benchmarks/tcp_transport.py [concurrent calls] [rounds]
+
+Each server runs in a forked process. Calls are made one at a time to measure latency, and then ``concurrent calls``
+at a time to measure throughput.
+"""
+import asyncio
+import os
+import signal
+import statistics
+import sys
+import time
+
+from venom import Message
+from venom.rpc import Service, Stub, Venom, rpc
+from venom.rpc.comms import aiohttp as http_transport
+from venom.rpc.comms import tcp
+
+HTTP_PORT = 50073
+TCP_PORT = 50074
+
+
+class EchoRequest(Message):
+    text: str
+
+
+class EchoStub(Stub):
+    class Meta:
+        name = 'echo'
+
+    @rpc
+    def echo(self, request: EchoRequest) -> EchoRequest:
+        raise NotImplementedError
+
+
+class EchoService(Service):
+    class Meta:
+        name = 'echo'
+
+    @rpc
+    def echo(self, request: EchoRequest) -> EchoRequest:
+        return request
+
+
+def create_venom():
+    venom = Venom()
+    venom.add(EchoService)
+    return venom.freeze()
+
+
+def serve_http():
+    from aiohttp import web
+
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    web.run_app(http_transport.create_app(create_venom()), host='127.0.0.1', port=HTTP_PORT, print=None)
+
+
+def serve_tcp():
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    loop.run_until_complete(tcp.create_server(create_venom(), '127.0.0.1', TCP_PORT))
+    loop.run_forever()
+
+
+def start_server(target):
+    pid = os.fork()
+    if pid == 0:
+        try:
+            target()
+        finally:
+            os._exit(0)
+    time.sleep(1)
+    return pid
+
+
+async def measure(client, concurrency: int, rounds: int):
+    for i in range(100):  # warm up
+        await client.invoke(EchoStub.echo, EchoRequest(f'message {i}'))
+
+    latencies = []
+    for i in range(concurrency * rounds):
+        start = time.perf_counter()
+        await client.invoke(EchoStub.echo, EchoRequest(f'message {i}'))
+        latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        await asyncio.gather(*[client.invoke(EchoStub.echo, EchoRequest(f'message {i}')) for i in range(concurrency)])
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return (concurrency * rounds / elapsed,
+            statistics.median(latencies) * 1000,
+            latencies[int(len(latencies) * 0.99)] * 1000)
+
+
+def main(concurrency: int = 100, rounds: int = 20):
+    print(f'{concurrency} concurrent calls, {rounds} rounds')
+
+    for name, serve, client_factory in (
+            ('aiohttp', serve_http, lambda: http_transport.HTTPClient(EchoStub, f'http://127.0.0.1:{HTTP_PORT}')),
+            ('tcp', serve_tcp, lambda: tcp.Client(EchoStub, '127.0.0.1', TCP_PORT, connections=2))):
+        pid = start_server(serve)
+        try:
+            loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(loop)
+            client = client_factory()
+            throughput, median, p99 = loop.run_until_complete(measure(client, concurrency, rounds))
+            loop.run_until_complete(client.close())
+            loop.close()
+        finally:
+            os.kill(pid, signal.SIGKILL)
+            os.waitpid(pid, 0)
+
+        print(f'{name:>8}: {throughput:8.0f} calls/s, median {median:6.3f} ms, p99 {p99:6.3f} ms')
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
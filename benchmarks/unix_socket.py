@@ -0,0 +1,123 @@
+"""
+Compares the latency of :class:`venom.rpc.comms.aiohttp.HTTPClient` calls to a co-located server over loopback TCP
+against the same server on a Unix domain socket.
+
+Usage::
+
+    python benchmarks/unix_socket.py [concurrent calls] [rounds]
+
+The server runs in a forked process and listens on both transports at once; calls are made one at a time to measure
+latency, and then ``concurrent calls`` at a time to measure throughput.
+"""
+import asyncio
+import os
+import signal
+import statistics
+import sys
+import tempfile
+import time
+
+from venom import Message
+from venom.rpc import Service, Stub, Venom, http
+from venom.rpc.comms.aiohttp import HTTPClient, create_app
+
+PORT = 50072
+
+
+class EchoRequest(Message):
+    text: str
+
+
+class EchoStub(Stub):
+    class Meta:
+        name = 'echo'
+
+    @http.POST('./echo')
+    def echo(self, request: EchoRequest) -> EchoRequest:
+        raise NotImplementedError
+
+
+class EchoService(Service):
+    class Meta:
+        name = 'echo'
+
+    @http.POST('./echo')
+    def echo(self, request: EchoRequest) -> EchoRequest:
+        return request
+
+
+def serve(path: str):
+    from aiohttp import web
+
+    async def start():
+        venom = Venom()
+        venom.add(EchoService)
+        runner = web.AppRunner(create_app(venom, warm=True))
+        await runner.setup()
+        await web.TCPSite(runner, '127.0.0.1', PORT).start()
+        await web.UnixSite(runner, path).start()
+
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    loop.run_until_complete(start())
+    loop.run_forever()
+
+
+def start_server(path: str):
+    pid = os.fork()
+    if pid == 0:
+        try:
+            serve(path)
+        finally:
+            os._exit(0)
+    time.sleep(1)
+    return pid
+
+
+async def measure(base_url: str, concurrency: int, rounds: int):
+    venom = Venom()
+    venom.add(EchoStub, HTTPClient, base_url)
+    echo = venom.get_instance(EchoStub)
+
+    for i in range(100):  # warm up
+        await echo.echo(EchoRequest(f'message {i}'))
+
+    latencies = []
+    for i in range(concurrency * rounds):
+        start = time.perf_counter()
+        await echo.echo(EchoRequest(f'message {i}'))
+        latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        await asyncio.gather(*[echo.echo(EchoRequest(f'message {i}')) for i in range(concurrency)])
+    elapsed = time.perf_counter() - start
+
+    await venom.close()
+
+    latencies.sort()
+    return (concurrency * rounds / elapsed,
+            statistics.median(latencies) * 1000,
+            latencies[int(len(latencies) * 0.99)] * 1000)
+
+
+def main(concurrency: int = 100, rounds: int = 20):
+    print(f'{concurrency} concurrent calls, {rounds} rounds')
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'echo.sock')
+        pid = start_server(path)
+        try:
+            for name, base_url in (('tcp', f'http://127.0.0.1:{PORT}'), ('unix', f'unix://{path}')):
+                loop = asyncio.new_event_loop()
+                asyncio.set_event_loop(loop)
+                throughput, median, p99 = loop.run_until_complete(measure(base_url, concurrency, rounds))
+                loop.close()
+                print(f'{name:>5}: {throughput:8.0f} calls/s, median {median:6.3f} ms, p99 {p99:6.3f} ms')
+        finally:
+            os.kill(pid, signal.SIGKILL)
+            os.waitpid(pid, 0)
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
@@ -8,6 +8,7 @@ client = Client(HelloRemote, 'localhost', 50053)
 async def request_say_hello(name):
     response = await client.invoke(HelloRemote.say_hello, HelloRequest(name=name))
     print('response:', response.message)
+    await client.close()
 
 loop = asyncio.get_event_loop()
-loop.run_until_complete(request_say_hello('world'))
\ No newline at end of file
+loop.run_until_complete(request_say_hello('world'))
@@ -1,6 +1,5 @@
-import time
-
 import asyncio
+
 from venom.rpc.comms.grpc import create_server
 from venom.rpc.method import rpc
 from hello import HelloRequest, HelloResponse
@@ -17,13 +16,17 @@ class HelloService(Service):
 app = Venom()
 app.add(HelloService)
 
-server = create_server(app)
 
-if __name__ == '__main__':
+async def serve():
+    server = create_server(app)
     server.add_insecure_port('[::]:50053')
-    server.start()
+    await server.start()
+    await server.wait_for_termination()
+
+
+if __name__ == '__main__':
+    loop = asyncio.get_event_loop()
     try:
-        while True:
-            time.sleep(24 * 60 * 60)
+        loop.run_until_complete(serve())
     except KeyboardInterrupt:
-        server.stop(0)
+        pass
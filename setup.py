@@ -39,6 +39,6 @@ setup(
     extras_require={
         'docs': ['Sphinx>=1.5.5'],
         'aiohttp': ['aiohttp>=1.2.0', 'ujson'],
-        'grpc': ['grpcio'],
+        'grpc': ['grpcio>=1.32'],
     }
 )
@@ -1,13 +1,20 @@
+import asyncio
+import gc
+import os
+import tempfile
+
+from aiohttp import UnixConnector, web
 from aiohttp.test_utils import AioHTTPTestCase, unittest_run_loop
 
 from venom import Empty
 from venom import Message
-from venom.exceptions import NotImplemented_
+from venom.exceptions import NotImplemented_, NotFound, ServerError
 from venom.fields import String
+from venom.protocol import URIStringProtocol
 from venom.rpc import Service, http, Venom
 from venom.rpc import Stub
 from venom.rpc import rpc
-from venom.rpc.comms.aiohttp import create_app, HTTPClient
+from venom.rpc.comms.aiohttp import create_app, HTTPClient, ConnectorRegistry
 
 
 class HelloRequest(Message):
@@ -28,6 +35,12 @@ class GreeterStub(Stub):
         pass
 
 
+class FarewellStub(Stub):
+    @http.GET('./greet')
+    def greet(self, request: HelloRequest) -> HelloResponse:
+        pass
+
+
 class AioHTTPEndToEndTestCase(AioHTTPTestCase):
     def get_app(self):
         class GreeterService(Service):
@@ -38,7 +51,7 @@ class AioHTTPEndToEndTestCase(AioHTTPTestCase):
             def greet(self, name: str) -> HelloResponse:
                 return HelloResponse('Hello, {}!'.format(name))
 
-        venom = Venom()
+        self.server_venom = venom = Venom()
         venom.add(GreeterService)
         return create_app(venom)
 
@@ -60,3 +73,163 @@ class AioHTTPEndToEndTestCase(AioHTTPTestCase):
             with self.assertRaises(NotImplemented_):
                 greeter = venom.get_instance(GreeterStub)
                 await greeter.goodbye(Empty())
+
+    @unittest_run_loop
+    async def test_client_shared_connections(self):
+        venom = Venom(http_connectors={'limit_per_host': 5, 'keepalive_timeout': 30})
+        base_url = f'http://127.0.0.1:{self.client.port}'
+        venom.add(GreeterStub, HTTPClient, base_url)
+        venom.add(FarewellStub, HTTPClient, base_url + '/')
+
+        registry = ConnectorRegistry.get(venom)
+        self.assertIs(registry, ConnectorRegistry.get(venom))
+        self.assertEqual(5, registry.limit_per_host)
+
+        with venom.get_request_context():
+            greeter = venom.get_instance(GreeterStub)
+            farewell = venom.get_instance(FarewellStub)
+            self.assertIs(greeter.session, farewell.session)
+
+            for name in ('Alice', 'Bob', 'Carol'):
+                self.assertEqual(HelloResponse(f'Hello, {name}!'), await greeter.greet(HelloRequest(name)))
+
+        stats = registry.stats()[base_url]
+        self.assertEqual(5, stats.limit_per_host)
+        self.assertEqual(3, stats.requests)
+        self.assertEqual(1, stats.connections_created)
+        self.assertEqual(2, stats.connections_reused)
+        self.assertEqual(0, stats.acquired)
+        self.assertEqual(1, stats.idle)
+
+        session = greeter.session
+        await venom.close()
+        self.assertTrue(session.closed)
+        self.assertEqual({}, registry.stats())
+
+    @unittest_run_loop
+    async def test_client_collected(self):
+        registry = ConnectorRegistry()
+        client = HTTPClient(GreeterStub, f'http://127.0.0.1:{self.client.port}', connectors=registry)
+        self.assertEqual(HelloResponse('Hello, Alice!'), await client.invoke(GreeterStub.greet, HelloRequest('Alice')))
+
+        session = client.session
+        del client
+        gc.collect()
+        for _ in range(3):
+            await asyncio.sleep(0)
+        self.assertTrue(session.closed)
+        self.assertEqual({}, registry.stats())
+
+    def test_client_collected_loop_stopped(self):
+        registry = ConnectorRegistry()
+        client = HTTPClient(GreeterStub, f'http://127.0.0.1:{self.client.port}', connectors=registry)
+        self.loop.run_until_complete(client.invoke(GreeterStub.greet, HelloRequest('Alice')))
+
+        # without a running loop, the session is left for ConnectorRegistry.close()
+        session = client.session
+        tasks = asyncio.Task.all_tasks(self.loop)
+        del client
+        gc.collect()
+        self.assertFalse(session.closed)
+        self.assertEqual(tasks, asyncio.Task.all_tasks(self.loop))
+
+        self.loop.run_until_complete(registry.close())
+        self.assertTrue(session.closed)
+
+    @unittest_run_loop
+    async def test_client_unix_socket(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'greeter.sock')
+            runner = web.AppRunner(create_app(self.server_venom))
+            await runner.setup()
+            await web.UnixSite(runner, path).start()
+
+            venom = Venom()
+            venom.add(GreeterStub, HTTPClient, f'unix://{path}')
+
+            try:
+                with venom.get_request_context():
+                    greeter = venom.get_instance(GreeterStub)
+                    self.assertEqual(HelloResponse('Hello, Alice!'), await greeter.greet(HelloRequest('Alice')))
+                    self.assertIsInstance(greeter.session.connector, UnixConnector)
+
+                self.assertEqual(1, ConnectorRegistry.get(venom).stats()[f'unix://{path}'].requests)
+            finally:
+                await venom.close()
+                await runner.cleanup()
+
+
+class AioHTTPBatchingTestCase(AioHTTPTestCase):
+    def get_app(self):
+        class GreeterService(Service):
+            class Meta:
+                stub = GreeterStub
+
+            @http.GET(request=HelloRequest)
+            def greet(self, name: str) -> HelloResponse:
+                if name == 'Mallory':
+                    raise NotFound()
+                return HelloResponse('Hello, {}!'.format(name))
+
+        self.paths = []
+
+        @web.middleware
+        async def record_path(request, handler):
+            self.paths.append(request.path)
+            return await handler(request)
+
+        async def short_batch(request):
+            return web.json_response([{'status': 200, 'response': {'message': 'Hello!'}}])
+
+        async def invalid_batch(request):
+            return web.json_response([{'status': 200}, 'Hello!'])
+
+        venom = Venom()
+        venom.add(GreeterService)
+        app = create_app(venom, web.Application(middlewares=[record_path]), batch_path='/_batch')
+        app.router.add_post('/_short', short_batch)
+        app.router.add_post('/_invalid', invalid_batch)
+        return app
+
+    @unittest_run_loop
+    async def test_client_batching(self):
+        venom = Venom()
+        venom.add(GreeterStub, HTTPClient, f'http://127.0.0.1:{self.client.port}',
+                  batch_path='/_batch', batch_size=3, batch_delay=0.01)
+
+        greeter = venom.get_instance(GreeterStub)
+        names = ['Alice', 'Bob', 'Carol', 'Dave', 'Mallory']
+        responses = await asyncio.gather(*(greeter.greet(HelloRequest(name)) for name in names),
+                                         return_exceptions=True)
+
+        self.assertEqual([HelloResponse(f'Hello, {name}!') for name in names[:4]], responses[:4])
+        self.assertIsInstance(responses[4], RuntimeError)
+        self.assertEqual(['/_batch', '/_batch'], self.paths)
+
+        self.assertEqual(HelloResponse('Hello, Eve!'), await greeter.greet(HelloRequest('Eve')))
+        self.assertEqual('/greeter/greet', self.paths[-1])
+
+        pending = asyncio.ensure_future(greeter.greet(HelloRequest('Frank')))
+        await asyncio.sleep(0)
+        await venom.close()
+        self.assertEqual(HelloResponse('Hello, Frank!'), await pending)
+
+    @unittest_run_loop
+    async def test_client_batching_invalid_response(self):
+        for batch_path in ('/_short', '/_invalid'):
+            venom = Venom()
+            venom.add(GreeterStub, HTTPClient, f'http://127.0.0.1:{self.client.port}',
+                      batch_path=batch_path, batch_size=2, batch_delay=0.01)
+
+            greeter = venom.get_instance(GreeterStub)
+            try:
+                responses = await asyncio.wait_for(
+                    asyncio.gather(*(greeter.greet(HelloRequest(name)) for name in ('Alice', 'Bob')),
+                                   return_exceptions=True), 1)
+                self.assertEqual([ServerError, ServerError], [type(response) for response in responses])
+            finally:
+                await venom.close()
+
+    def test_batching_requires_json(self):
+        with self.assertRaises(ValueError):
+            HTTPClient(GreeterStub, 'http://localhost', batch_path='/_batch', protocol_factory=URIStringProtocol)
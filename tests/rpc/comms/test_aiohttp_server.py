@@ -1,12 +1,14 @@
 import json
 from unittest import SkipTest
 
+from aiohttp import web
 from aiohttp.test_utils import AioHTTPTestCase, unittest_run_loop
 
 from venom import Message
 from venom.fields import Int64, String, Int32
-from venom.rpc import Service, http
-from venom.rpc.comms.aiohttp import create_app
+from venom.exceptions import NotFound
+from venom.rpc import Service, ServiceScope, Venom, http
+from venom.rpc.comms.aiohttp import AioHTTPRequestContext, create_app
 from venom.rpc.test_utils import mock_venom
 
 
@@ -94,6 +96,11 @@ class AioHTTPSimpleServerTestCase(AioHTTPTestCase):
         response = await self.client.get("/snake/bite")
         self.assertEqual(404, response.status)
 
+    @unittest_run_loop
+    async def test_route_405_error(self):
+        response = await self.client.delete("/snake/3")
+        self.assertEqual(405, response.status)
+
     @unittest_run_loop
     async def test_route_400_error(self):
         response = await self.client.post("/snake", data=json.dumps({}))
@@ -119,3 +126,214 @@ class AioHTTPSimpleServerTestCase(AioHTTPTestCase):
         response = await self.client.get("/snake/status/501")
         # self.assertEqual(500, response.status)
         self.assertEqual({'status': 501, 'description': 'Not Implemented'}, await response.json())
+
+
+class AioHTTPBatchServerTestCase(AioHTTPTestCase):
+    def get_app(self):
+        class Pet(Message):
+            name: str
+
+        class PetService(Service):
+            @http.GET('./{name}', request=Pet)
+            def read(self, name: str) -> Pet:
+                if name == 'nobody':
+                    raise NotFound()
+                return Pet(name)
+
+        venom = Venom()
+        venom.add(PetService)
+        return create_app(venom, batch_path='/_batch', max_batch_size=3)
+
+    @unittest_run_loop
+    async def test_batch(self):
+        response = await self.client.post('/_batch', data=json.dumps([
+            {'service': 'pet', 'method': 'read', 'request': {'name': 'Rex'}},
+            {'service': 'pet', 'method': 'read', 'request': {'name': 'nobody'}},
+            {'service': 'pet', 'method': 'unknown', 'request': {}},
+        ]))
+        self.assertEqual(200, response.status)
+        self.assertEqual([
+            {'status': 200, 'response': {'name': 'Rex'}},
+            {'status': 404, 'error': {'status': 404, 'description': 'Not Found'}},
+            {'status': 404, 'error': {'status': 404, 'description': 'Unknown method pet.unknown'}},
+        ], await response.json())
+
+        response = await self.client.post('/_batch', data=json.dumps([
+            {'service': 'pet', 'method': 'read', 'request': {'name': 'Rex'}},
+            {'service': 'pet', 'request': {}},
+            {'service': 'pet', 'method': 42},
+        ]))
+        self.assertEqual(200, response.status)
+        description = "A call needs a 'service' and a 'method' name"
+        self.assertEqual([
+            {'status': 200, 'response': {'name': 'Rex'}},
+            {'status': 400, 'error': {'status': 400, 'description': description}},
+            {'status': 400, 'error': {'status': 400, 'description': description}},
+        ], await response.json())
+
+    @unittest_run_loop
+    async def test_batch_invalid(self):
+        response = await self.client.post('/_batch', data='{}')
+        self.assertEqual(400, response.status)
+        self.assertEqual({'status': 400, 'description': 'Invalid batch: Expected a list of calls'},
+                         await response.json())
+
+        response = await self.client.post('/_batch', data=json.dumps([{'service': 'pet', 'method': 'read'}] * 4))
+        self.assertEqual(413, response.status)
+
+
+class AioHTTPSubAppServerTestCase(AioHTTPTestCase):
+    def get_app(self):
+        class Pet(Message):
+            id: int
+            name: str
+
+        class PetService(Service):
+            @http.GET('./{id}', request=Pet)
+            def read(self, id: int) -> Pet:
+                return Pet(id, f'Pet #{id}')
+
+        venom = Venom()
+        venom.add(PetService)
+
+        self.api = create_app(venom)
+        app = web.Application()
+        app.add_subapp('/api', self.api)
+        return app
+
+    @unittest_run_loop
+    async def test_prefix(self):
+        response = await self.client.get('/api/pet/3')
+        self.assertEqual(200, response.status)
+        self.assertEqual({'id': 3, 'name': 'Pet #3'}, await response.json())
+
+        response = await self.client.get('/pet/3')
+        self.assertEqual(404, response.status)
+
+        response = await self.client.post('/api/pet/3')
+        self.assertEqual(405, response.status)
+
+    def test_resource(self):
+        resource, = self.api.router.resources()
+        self.assertEqual('/api', resource.canonical)
+        self.assertEqual({'prefix': '/api', 'methods': {'pet.read': '/api/pet/{id}'}}, resource.get_info())
+        self.assertTrue(resource.raw_match('/api/pet/{id}'))
+        self.assertFalse(resource.raw_match('/pet/{id}'))
+        self.assertEqual('/api/pet/42', str(resource.url_for('pet.read', id=42)))
+        self.assertEqual({'id': 42}, resource._match('/api/pet/42'))
+        self.assertIsNone(resource._match('/pet/42'))
+        self.assertIsNone(resource._match('/api/pet/rex'))
+
+
+class AioHTTPCachingServerTestCase(AioHTTPTestCase):
+    def get_app(self):
+        class Pet(Message):
+            name: str
+
+        class PetService(Service):
+            versions = {'Rex': 1}
+            reads = []
+
+            @http.GET('./{name}', request=Pet, max_age=60)
+            def read(self, name: str) -> Pet:
+                return Pet(name)
+
+            @http.GET('./{name}/versioned', request=Pet, etag='pet_version')
+            def read_versioned(self, name: str) -> Pet:
+                self.reads.append(name)
+                return Pet(name)
+
+            @http.GET('./{name}/uncached', request=Pet, etag=False)
+            def read_uncached(self, name: str) -> Pet:
+                return Pet(name)
+
+            async def pet_version(self, request: Pet) -> int:
+                return self.versions[request.name]
+
+        self.service = PetService
+        venom = Venom()
+        venom.add(PetService)
+        return create_app(venom)
+
+    @unittest_run_loop
+    async def test_etag(self):
+        response = await self.client.get('/pet/Rex')
+        self.assertEqual(200, response.status)
+        self.assertEqual('max-age=60', response.headers['Cache-Control'])
+        etag = response.headers['ETag']
+
+        response = await self.client.get('/pet/Rex', headers={'If-None-Match': f'"other", W/{etag}'})
+        self.assertEqual(304, response.status)
+        self.assertEqual(etag, response.headers['ETag'])
+        self.assertEqual('max-age=60', response.headers['Cache-Control'])
+        self.assertEqual('Accept-Encoding', response.headers['Vary'])
+        self.assertEqual(b'', await response.read())
+
+        response = await self.client.get('/pet/Tom', headers={'If-None-Match': etag})
+        self.assertEqual(200, response.status)
+        self.assertNotEqual(etag, response.headers['ETag'])
+
+        response = await self.client.get('/pet/Rex/uncached', headers={'If-None-Match': '*'})
+        self.assertEqual(200, response.status)
+        self.assertNotIn('ETag', response.headers)
+
+    @unittest_run_loop
+    async def test_version_hook(self):
+        response = await self.client.get('/pet/Rex/versioned')
+        self.assertEqual(200, response.status)
+        self.assertEqual('"v1"', response.headers['ETag'])
+        self.assertNotIn('Cache-Control', response.headers)
+
+        response = await self.client.get('/pet/Rex/versioned', headers={'If-None-Match': '"v1"'})
+        self.assertEqual(304, response.status)
+        self.assertEqual('Accept-Encoding', response.headers['Vary'])
+        self.assertEqual(['Rex'], self.service.reads)
+
+        self.service.versions['Rex'] = 2
+        response = await self.client.get('/pet/Rex/versioned', headers={'If-None-Match': '"v1"'})
+        self.assertEqual(200, response.status)
+        self.assertEqual('"v2"', response.headers['ETag'])
+        self.assertEqual(['Rex', 'Rex'], self.service.reads)
+
+
+class AioHTTPRequestScopeCachingServerTestCase(AioHTTPTestCase):
+    def get_app(self):
+        class Pet(Message):
+            name: str
+
+        class PetService(Service):
+            class Meta:
+                scope = ServiceScope.REQUEST
+
+            instances = []
+
+            def __init__(self, venom=None):
+                super().__init__(venom)
+                self.instances.append(self)
+                self.version_context = None
+
+            @http.GET('./{name}', request=Pet, etag='pet_version')
+            def read(self, name: str) -> Pet:
+                assert self.version_context is self.context
+                return Pet(name)
+
+            def pet_version(self, request: Pet) -> int:
+                self.version_context = self.context
+                return 1
+
+        self.service = PetService
+        venom = Venom()
+        venom.add(PetService)
+        return create_app(venom)
+
+    @unittest_run_loop
+    async def test_version_hook_request_scope(self):
+        response = await self.client.get('/pet/Rex')
+        self.assertEqual(200, response.status)
+        self.assertEqual('"v1"', response.headers['ETag'])
+        self.assertEqual(1, len(self.service.instances))
+        self.assertIsInstance(self.service.instances[0].version_context, AioHTTPRequestContext)
+
+        response = await self.client.get('/pet/Rex', headers={'If-None-Match': '"v1"'})
+        self.assertEqual(304, response.status)
+        self.assertEqual(2, len(self.service.instances))
@@ -0,0 +1,105 @@
+import json
+
+from venom import Message
+from venom.exceptions import NotFound
+from venom.rpc import Service, Venom, http
+from venom.rpc.comms.asgi import create_asgi_app
+from venom.rpc.test_utils import AioTestCase
+
+
+class Snake(Message):
+    id: int
+    name: str
+    size: int
+
+
+class SnakeService(Service):
+    @http.POST('.', request=Snake)
+    def create(self, name: str, size: int = 2) -> Snake:
+        return Snake(1, name, size)
+
+    @http.GET('./{id}', request=Snake)
+    def read(self, id: int, name: str) -> Snake:
+        if id == 404:
+            raise NotFound('No such snake')
+        return Snake(id, name or f'Snek #{id}')
+
+    @http.POST('./{id}/hiss', request=Snake)
+    def hiss(self, id: int) -> None:
+        pass
+
+    @http.GET('./status/500')
+    def http500(self) -> None:
+        raise ValueError('No!')
+
+
+async def _call(app, method, path, *chunks, query_string=b''):
+    scope = {'type': 'http', 'method': method, 'path': path, 'query_string': query_string, 'headers': []}
+    messages = [{'type': 'http.request', 'body': chunk, 'more_body': i < len(chunks) - 1}
+                for i, chunk in enumerate(chunks or [b''])]
+    sent = []
+
+    async def receive():
+        return messages.pop(0)
+
+    async def send(message):
+        sent.append(message)
+
+    await app(scope, receive, send)
+    start, body = sent
+    return start['status'], dict(start['headers']), body['body']
+
+
+class ASGITestCase(AioTestCase):
+    def setUp(self):
+        super().setUp()
+        venom = Venom()
+        venom.add(SnakeService)
+        self.app = create_asgi_app(venom, warm=True)
+
+    async def test_routes(self):
+        status, headers, body = await _call(self.app, 'POST', '/snake', b'{"name": "Sn', b'ek", "size": 9001}')
+        self.assertEqual(200, status)
+        self.assertEqual(b'application/json', headers[b'content-type'])
+        self.assertEqual(str(len(body)).encode(), headers[b'content-length'])
+        self.assertEqual({'id': 1, 'name': 'Snek', 'size': 9001}, json.loads(body))
+
+        status, headers, body = await _call(self.app, 'GET', '/snake/3', query_string=b'name=Kaa&name=Nagini')
+        self.assertEqual(200, status)
+        self.assertEqual({'id': 3, 'name': 'Kaa'}, json.loads(body))
+
+        status, headers, body = await _call(self.app, 'POST', '/snake/5/hiss', b'{}')
+        self.assertEqual(204, status)
+        self.assertEqual(b'', body)
+
+    async def test_errors(self):
+        status, headers, body = await _call(self.app, 'GET', '/snake/404')
+        self.assertEqual(404, status)
+        self.assertEqual({'status': 404, 'description': 'No such snake'}, json.loads(body))
+
+        status, headers, body = await _call(self.app, 'GET', '/snake/bite')
+        self.assertEqual(404, status)
+
+        status, headers, body = await _call(self.app, 'DELETE', '/snake/3')
+        self.assertEqual(405, status)
+        self.assertEqual(b'GET', headers[b'allow'])
+
+        status, headers, body = await _call(self.app, 'POST', '/snake', b'{"size": "big"}')
+        self.assertEqual(400, status)
+
+        status, headers, body = await _call(self.app, 'GET', '/snake/status/500')
+        self.assertEqual(500, status)
+        self.assertEqual({'status': 500, 'description': 'Internal Server Error'}, json.loads(body))
+
+    async def test_lifespan(self):
+        messages = [{'type': 'lifespan.startup'}, {'type': 'lifespan.shutdown'}]
+        sent = []
+
+        async def receive():
+            return messages.pop(0)
+
+        async def send(message):
+            sent.append(message)
+
+        await self.app({'type': 'lifespan'}, receive, send)
+        self.assertEqual([{'type': 'lifespan.startup.complete'}, {'type': 'lifespan.shutdown.complete'}], sent)
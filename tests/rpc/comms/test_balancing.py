@@ -0,0 +1,226 @@
+import random
+from unittest import TestCase
+
+from aiohttp.test_utils import TestServer
+
+from venom import Empty, Message
+from venom.rpc import Service, Stub, Venom, http
+from venom.rpc.comms.aiohttp import create_app, HTTPClient
+from venom.rpc.comms.balancing import Balancer, Endpoint, HashRing, LeastOutstanding, PowerOfTwoChoices, RoundRobin
+from venom.rpc.test_utils import AioTestCase, Clock
+
+
+class PolicyTestCase(TestCase):
+    def test_round_robin(self):
+        endpoints = [Endpoint('a'), Endpoint('b'), Endpoint('c')]
+        policy = RoundRobin()
+        self.assertEqual(['a', 'b', 'c', 'a'], [policy.choose(endpoints).url for _ in range(4)])
+
+    def test_least_outstanding(self):
+        a, b, c = Endpoint('a'), Endpoint('b'), Endpoint('c')
+        a.outstanding, b.outstanding, c.outstanding = 2, 1, 1
+        self.assertIs(b, LeastOutstanding().choose([a, b, c]))
+
+    def test_power_of_two_choices(self):
+        fast, slow = Endpoint('fast'), Endpoint('slow')
+        fast.record_success(0.01)
+        slow.record_success(0.5)
+
+        policy = PowerOfTwoChoices(random.Random(1))
+        self.assertEqual({'fast'}, {policy.choose([fast, slow]).url for _ in range(10)})
+
+        fast.outstanding = 100
+        self.assertIs(slow, policy.choose([fast, slow]))
+
+
+class BalancerTestCase(TestCase):
+    def test_ejection_and_reintroduction(self):
+        clock = Clock()
+        balancer = Balancer(['a', 'b'], max_failures=2, ejection_time=10, ramp_up=20, clock=clock,
+                            random_=random.Random(1))
+        a, b = balancer.endpoints
+
+        for _ in range(2):
+            balancer.started(a)
+            balancer.failed(a)
+
+        self.assertTrue(a.ejected(clock.now))
+        self.assertEqual({'b'}, {balancer.choose().url for _ in range(10)})
+
+        clock.now = 11
+        self.assertFalse(a.ejected(clock.now))
+        self.assertAlmostEqual(0.05, a.weight(clock.now, balancer.ramp_up))
+        self.assertLess([balancer.choose() for _ in range(100)].count(a), 20)
+
+        clock.now = 30
+        self.assertEqual(1.0, a.weight(clock.now, balancer.ramp_up))
+
+        for _ in range(2):
+            balancer.started(a)
+            balancer.failed(a)
+        self.assertEqual(clock.now + 20, a.ejected_until)
+
+    def test_all_ejected(self):
+        balancer = Balancer(['a'], max_failures=1)
+        a, = balancer.endpoints
+        balancer.started(a)
+        balancer.failed(a)
+        self.assertIs(a, balancer.choose())
+
+    def test_resolver(self):
+        clock = Clock()
+        urls = ['a', 'b']
+        balancer = Balancer(lambda: urls, resolve_interval=5, clock=clock)
+        a, b = balancer.endpoints
+
+        urls = ['b', 'c']
+        self.assertEqual(['a', 'b'], [endpoint.url for endpoint in balancer.endpoints])
+
+        clock.now = 5
+        self.assertEqual(['b', 'c'], [endpoint.url for endpoint in balancer.endpoints])
+        self.assertIs(b, balancer.endpoints[0])
+
+        with self.assertRaises(RuntimeError):
+            Balancer([]).choose()
+
+
+class HashRingTestCase(TestCase):
+    def test_minimal_remapping(self):
+        keys = [f'user-{i}' for i in range(1000)]
+        ring = HashRing(['a', 'b', 'c'])
+        before = {key: ring.get(key) for key in keys}
+
+        counts = {node: list(before.values()).count(node) for node in 'abc'}
+        self.assertTrue(all(200 < count < 470 for count in counts.values()), counts)
+
+        ring.add('d')
+        after = {key: ring.get(key) for key in keys}
+        moved = [key for key in keys if before[key] != after[key]]
+        self.assertTrue(all(after[key] == 'd' for key in moved))
+        self.assertLess(len(moved), 400)
+
+        ring.remove('d')
+        self.assertEqual(before, {key: ring.get(key) for key in keys})
+
+        ring.update(['a', 'b'])
+        self.assertEqual({'a', 'b'}, ring.nodes)
+        self.assertTrue(all(ring.get(key) == before[key] for key in keys if before[key] != 'c'))
+
+        with self.assertRaises(KeyError):
+            HashRing().get('key')
+
+    def test_balancer_key(self):
+        balancer = Balancer(['a', 'b', 'c'], max_failures=1)
+        owner = balancer.choose('user-1')
+        self.assertEqual({owner}, {balancer.choose('user-1') for _ in range(10)})
+
+        balancer.started(owner)
+        balancer.failed(owner)
+        self.assertNotEqual(owner, balancer.choose('user-1'))
+
+
+class WhoamiRequest(Message):
+    user: str
+
+
+class WhoamiStub(Stub):
+    class Meta:
+        name = 'whoami'
+
+    @http.GET('./whoami', auto=True)
+    def whoami(self) -> str:
+        raise NotImplementedError
+
+    @http.GET('./whoami/{user}', routing_key='user')
+    def whoami_for(self, request: WhoamiRequest) -> str:
+        raise NotImplementedError
+
+
+class WhoamiService(Service):
+    class Meta:
+        name = 'whoami'
+
+    @http.GET('./whoami')
+    def whoami(self) -> str:
+        return self.venom.options['server']
+
+    @http.GET('./whoami/{user}')
+    def whoami_for(self, request: WhoamiRequest) -> str:
+        return self.venom.options['server']
+
+
+async def _whoami(client):
+    return (await client.whoami(Empty())).value
+
+
+class HTTPClientBalancingTestCase(AioTestCase):
+    async def _serve(self, name):
+        venom = Venom(server=name)
+        venom.add(WhoamiService)
+        server = TestServer(create_app(venom))
+        await server.start_server()
+        return server
+
+    async def test_round_robin(self):
+        servers = [await self._serve(name) for name in 'abc']
+        venom = Venom()
+        venom.add(WhoamiStub, HTTPClient, [str(server.make_url('')) for server in servers])
+
+        try:
+            whoami = venom.get_instance(WhoamiStub)
+            self.assertEqual(['a', 'b', 'c', 'a'], [await _whoami(whoami) for _ in range(4)])
+            self.assertEqual([2, 1, 1], [endpoint.requests for endpoint in whoami.balancer.endpoints])
+        finally:
+            await venom.close()
+            for server in servers:
+                await server.close()
+
+    async def test_unavailable_endpoint_ejected(self):
+        servers = [await self._serve(name) for name in 'ab']
+        urls = [str(server.make_url('')) for server in servers]
+        await servers[1].close()
+
+        venom = Venom()
+        venom.add(WhoamiStub, HTTPClient, urls, balancing=Balancer(urls, max_failures=1))
+
+        try:
+            whoami = venom.get_instance(WhoamiStub)
+            self.assertEqual('a', await _whoami(whoami))
+
+            with self.assertRaises(OSError):
+                await _whoami(whoami)
+
+            a, b = whoami.balancer.endpoints
+            self.assertEqual((1, 0), (a.requests, a.failures))
+            self.assertEqual((1, 1), (b.requests, b.failures))
+            self.assertGreater(b.ejected_until, 0)
+            self.assertEqual(['a', 'a', 'a'], [await _whoami(whoami) for _ in range(3)])
+            self.assertEqual(0, a.outstanding)
+        finally:
+            await venom.close()
+            await servers[0].close()
+
+    async def test_routing_key(self):
+        servers = [await self._serve(name) for name in 'abc']
+        venom = Venom()
+        venom.add(WhoamiStub, HTTPClient, [str(server.make_url('')) for server in servers])
+
+        try:
+            whoami = venom.get_instance(WhoamiStub)
+            owners = {}
+            for user in ('alice', 'bob', 'carol', 'dave'):
+                owners[user] = {(await whoami.whoami_for(WhoamiRequest(user))).value for _ in range(3)}
+                self.assertEqual(1, len(owners[user]))
+        finally:
+            await venom.close()
+            for server in servers:
+                await server.close()
+
+    def test_unknown_routing_key(self):
+        class BadStub(Stub):
+            @http.GET('./whoami', routing_key='name')
+            def whoami(self, request: WhoamiRequest) -> str:
+                raise NotImplementedError
+
+        with self.assertRaises(ValueError):
+            HTTPClient(BadStub, ['http://a', 'http://b'])
@@ -0,0 +1,64 @@
+from unittest import TestCase
+
+from venom import Message
+from venom.protocol import JSONProtocol
+from venom.rpc import Service, http
+from venom.rpc.comms.binding import HTTPBinding
+
+
+class Snake(Message):
+    snake_id: int
+    name: str
+    size: int
+
+
+class SnakeService(Service):
+    @http.GET('./{snake_id}', request=Snake)
+    def read(self) -> Snake:
+        pass
+
+    @http.PUT('./{name}', request=Snake)
+    def update(self) -> Snake:
+        pass
+
+
+class HTTPBindingTestCase(TestCase):
+    def test_get_cached(self):
+        method = SnakeService.__methods__['read']
+        binding = HTTPBinding.get(method, JSONProtocol)
+        self.assertIs(binding, HTTPBinding.get(method, JSONProtocol))
+        self.assertIsNot(binding, HTTPBinding.get(SnakeService.__methods__['update'], JSONProtocol))
+
+    def test_field_locations(self):
+        binding = HTTPBinding.get(SnakeService.__methods__['read'], JSONProtocol)
+        self.assertEqual(frozenset({'snake_id'}), binding.path_fields)
+        self.assertEqual(frozenset({'name', 'size'}), binding.query_fields)
+        self.assertEqual(frozenset(), binding.body_fields)
+        self.assertEqual('/snake/{snakeId}', binding.path_template)
+        self.assertEqual(None, binding.request_headers)
+
+        binding = HTTPBinding.get(SnakeService.__methods__['update'], JSONProtocol)
+        self.assertEqual(frozenset({'name'}), binding.path_fields)
+        self.assertEqual(frozenset(), binding.query_fields)
+        self.assertEqual(frozenset({'snake_id', 'size'}), binding.body_fields)
+        self.assertEqual({'content-type': 'application/json'}, binding.request_headers)
+
+    def test_encode_request(self):
+        binding = HTTPBinding.get(SnakeService.__methods__['read'], JSONProtocol)
+        self.assertEqual(('/snake/42', {'name': 'Kaa', 'size': '3'}, b''),
+                         binding.encode_request(Snake(42, 'Kaa', 3)))
+
+        binding = HTTPBinding.get(SnakeService.__methods__['update'], JSONProtocol)
+        path, query, body = binding.encode_request(Snake(42, 'Mr Snek/2', 3))
+        self.assertEqual('/snake/Mr%20Snek%2F2', path)
+        self.assertEqual({}, query)
+        self.assertEqual(JSONProtocol(Snake).unpack(body), Snake(42, size=3))
+
+    def test_decode_request(self):
+        binding = HTTPBinding.get(SnakeService.__methods__['read'], JSONProtocol)
+        self.assertEqual(Snake(42, 'Kaa', 3),
+                         binding.decode_request(b'', {'name': 'Kaa', 'size': '3'}, {'snakeId': 42}))
+
+        binding = HTTPBinding.get(SnakeService.__methods__['update'], JSONProtocol)
+        self.assertEqual(Snake(42, 'Kaa', 3),
+                         binding.decode_request(b'{"snakeId": 42, "size": 3}', {}, {'name': 'Kaa'}))
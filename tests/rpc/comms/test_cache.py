@@ -0,0 +1,116 @@
+from unittest import TestCase
+
+from aiohttp import web
+from aiohttp.test_utils import AioHTTPTestCase, unittest_run_loop
+
+from venom import Message
+from venom.fields import String
+from venom.rpc import Service, Stub, Venom, http
+from venom.rpc.comms.aiohttp import create_app, HTTPClient
+from venom.rpc.comms.cache import CacheDirectives, ResponseCache, etag_matches
+from venom.rpc.test_utils import Clock
+
+
+class ResponseCacheTestCase(TestCase):
+    def test_directives(self):
+        self.assertEqual((False, False, 60), CacheDirectives.parse('public, max-age=60'))
+        self.assertEqual((True, True, None), CacheDirectives.parse('no-store, No-Cache'))
+        self.assertEqual((False, False, None), CacheDirectives.parse(None))
+
+    def test_etag_matches(self):
+        self.assertTrue(etag_matches('"a", W/"b"', '"b"'))
+        self.assertTrue(etag_matches('*', '"b"'))
+        self.assertFalse(etag_matches('"a"', '"b"'))
+        self.assertFalse(etag_matches(None, '"b"'))
+
+    def test_store(self):
+        clock = Clock()
+        cache = ResponseCache(2, clock=clock)
+
+        cache.store('/a', b'a', '"a"', 'max-age=10')
+        cache.store('/b', b'b', None, None)
+        cache.store('/c', b'c', None, 'no-store')
+        self.assertEqual(1, len(cache))
+
+        entry = cache.get('/a')
+        self.assertTrue(cache.fresh(entry))
+        clock.now = 10
+        self.assertFalse(cache.fresh(entry))
+        cache.refresh(entry, 'max-age=5')
+        self.assertTrue(cache.fresh(entry))
+
+        cache.store('/d', b'd', '"d"', 'no-cache')
+        self.assertFalse(cache.fresh(cache.get('/d')))
+
+        cache.get('/a')
+        cache.store('/e', b'e', '"e"', None)
+        self.assertIsNone(cache.get('/d'))
+        self.assertEqual(b'a', cache.get('/a').body)
+
+    def test_key(self):
+        self.assertEqual('/a', ResponseCache.key('/a', {}))
+        self.assertEqual('/a?x=1&y=2', ResponseCache.key('/a', {'y': 2, 'x': 1}))
+
+
+class HelloRequest(Message):
+    name = String()
+
+
+class HelloResponse(Message):
+    message = String()
+
+
+class GreeterStub(Stub):
+    class Meta:
+        name = 'greeter'
+
+    @http.GET('./greet')
+    def greet(self, request: HelloRequest) -> HelloResponse:
+        pass
+
+
+class GreeterService(Service):
+    class Meta:
+        name = 'greeter'
+
+    @http.GET('./greet', max_age=10)
+    def greet(self, request: HelloRequest) -> HelloResponse:
+        return HelloResponse(f'Hello, {request.name}!')
+
+
+class HTTPClientCacheTestCase(AioHTTPTestCase):
+    def get_app(self):
+        self.statuses = []
+
+        @web.middleware
+        async def record_status(request, handler):
+            response = await handler(request)
+            self.statuses.append(response.status)
+            return response
+
+        venom = Venom()
+        venom.add(GreeterService)
+        return create_app(venom, web.Application(middlewares=[record_status]))
+
+    @unittest_run_loop
+    async def test_client_cache(self):
+        clock = Clock()
+        cache = ResponseCache(clock=clock)
+
+        venom = Venom()
+        venom.add(GreeterStub, HTTPClient, f'http://127.0.0.1:{self.client.port}', cache=cache)
+        greeter = venom.get_instance(GreeterStub)
+
+        try:
+            self.assertEqual(HelloResponse('Hello, Alice!'), await greeter.greet(HelloRequest('Alice')))
+            self.assertEqual(HelloResponse('Hello, Alice!'), await greeter.greet(HelloRequest('Alice')))
+            self.assertEqual(HelloResponse('Hello, Bob!'), await greeter.greet(HelloRequest('Bob')))
+            self.assertEqual([200, 200], self.statuses)
+
+            clock.now = 10
+            self.assertEqual(HelloResponse('Hello, Alice!'), await greeter.greet(HelloRequest('Alice')))
+            self.assertEqual(HelloResponse('Hello, Alice!'), await greeter.greet(HelloRequest('Alice')))
+            self.assertEqual([200, 200, 304], self.statuses)
+            self.assertEqual((2, 1, 2), (cache.hits, cache.revalidations, cache.misses))
+        finally:
+            await venom.close()
@@ -0,0 +1,96 @@
+from unittest import TestCase
+
+from aiohttp import web
+from aiohttp.test_utils import AioHTTPTestCase, unittest_run_loop
+
+from venom import Message
+from venom.fields import String
+from venom.rpc import Service, Stub, Venom, http
+from venom.rpc.comms.aiohttp import create_app, HTTPClient
+from venom.rpc.comms.compression import compress, decompress, negotiate
+
+
+class NegotiateTestCase(TestCase):
+    def test_negotiate(self):
+        self.assertEqual('gzip', negotiate('gzip, deflate, br'))
+        self.assertEqual('deflate', negotiate('gzip;q=0.5, deflate'))
+        self.assertEqual('deflate', negotiate('deflate, gzip;q=0'))
+        self.assertEqual('gzip', negotiate('*'))
+        self.assertEqual(None, negotiate('br'))
+        self.assertEqual(None, negotiate('identity'))
+        self.assertEqual(None, negotiate(None))
+
+    def test_compress(self):
+        for encoding in ('gzip', 'deflate'):
+            self.assertEqual(b'venom' * 100, decompress(compress(b'venom' * 100, encoding, 1), encoding))
+
+
+class Text(Message):
+    text = String()
+
+
+class EchoStub(Stub):
+    class Meta:
+        name = 'echo'
+
+    @http.POST('./echo')
+    def echo(self, request: Text) -> Text:
+        pass
+
+
+class EchoService(Service):
+    class Meta:
+        name = 'echo'
+
+    @http.POST('./echo')
+    def echo(self, request: Text) -> Text:
+        return request
+
+    @http.POST('./echo-fast', compression_threshold=10000, compression_level=1)
+    def echo_fast(self, request: Text) -> Text:
+        return request
+
+
+class CompressionTestCase(AioHTTPTestCase):
+    def get_app(self):
+        self.encodings = []
+
+        @web.middleware
+        async def record_encoding(request, handler):
+            self.encodings.append(request.headers.get('Content-Encoding'))
+            return await handler(request)
+
+        venom = Venom()
+        venom.add(EchoService)
+        return create_app(venom, web.Application(middlewares=[record_encoding]), compression_threshold=100)
+
+    @unittest_run_loop
+    async def test_response_compression(self):
+        text = 'venom' * 100
+
+        response = await self.client.post('/echo/echo', json={'text': text}, headers={'Accept-Encoding': 'deflate'})
+        self.assertEqual('deflate', response.headers['Content-Encoding'])
+        self.assertEqual('Accept-Encoding', response.headers['Vary'])
+        self.assertEqual({'text': text}, await response.json())
+
+        response = await self.client.post('/echo/echo', json={'text': 'venom'}, headers={'Accept-Encoding': 'gzip'})
+        self.assertNotIn('Content-Encoding', response.headers)
+
+        response = await self.client.post('/echo/echo', json={'text': text}, headers={'Accept-Encoding': 'identity'})
+        self.assertNotIn('Content-Encoding', response.headers)
+
+        response = await self.client.post('/echo/echo-fast', json={'text': text}, headers={'Accept-Encoding': 'gzip'})
+        self.assertNotIn('Content-Encoding', response.headers)
+
+    @unittest_run_loop
+    async def test_request_compression(self):
+        venom = Venom()
+        venom.add(EchoStub, HTTPClient, f'http://127.0.0.1:{self.client.port}', compression_threshold=100)
+        echo = venom.get_instance(EchoStub)
+
+        try:
+            self.assertEqual(Text('venom' * 100), await echo.echo(Text('venom' * 100)))
+            self.assertEqual(Text('venom'), await echo.echo(Text('venom')))
+            self.assertEqual(['gzip', None], self.encodings)
+        finally:
+            await venom.close()
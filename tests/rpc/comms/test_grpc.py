@@ -0,0 +1,202 @@
+from typing import AsyncIterator
+
+from venom import Message
+from venom.exceptions import NotFound, NotImplemented_
+from venom.rpc import Service, Stub, Venom, rpc
+from venom.rpc.comms.grpc import Client, create_server
+from venom.rpc.test_utils import AioTestCase
+
+
+class HelloRequest(Message):
+    name: str
+
+
+class HelloResponse(Message):
+    message: str
+
+
+class HelloStub(Stub):
+    class Meta:
+        name = 'hello'
+
+    @rpc
+    def say_hello(self, request: HelloRequest) -> HelloResponse:
+        raise NotImplementedError
+
+    @rpc
+    def say_goodbye(self, request: HelloRequest) -> HelloResponse:
+        raise NotImplementedError
+
+    @rpc
+    def missing(self, request: HelloRequest) -> HelloResponse:
+        raise NotImplementedError
+
+    @rpc(routing_key='name')
+    def whoami(self, request: HelloRequest) -> HelloResponse:
+        raise NotImplementedError
+
+
+class HelloService(Service):
+    class Meta:
+        name = 'hello'
+
+    @rpc
+    async def say_hello(self, request: HelloRequest) -> HelloResponse:
+        if not request.name:
+            raise NotFound('Nobody to greet')
+        return HelloResponse(message=f'Hello, {request.name}!')
+
+    @rpc
+    def say_goodbye(self, request: HelloRequest) -> HelloResponse:
+        raise NotImplementedError
+
+    @rpc
+    async def whoami(self, request: HelloRequest) -> HelloResponse:
+        return HelloResponse(self.venom.options.get('server', ''))
+
+
+class ChatStub(Stub):
+    class Meta:
+        name = 'chat'
+
+    @rpc
+    def countdown(self, request: HelloRequest) -> AsyncIterator[HelloResponse]:
+        raise NotImplementedError
+
+    @rpc
+    def join(self, requests: AsyncIterator[HelloRequest]) -> HelloResponse:
+        raise NotImplementedError
+
+    @rpc
+    def echo(self, requests: AsyncIterator[HelloRequest]) -> AsyncIterator[HelloResponse]:
+        raise NotImplementedError
+
+
+class ChatService(Service):
+    class Meta:
+        name = 'chat'
+
+    @rpc
+    async def countdown(self, request: HelloRequest) -> AsyncIterator[HelloResponse]:
+        for i in range(3, 0, -1):
+            yield HelloResponse(f'{request.name} {i}')
+        raise NotFound('Liftoff')
+
+    @rpc
+    async def join(self, requests: AsyncIterator[HelloRequest]) -> HelloResponse:
+        return HelloResponse(', '.join([request.name async for request in requests]))
+
+    @rpc
+    async def echo(self, requests: AsyncIterator[HelloRequest]) -> AsyncIterator[HelloResponse]:
+        async for request in requests:
+            yield HelloResponse(request.name.upper())
+
+
+async def _requests(*names):
+    for name in names:
+        yield HelloRequest(name)
+
+
+class GRPCTestCase(AioTestCase):
+    async def _serve(self, **options):
+        venom = Venom(**options)
+        venom.add(HelloService)
+        venom.add(ChatService)
+
+        server = create_server(venom)
+        port = server.add_insecure_port('127.0.0.1:0')
+        await server.start()
+        return server, port
+
+    async def test_unary_unary(self):
+        server, port = await self._serve()
+        client = Client(HelloStub, '127.0.0.1', port)
+        try:
+            self.assertEqual(HelloResponse('Hello, Alice!'), await client.invoke(HelloStub.say_hello,
+                                                                                HelloRequest('Alice')))
+
+            client_venom = Venom()
+            client_venom.add(HelloStub, Client, '127.0.0.1', port)
+            hello = client_venom.get_instance(HelloStub)
+            self.assertEqual(HelloResponse('Hello, Bob!'), await hello.say_hello(HelloRequest('Bob')))
+            await hello.close()
+        finally:
+            await client.close()
+            await server.stop(None)
+
+    async def test_errors(self):
+        server, port = await self._serve()
+        client = Client(HelloStub, '127.0.0.1', port)
+        try:
+            with self.assertRaises(NotFound) as cm:
+                await client.invoke(HelloStub.say_hello, HelloRequest())
+            self.assertEqual('Nobody to greet', cm.exception.description)
+
+            with self.assertRaises(NotImplemented_):
+                await client.invoke(HelloStub.say_goodbye, HelloRequest('Alice'))
+
+            with self.assertRaises(NotImplemented_):
+                await client.invoke(HelloStub.missing, HelloRequest('Alice'))
+        finally:
+            await client.close()
+            await server.stop(None)
+
+    async def test_streaming(self):
+        self.assertTrue(ChatService.countdown.server_streaming)
+        self.assertFalse(ChatService.countdown.client_streaming)
+        self.assertEqual(HelloRequest, ChatStub.join.request)
+        self.assertTrue(ChatStub.echo.client_streaming and ChatStub.echo.server_streaming)
+
+        server, port = await self._serve()
+        client = Client(ChatStub, '127.0.0.1', port)
+        try:
+            responses = await client.invoke(ChatStub.countdown, HelloRequest('T-'))
+            received = []
+            with self.assertRaises(NotFound):
+                async for response in responses:
+                    received.append(response.message)
+            self.assertEqual(['T- 3', 'T- 2', 'T- 1'], received)
+
+            self.assertEqual(HelloResponse('Alice, Bob'),
+                             await client.invoke(ChatStub.join, _requests('Alice', 'Bob')))
+
+            responses = await client.invoke(ChatStub.echo, _requests('a', 'b', 'c'))
+            self.assertEqual(['A', 'B', 'C'], [response.message async for response in responses])
+        finally:
+            await client.close()
+            await server.stop(None)
+
+    async def test_channel_pool(self):
+        with self.assertRaises(ValueError):
+            Client(HelloStub, '127.0.0.1', channels=0)
+
+        server, port = await self._serve()
+        client = Client(HelloStub, '127.0.0.1', port, channels=3)
+        try:
+            for i in range(7):
+                self.assertEqual(HelloResponse(f'Hello, {i}!'), await client.invoke(HelloStub.say_hello,
+                                                                                   HelloRequest(str(i))))
+            self.assertEqual(3, len(client._channels))
+            self.assertEqual(1, client._next_channel)
+        finally:
+            await client.close()
+            await server.stop(None)
+
+    async def test_routing_key(self):
+        servers, ports = zip(*[await self._serve(server=name) for name in 'abc'])
+        client = Client(HelloStub, endpoints=[f'127.0.0.1:{port}' for port in ports], channels=2)
+        try:
+            servers_hit = set()
+            for name in ('alice', 'bob', 'carol', 'dave', 'eve'):
+                responses = {(await client.invoke(HelloStub.whoami, HelloRequest(name))).message for _ in range(3)}
+                self.assertEqual(1, len(responses))
+                servers_hit |= responses
+
+            self.assertLessEqual(2, len(servers_hit))
+            for i in range(3):
+                await client.invoke(HelloStub.say_hello, HelloRequest(str(i)))
+            self.assertEqual(6, len(client._channels))
+        finally:
+            await client.close()
+            for server in servers:
+                await server.stop(None)
@@ -0,0 +1,208 @@
+import asyncio
+import json
+
+from venom import Message
+from venom.exceptions import Error, NotFound
+from venom.rpc import Service, Stub, Venom, http
+from venom.rpc.comms.aiohttp import HTTPClient
+from venom.rpc.comms.httpserver import create_server
+from venom.rpc.test_utils import AioTestCase
+
+
+class NetworkTimeout(Error):
+    http_status = 599
+    description = 'Network Connect Timeout'
+
+
+class Snake(Message):
+    id: int
+    name: str
+    size: int
+
+
+class SnakeStub(Stub):
+    class Meta:
+        name = 'snake'
+
+    @http.POST('.', request=Snake)
+    def create(self, request: Snake) -> Snake:
+        raise NotImplementedError
+
+    @http.GET('./{id}', request=Snake)
+    def read(self, request: Snake) -> Snake:
+        raise NotImplementedError
+
+
+class SnakeService(Service):
+    class Meta:
+        name = 'snake'
+
+    @http.POST('.', request=Snake)
+    def create(self, name: str, size: int = 2) -> Snake:
+        return Snake(1, name, size)
+
+    @http.GET('./{id}', request=Snake)
+    async def read(self, id: int, name: str) -> Snake:
+        if id == 404:
+            raise NotFound('No such snake')
+        await asyncio.sleep(0.01 if id == 1 else 0)
+        return Snake(id, name or f'Snek #{id}')
+
+    @http.POST('./{id}/hiss', request=Snake)
+    def hiss(self, id: int) -> None:
+        pass
+
+    @http.GET('./status/500')
+    def http500(self) -> None:
+        raise ValueError('No!')
+
+    @http.GET('./status/599')
+    def http599(self) -> None:
+        raise NetworkTimeout()
+
+
+async def _read_response(reader):
+    head = (await reader.readuntil(b'\r\n\r\n')).decode('latin-1').split('\r\n')
+    headers = dict(line.split(': ', 1) for line in head[1:] if line)
+    body = await reader.readexactly(int(headers.get('content-length', 0)))
+    return int(head[0].split(' ')[1]), headers, body
+
+
+class HTTPServerTestCase(AioTestCase):
+    async def _serve(self, **kwargs):
+        venom = Venom()
+        venom.add(SnakeService)
+        server = await create_server(venom, '127.0.0.1', 0, warm=True, **kwargs)
+        return server, server.sockets[0].getsockname()[1]
+
+    async def _stop(self, server):
+        server.close()
+        await server.wait_closed()
+
+    async def test_client(self):
+        server, port = await self._serve()
+        client = HTTPClient(SnakeStub, f'http://127.0.0.1:{port}')
+        try:
+            snake = await client.invoke(SnakeStub.create, Snake(name='Snek', size=9001))
+            self.assertEqual(Snake(1, 'Snek', 9001), snake)
+            self.assertEqual(Snake(3, 'Kaa'), await client.invoke(SnakeStub.read, Snake(3, 'Kaa')))
+
+            with self.assertRaisesRegex(RuntimeError, 'HTTP status 404: No such snake'):
+                await client.invoke(SnakeStub.read, Snake(404))
+        finally:
+            await client.close()
+            await self._stop(server)
+
+    async def test_pipelining(self):
+        server, port = await self._serve()
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        try:
+            body = b'{"name": "Snek"}'
+            writer.write(b'GET /snake/1 HTTP/1.1\r\nHost: localhost\r\n\r\n'
+                         b'POST /snake HTTP/1.1\r\nContent-Type: application/json\r\nContent-Length: %d\r\n\r\n%s'
+                         b'GET /snake/404 HTTP/1.1\r\n\r\n'
+                         b'POST /snake/5/hiss HTTP/1.1\r\nContent-Length: 2\r\n\r\n{}' % (len(body), body))
+
+            # answered in order, although the first request takes longest
+            status, headers, body = await _read_response(reader)
+            self.assertEqual(200, status)
+            self.assertEqual('application/json', headers['content-type'])
+            self.assertIn('date', headers)
+            self.assertEqual({'id': 1, 'name': 'Snek #1'}, json.loads(body))
+
+            status, headers, body = await _read_response(reader)
+            self.assertEqual(200, status)
+            self.assertEqual({'id': 1, 'name': 'Snek', 'size': 2}, json.loads(body))
+
+            status, headers, body = await _read_response(reader)
+            self.assertEqual(404, status)
+            self.assertEqual({'status': 404, 'description': 'No such snake'}, json.loads(body))
+
+            status, headers, body = await _read_response(reader)
+            self.assertEqual(204, status)
+            self.assertNotIn('connection', headers)
+
+            # the connection is kept alive until the client asks to close it
+            writer.write(b'GET /snake/2?name=Nagini HTTP/1.1\r\nConnection: close\r\n\r\n')
+            status, headers, body = await _read_response(reader)
+            self.assertEqual({'id': 2, 'name': 'Nagini'}, json.loads(body))
+            self.assertEqual('close', headers['connection'])
+            self.assertEqual(b'', await reader.read())
+        finally:
+            writer.close()
+            await self._stop(server)
+
+    async def test_errors(self):
+        server, port = await self._serve()
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        try:
+            writer.write(b'GET /snake/bite HTTP/1.1\r\n\r\n'
+                         b'DELETE /snake/3 HTTP/1.1\r\n\r\n'
+                         b'GET /snake/status/500 HTTP/1.1\r\n\r\n'
+                         b'GET /snake/status/599 HTTP/1.1\r\n\r\n'
+                         b'POST /snake HTTP/1.1\r\nContent-Type: text/plain\r\nContent-Length: 2\r\n\r\n{}'
+                         b'POST /snake HTTP/1.1\r\nContent-Length: 15\r\n\r\n{"size": "big"}')
+
+            self.assertEqual(404, (await _read_response(reader))[0])
+
+            status, headers, body = await _read_response(reader)
+            self.assertEqual(405, status)
+            self.assertEqual('GET', headers['allow'])
+
+            status, headers, body = await _read_response(reader)
+            self.assertEqual(500, status)
+            self.assertEqual({'status': 500, 'description': 'Internal Server Error'}, json.loads(body))
+
+            # statuses unknown to http.HTTPStatus are still answered
+            status, headers, body = await _read_response(reader)
+            self.assertEqual(599, status)
+            self.assertEqual({'status': 599, 'description': 'Network Connect Timeout'}, json.loads(body))
+
+            self.assertEqual(415, (await _read_response(reader))[0])
+            self.assertEqual(400, (await _read_response(reader))[0])
+
+            # a malformed request is answered after the requests before it, and closes the connection
+            writer.write(b'GET /snake/3 HTTP/1.1\r\n\r\nNONSENSE\r\n\r\nGET /snake/3 HTTP/1.1\r\n\r\n')
+            self.assertEqual(200, (await _read_response(reader))[0])
+            status, headers, body = await _read_response(reader)
+            self.assertEqual(400, status)
+            self.assertEqual('close', headers['connection'])
+            self.assertEqual(b'', await reader.read())
+        finally:
+            writer.close()
+            await self._stop(server)
+
+    async def test_expect_continue(self):
+        server, port = await self._serve()
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        try:
+            body = b'{"name": "Snek"}'
+            writer.write(b'POST /snake HTTP/1.1\r\nExpect: 100-continue\r\nContent-Length: %d\r\n\r\n' % len(body))
+            self.assertEqual(b'HTTP/1.1 100 Continue\r\n\r\n', await reader.readuntil(b'\r\n\r\n'))
+            writer.write(body)
+            self.assertEqual(200, (await _read_response(reader))[0])
+
+            # with an earlier request still unanswered, the 100 Continue is sent after its response
+            writer.write(b'GET /snake/1 HTTP/1.1\r\n\r\n'
+                         b'POST /snake HTTP/1.1\r\nExpect: 100-continue\r\nContent-Length: %d\r\n\r\n' % len(body))
+            status, headers, _ = await _read_response(reader)
+            self.assertEqual(200, status)
+            self.assertEqual(b'HTTP/1.1 100 Continue\r\n\r\n', await reader.readuntil(b'\r\n\r\n'))
+            writer.write(body)
+            self.assertEqual(200, (await _read_response(reader))[0])
+        finally:
+            writer.close()
+            await self._stop(server)
+
+    async def test_keepalive_timeout(self):
+        server, port = await self._serve(keepalive_timeout=0.01)
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        try:
+            writer.write(b'GET /snake/3 HTTP/1.0\r\nConnection: keep-alive\r\n\r\n')
+            status, headers, body = await _read_response(reader)
+            self.assertEqual(200, status)
+            self.assertEqual('keep-alive', headers['connection'])
+            self.assertEqual(b'', await asyncio.wait_for(reader.read(), 1))
+        finally:
+            writer.close()
+            await self._stop(server)
@@ -0,0 +1,124 @@
+import asyncio
+from unittest import TestCase
+
+from aiohttp.test_utils import TestServer
+
+from venom import Empty
+from venom.rpc import Service, Stub, Venom, http
+from venom.rpc.comms.aiohttp import create_app, HTTPClient
+from venom.rpc.comms.limits import AIMDLimit, GradientLimit, Limiter, LimitExceeded
+from venom.rpc.test_utils import AioTestCase
+
+
+class LimitAlgorithmTestCase(TestCase):
+    def test_aimd(self):
+        algorithm = AIMDLimit(10, tolerance=2, backoff=0.5)
+        for _ in range(50):
+            limit = algorithm.update(0.01, False, 10)
+        self.assertEqual(14, limit)
+
+        self.assertEqual(14, algorithm.update(0.01, False, 1))
+        self.assertEqual(7, algorithm.update(0.05, False, 10))
+        self.assertEqual(3, algorithm.update(0.01, True, 10))
+
+        for _ in range(10):
+            algorithm.update(0.01, True, 10)
+        self.assertEqual(1, algorithm.update(0.01, True, 10))
+
+    def test_gradient(self):
+        algorithm = GradientLimit(20, max_limit=50)
+        for _ in range(100):
+            limit = algorithm.update(0.01, False, 20)
+        self.assertEqual(50, limit)
+
+        for _ in range(50):
+            limit = algorithm.update(0.1, False, 20)
+        self.assertLess(limit, 10)
+
+    def test_probe_interval(self):
+        algorithm = AIMDLimit(probe_interval=3)
+        algorithm.update(0.01, False, 1)
+        algorithm.update(0.02, False, 1)
+        self.assertEqual(0.01, algorithm.min_latency)
+        algorithm.update(0.05, False, 1)
+        self.assertEqual(0.05, algorithm.min_latency)
+
+
+class LimiterTestCase(AioTestCase):
+    async def test_queue(self):
+        limiter = Limiter(AIMDLimit(2), max_queue=1)
+        first = await limiter.acquire()
+        await limiter.acquire()
+
+        queued = asyncio.ensure_future(limiter.acquire())
+        await asyncio.sleep(0)
+        self.assertEqual(1, limiter.queued)
+
+        with self.assertRaises(LimitExceeded):
+            await limiter.acquire()
+        self.assertEqual(1, limiter.rejected)
+
+        limiter.release(first)
+        await queued
+        self.assertEqual((2, 0), (limiter.in_flight, limiter.queued))
+
+    async def test_queue_timeout(self):
+        limiter = Limiter(AIMDLimit(1), queue_timeout=0.01)
+        await limiter.acquire()
+        with self.assertRaises(LimitExceeded):
+            await limiter.acquire()
+        self.assertEqual((1, 0), (limiter.in_flight, limiter.queued))
+
+    async def test_cancelled_waiter(self):
+        limiter = Limiter(AIMDLimit(1))
+        started = await limiter.acquire()
+        queued = asyncio.ensure_future(limiter.acquire())
+        await asyncio.sleep(0)
+
+        queued.cancel()
+        limiter.release(started, ignore=True)
+        with self.assertRaises(asyncio.CancelledError):
+            await queued
+        self.assertEqual((0, 0), (limiter.in_flight, limiter.queued))
+
+
+class SlowStub(Stub):
+    class Meta:
+        name = 'slow'
+
+    @http.GET('./wait', auto=True)
+    def wait(self) -> None:
+        raise NotImplementedError
+
+
+class SlowService(Service):
+    class Meta:
+        name = 'slow'
+
+    @http.GET('./wait')
+    async def wait(self) -> None:
+        await asyncio.sleep(0.05)
+
+
+class HTTPClientLimitTestCase(AioTestCase):
+    async def test_fail_fast(self):
+        server_venom = Venom()
+        server_venom.add(SlowService)
+        server = TestServer(create_app(server_venom))
+        await server.start_server()
+
+        base_url = str(server.make_url(''))
+        venom = Venom()
+        venom.add(SlowStub, HTTPClient, base_url, concurrency_limit=lambda: Limiter(AIMDLimit(2), max_queue=0))
+
+        try:
+            slow = venom.get_instance(SlowStub)
+            results = await asyncio.gather(*(slow.wait(Empty()) for _ in range(3)), return_exceptions=True)
+            self.assertEqual(2, results.count(Empty()))
+            self.assertEqual(1, len([result for result in results if isinstance(result, LimitExceeded)]))
+
+            limiter = slow.limiters()[base_url]
+            self.assertEqual((0, 1), (limiter.in_flight, limiter.rejected))
+        finally:
+            await venom.close()
+            await server.close()
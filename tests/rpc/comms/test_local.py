@@ -0,0 +1,105 @@
+from venom import Message
+from venom.exceptions import NotImplemented_
+from venom.fields import String, repeated
+from venom.rpc import Service, Stub, Venom, rpc
+from venom.rpc.comms.local import LocalClient
+from venom.rpc.dispatch import UnknownMethod
+from venom.rpc.test_utils import AioTestCase
+
+
+class HelloRequest(Message):
+    name = String()
+    tags = repeated(String())
+
+
+class HelloResponse(Message):
+    message = String()
+
+
+class GreeterStub(Stub):
+    @rpc
+    def greet(self, request: HelloRequest) -> HelloResponse:
+        raise NotImplementedError
+
+    @rpc
+    def tag(self, request: HelloRequest) -> HelloRequest:
+        raise NotImplementedError
+
+    @rpc
+    def goodbye(self) -> None:
+        raise NotImplementedError
+
+    @rpc
+    def unknown(self) -> None:
+        raise NotImplementedError
+
+
+class GreeterService(Service):
+    class Meta:
+        stub = GreeterStub
+
+    @rpc
+    def greet(self, name: str) -> HelloResponse:
+        return HelloResponse(f'Hello, {name}!')
+
+    @rpc
+    def tag(self, request: HelloRequest) -> HelloRequest:
+        request.tags.append('greeted')
+        return request
+
+    @rpc
+    def goodbye(self) -> None:
+        raise NotImplementedError
+
+
+def _venoms(**client_kwargs):
+    venom = Venom()
+    venom.add(GreeterService)
+
+    client_venom = Venom()
+    client_venom.add(GreeterStub, LocalClient, venom, **client_kwargs)
+    return venom, client_venom
+
+
+class LocalClientTestCase(AioTestCase):
+    async def test_invoke(self):
+        _, client_venom = _venoms()
+        greeter = client_venom.get_instance(GreeterStub)
+
+        self.assertEqual(HelloResponse('Hello, Alice!'), await greeter.greet(HelloRequest('Alice')))
+
+    async def test_errors(self):
+        _, client_venom = _venoms()
+        greeter = client_venom.get_instance(GreeterStub)
+
+        with self.assertRaises(NotImplemented_):
+            await greeter.goodbye(Message())
+
+        # methods declared only in the stub are not implemented
+        with self.assertRaises(NotImplemented_):
+            await greeter.unknown(Message())
+
+        client_venom = Venom()
+        client_venom.add(GreeterStub, LocalClient, Venom())
+
+        with self.assertRaises(UnknownMethod):
+            await client_venom.get_instance(GreeterStub).greet(HelloRequest('Alice'))
+
+    async def test_pass_through(self):
+        _, client_venom = _venoms()
+        greeter = client_venom.get_instance(GreeterStub)
+
+        request = HelloRequest('Alice', ['a'])
+        response = await greeter.tag(request)
+        self.assertIs(request, response)
+        self.assertEqual(['a', 'greeted'], list(request.tags))
+
+    async def test_copy(self):
+        _, client_venom = _venoms(copy=True)
+        greeter = client_venom.get_instance(GreeterStub)
+
+        request = HelloRequest('Alice', ['a'])
+        response = await greeter.tag(request)
+        self.assertIsNot(request, response)
+        self.assertEqual(['a'], list(request.tags))
+        self.assertEqual(['a', 'greeted'], list(response.tags))
@@ -0,0 +1,191 @@
+import asyncio
+from unittest import TestCase
+
+from aiohttp.test_utils import TestServer
+
+from venom import Empty
+from venom.exceptions import ServiceUnavailable, NotFound
+from venom.rpc import Service, Stub, Venom, http
+from venom.rpc.comms.aiohttp import create_app, HTTPClient
+from venom.rpc.method import Method, HTTPVerb
+from venom.rpc.comms.resilience import CallPolicy, CallStats, LatencyTracker, RetryBudget
+from venom.rpc.test_utils import AioTestCase, Clock
+
+
+class CounterStub(Stub):
+    class Meta:
+        name = 'counter'
+
+    @http.GET('./next', auto=True, idempotent=True, retries=2, retry_backoff=0)
+    def next(self) -> int:
+        raise NotImplementedError
+
+    @http.GET('./slow', auto=True, idempotent=True, hedge=0.01, retries=0)
+    def slow(self) -> int:
+        raise NotImplementedError
+
+    @http.POST('./reset', auto=True)
+    def reset(self) -> int:
+        raise NotImplementedError
+
+
+def _method(**options):
+    return Method('method', Empty, Empty, None, http_path='./method', http_method=HTTPVerb.GET, http_status=200,
+                  **options)
+
+
+class CounterService(Service):
+    class Meta:
+        name = 'counter'
+
+    @http.GET('./next')
+    def next(self) -> int:
+        state = self.venom.options['state']
+        state['calls'] += 1
+        if state['calls'] <= state['unavailable']:
+            raise ServiceUnavailable()
+        return state['calls']
+
+    @http.GET('./slow')
+    async def slow(self) -> int:
+        state = self.venom.options['state']
+        state['calls'] += 1
+        if state['calls'] == 1:
+            await asyncio.sleep(5)
+        return state['calls']
+
+    @http.POST('./reset')
+    def reset(self) -> int:
+        self.venom.options['state']['calls'] = 0
+        return 0
+
+
+class RetryBudgetTestCase(TestCase):
+    def test_budget(self):
+        clock = Clock()
+        budget = RetryBudget(0.5, min_per_second=1, capacity=2, clock=clock)
+        self.assertTrue(budget.withdraw())
+        self.assertTrue(budget.withdraw())
+        self.assertFalse(budget.withdraw())
+
+        budget.deposit()
+        budget.deposit()
+        self.assertTrue(budget.withdraw())
+        self.assertFalse(budget.withdraw())
+
+        clock.now = 1
+        self.assertTrue(budget.withdraw())
+
+    def test_latency_percentile(self):
+        tracker = LatencyTracker(window=100, min_samples=10)
+        for i in range(9):
+            tracker.add(i / 100)
+        self.assertIsNone(tracker.percentile(95))
+
+        for i in range(9, 100):
+            tracker.add(i / 100)
+        self.assertEqual(0.95, tracker.percentile(95))
+        self.assertEqual(0.5, tracker.percentile(50))
+
+
+class CallPolicyTestCase(AioTestCase):
+    def test_requires_idempotent(self):
+        with self.assertRaises(ValueError):
+            CallPolicy(_method(hedge=True), RetryBudget())
+
+    async def test_retries(self):
+        policy = CallPolicy(CounterStub.next, RetryBudget())
+        failures = [ServiceUnavailable(), ConnectionRefusedError()]
+
+        async def attempt():
+            if failures:
+                raise failures.pop()
+            return 'ok'
+
+        self.assertEqual('ok', await policy.call(attempt))
+        self.assertEqual(CallStats(calls=1, retries=2, hedges=0, hedge_wins=0, budget_exhausted=0), policy.stats())
+
+        failures = [NotFound()]
+        with self.assertRaises(NotFound):
+            await policy.call(attempt)
+
+    async def test_retry_budget_exhausted(self):
+        policy = CallPolicy(CounterStub.next, RetryBudget(0, min_per_second=0, capacity=0))
+
+        async def attempt():
+            raise ServiceUnavailable()
+
+        with self.assertRaises(ServiceUnavailable):
+            await policy.call(attempt)
+        self.assertEqual(CallStats(calls=1, retries=0, hedges=0, hedge_wins=0, budget_exhausted=1), policy.stats())
+
+    async def test_hedge(self):
+        policy = CallPolicy(CounterStub.slow, RetryBudget())
+        cancelled = []
+        delays = [5, 0]
+
+        async def attempt():
+            try:
+                await asyncio.sleep(delays.pop(0))
+            except asyncio.CancelledError:
+                cancelled.append(True)
+                raise
+            return len(delays)
+
+        self.assertEqual(0, await policy.call(attempt))
+        await asyncio.sleep(0)
+        self.assertEqual([True], cancelled)
+        self.assertEqual(CallStats(calls=1, retries=0, hedges=1, hedge_wins=1, budget_exhausted=0), policy.stats())
+
+    async def test_adaptive_hedge_delay(self):
+        policy = CallPolicy(_method(idempotent=True, hedge=True), RetryBudget())
+        self.assertIsNone(policy.hedge_delay())
+
+        for i in range(100):
+            policy.latencies.add(i / 1000)
+        self.assertEqual(0.095, policy.hedge_delay())
+
+
+class HTTPClientResilienceTestCase(AioTestCase):
+    async def _serve(self, **state):
+        state['calls'] = 0
+        venom = Venom(state=state)
+        venom.add(CounterService)
+        server = TestServer(create_app(venom))
+        await server.start_server()
+        return server, state
+
+    async def test_retry_unavailable(self):
+        server, state = await self._serve(unavailable=2)
+        venom = Venom()
+        venom.add(CounterStub, HTTPClient, str(server.make_url('')))
+
+        try:
+            counter = venom.get_instance(CounterStub)
+            self.assertEqual(3, (await counter.next(Empty())).value)
+            self.assertEqual(2, counter.call_stats()['next'].retries)
+            self.assertNotIn('reset', counter.call_stats())
+
+            await counter.reset(Empty())
+            state['unavailable'] = 5
+            with self.assertRaises(ServiceUnavailable):
+                await counter.next(Empty())
+            self.assertEqual(3, state['calls'])
+            self.assertEqual(4, counter.call_stats()['next'].retries)
+        finally:
+            await venom.close()
+            await server.close()
+
+    async def test_hedge(self):
+        server, state = await self._serve(unavailable=0)
+        venom = Venom()
+        venom.add(CounterStub, HTTPClient, str(server.make_url('')))
+
+        try:
+            counter = venom.get_instance(CounterStub)
+            self.assertEqual(2, (await counter.slow(Empty())).value)
+            self.assertEqual(CallStats(calls=1, retries=0, hedges=1, hedge_wins=1, budget_exhausted=0),
+                             counter.call_stats()['slow'])
+        finally:
+            await venom.close()
+            await server.close()
@@ -0,0 +1,131 @@
+import asyncio
+import os
+import tempfile
+from unittest import TestCase
+
+from venom import Message
+from venom.exceptions import NotFound, ServiceUnavailable
+from venom.rpc import Service, Stub, Venom, rpc
+from venom.rpc.comms.shm import Client, RingBuffer, Segment, create_server, _SHM_DIRECTORY
+from venom.rpc.test_utils import AioTestCase
+
+
+class RingBufferTestCase(TestCase):
+    def test_read_write(self):
+        segment = Segment(size=RingBuffer.size(8))
+        try:
+            ring = RingBuffer(segment.buf)
+            self.assertEqual(8, ring.capacity)
+            self.assertEqual(b'', ring.read())
+
+            self.assertEqual(5, ring.write(b'abcde'))
+            self.assertEqual(3, ring.write(b'fghij'))
+            self.assertEqual(0, ring.write(b'k'))
+            self.assertEqual(b'abcdefgh', ring.read())
+
+            # wraps around the end of the buffer
+            self.assertEqual(6, ring.write(b'123456'))
+            self.assertEqual(b'123456', ring.read())
+
+            self.assertFalse(ring.writer_waiting)
+            ring.writer_waiting = True
+            attached = Segment(segment.name)
+            self.assertTrue(RingBuffer(attached.buf).writer_waiting)
+            attached.close()
+        finally:
+            segment.unlink()
+            segment.close()
+
+    def test_invalid_name(self):
+        for name in ('/etc/passwd', '../venom-0123456789abcdef', 'venom-0123456789abcdef/..', 'psm_123'):
+            with self.assertRaises(ValueError):
+                Segment(name)
+
+
+class EchoRequest(Message):
+    text: str
+
+
+class EchoStub(Stub):
+    class Meta:
+        name = 'echo'
+
+    @rpc
+    def echo(self, request: EchoRequest) -> EchoRequest:
+        raise NotImplementedError
+
+
+class EchoService(Service):
+    class Meta:
+        name = 'echo'
+
+    @rpc
+    async def echo(self, request: EchoRequest) -> EchoRequest:
+        if not request.text:
+            raise NotFound('Nothing to echo')
+        await asyncio.sleep(0)
+        return request
+
+
+class SharedMemoryTestCase(AioTestCase):
+    async def _serve(self, directory):
+        venom = Venom()
+        venom.add(EchoService)
+        path = os.path.join(directory, 'echo.sock')
+        return await create_server(venom, path), path
+
+    async def _stop(self, client, server):
+        await client.close()
+        server.close()
+        await server.wait_closed()
+
+    async def test_call(self):
+        with tempfile.TemporaryDirectory() as directory:
+            server, path = await self._serve(directory)
+            client = Client(EchoStub, path, buffer_size=64)
+            try:
+                self.assertEqual(EchoRequest('venom'), await client.invoke(EchoStub.echo, EchoRequest('venom')))
+
+                # larger than the ring buffers, and concurrent
+                texts = ['venom' * 20000, 'a', 'b' * 1000]
+                responses = await asyncio.gather(*(client.invoke(EchoStub.echo, EchoRequest(text)) for text in texts))
+                self.assertEqual([EchoRequest(text) for text in texts], responses)
+
+                with self.assertRaises(NotFound):
+                    await client.invoke(EchoStub.echo, EchoRequest())
+
+                connection = await client._connections[0]
+                segments = connection.transport._segments
+                self.assertFalse(any(os.path.exists(os.path.join(_SHM_DIRECTORY, segment.name))
+                                     for segment in segments))
+            finally:
+                await self._stop(client, server)
+
+            await asyncio.sleep(0)
+            self.assertTrue(all(segment.buf is None for segment in segments))
+
+    async def test_handshake_rejects_paths(self):
+        with tempfile.TemporaryDirectory() as directory:
+            server, path = await self._serve(directory)
+            target = os.path.join(directory, 'target')
+            with open(target, 'wb') as f:
+                f.write(b'\x00' * 64)
+
+            try:
+                reader, writer = await asyncio.open_unix_connection(path)
+                writer.write(f'{target}\t{target}\n'.encode('utf-8'))
+                self.assertEqual(b'', await reader.read())
+                writer.close()
+            finally:
+                server.close()
+                await server.wait_closed()
+
+            with open(target, 'rb') as f:
+                self.assertEqual(b'\x00' * 64, f.read())
+
+    async def test_connection_refused(self):
+        with tempfile.TemporaryDirectory() as directory:
+            client = Client(EchoStub, os.path.join(directory, 'missing.sock'))
+            with self.assertRaises(ServiceUnavailable):
+                await client.invoke(EchoStub.echo, EchoRequest('venom'))
+            await client.close()
@@ -0,0 +1,204 @@
+import asyncio
+import json
+import os
+import tempfile
+
+from venom import Message
+from venom.exceptions import NotFound, NotImplemented_, ServerError, ServiceUnavailable
+from venom.protocol import JSONProtocol
+from venom.rpc import Service, Stub, Venom, rpc
+from venom.rpc.comms.tcp import Client, create_server, pack_frame, REQUEST
+from venom.rpc.test_utils import AioTestCase
+
+
+class HelloRequest(Message):
+    name: str
+    delay: float
+
+
+class HelloResponse(Message):
+    message: str
+
+
+class HelloStub(Stub):
+    class Meta:
+        name = 'hello'
+
+    @rpc
+    def say_hello(self, request: HelloRequest) -> HelloResponse:
+        raise NotImplementedError
+
+    @rpc
+    def say_goodbye(self, request: HelloRequest) -> HelloResponse:
+        raise NotImplementedError
+
+    @rpc
+    def crash(self, request: HelloRequest) -> HelloResponse:
+        raise NotImplementedError
+
+    @rpc
+    def missing(self, request: HelloRequest) -> HelloResponse:
+        raise NotImplementedError
+
+
+class HelloService(Service):
+    class Meta:
+        name = 'hello'
+
+    @rpc
+    async def say_hello(self, request: HelloRequest) -> HelloResponse:
+        if not request.name:
+            raise NotFound('Nobody to greet')
+        await asyncio.sleep(request.delay)
+        return HelloResponse(message=f'Hello, {request.name}!')
+
+    @rpc
+    def say_goodbye(self, request: HelloRequest) -> HelloResponse:
+        raise NotImplementedError
+
+    @rpc
+    def crash(self, request: HelloRequest) -> HelloResponse:
+        raise ValueError('Boom')
+
+
+class OtherJSONProtocol(JSONProtocol):
+    mime = 'application/x-other-json'
+
+
+class TCPTestCase(AioTestCase):
+    async def _serve(self, **kwargs):
+        venom = Venom()
+        venom.add(HelloService)
+        server = await create_server(venom, '127.0.0.1', 0, **kwargs)
+        return server, server.sockets[0].getsockname()[1]
+
+    async def _stop(self, client, server):
+        await client.close()
+        server.close()
+        await server.wait_closed()
+
+    async def test_call(self):
+        server, port = await self._serve()
+        client = Client(HelloStub, '127.0.0.1', port)
+        try:
+            self.assertEqual(HelloResponse('Hello, Alice!'), await client.invoke(HelloStub.say_hello,
+                                                                                HelloRequest('Alice')))
+
+            client_venom = Venom()
+            client_venom.add(HelloStub, Client, '127.0.0.1', port)
+            hello = client_venom.get_instance(HelloStub)
+            self.assertEqual(HelloResponse('Hello, Bob!'), await hello.say_hello(HelloRequest('Bob')))
+            await client_venom.close()
+        finally:
+            await self._stop(client, server)
+
+    async def test_out_of_order(self):
+        server, port = await self._serve()
+        client = Client(HelloStub, '127.0.0.1', port, connections=2)
+        try:
+            finished = []
+
+            async def call(name, delay):
+                response = await client.invoke(HelloStub.say_hello, HelloRequest(name, delay))
+                finished.append(response.message)
+
+            await asyncio.gather(*(call(str(i), 0.05 - i * 0.01) for i in range(5)))
+            self.assertEqual([f'Hello, {i}!' for i in reversed(range(5))], finished)
+
+            connections = [await connecting for connecting in client._connections]
+            self.assertEqual(2, len({id(connection) for connection in connections}))
+            self.assertEqual([0, 0], [connection.pending for connection in connections])
+        finally:
+            await self._stop(client, server)
+
+    async def test_errors(self):
+        server, port = await self._serve()
+        client = Client(HelloStub, '127.0.0.1', port)
+        try:
+            with self.assertRaises(NotFound) as cm:
+                await client.invoke(HelloStub.say_hello, HelloRequest())
+            self.assertEqual('Nobody to greet', cm.exception.description)
+
+            with self.assertRaises(NotImplemented_):
+                await client.invoke(HelloStub.say_goodbye, HelloRequest('Alice'))
+
+            with self.assertRaises(NotImplemented_):
+                await client.invoke(HelloStub.missing, HelloRequest('Alice'))
+
+            with self.assertRaises(ServerError):
+                await client.invoke(HelloStub.crash, HelloRequest('Alice'))
+
+            with self.assertRaises(asyncio.TimeoutError):
+                await client.invoke(HelloStub.say_hello, HelloRequest('Alice', 1), timeout=0.01)
+
+            await asyncio.sleep(0)
+            connection = await client._connections[0]
+            self.assertEqual(0, connection.pending)
+
+            with self.assertRaises(NotFound):
+                status, payload = await connection.call(999, b'{}')
+                raise client._error(status, payload)
+        finally:
+            await self._stop(client, server)
+
+    async def test_connection_lost(self):
+        server, port = await self._serve()
+        client = Client(HelloStub, '127.0.0.1', port)
+        try:
+            pending = asyncio.ensure_future(client.invoke(HelloStub.say_hello, HelloRequest('Alice', 1)))
+            await asyncio.sleep(0.05)
+
+            connection = await client._connections[0]
+            connection.transport.close()
+            with self.assertRaises(ServiceUnavailable):
+                await pending
+
+            self.assertEqual(HelloResponse('Hello, Bob!'), await client.invoke(HelloStub.say_hello,
+                                                                              HelloRequest('Bob')))
+            self.assertIsNot(connection, await client._connections[0])
+        finally:
+            await self._stop(client, server)
+
+        with self.assertRaises(ServiceUnavailable):
+            await client.invoke(HelloStub.say_hello, HelloRequest('Alice'))
+
+    async def test_protocol_negotiation(self):
+        server, port = await self._serve()
+        client = Client(HelloStub, '127.0.0.1', port, protocol_factory=OtherJSONProtocol)
+        try:
+            with self.assertRaises(ServiceUnavailable):
+                await client.invoke(HelloStub.say_hello, HelloRequest('Alice'))
+        finally:
+            await self._stop(client, server)
+
+    async def test_pipelining(self):
+        server, port = await self._serve()
+        client = Client(HelloStub, '127.0.0.1', port)
+        try:
+            connection = await client._connect()
+            index = connection.methods['hello.say_hello']
+            futures = [connection._pending.setdefault(call_id, asyncio.get_event_loop().create_future())
+                       for call_id in (1, 2)]
+
+            # both requests in a single write
+            connection.transport.write(pack_frame(REQUEST, 1, index, b'{"name": "Alice"}') +
+                                       pack_frame(REQUEST, 2, index, b'{"name": "Bob"}'))
+            self.assertEqual([(200, {'message': 'Hello, Alice!'}), (200, {'message': 'Hello, Bob!'})],
+                             [(status, json.loads(payload)) for status, payload in await asyncio.gather(*futures)])
+            connection.close()
+        finally:
+            await self._stop(client, server)
+
+    async def test_unix_socket(self):
+        venom = Venom()
+        venom.add(HelloService)
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'hello.sock')
+            server = await create_server(venom, path=path)
+            client = Client(HelloStub, path=path)
+            try:
+                self.assertEqual(HelloResponse('Hello, Alice!'), await client.invoke(HelloStub.say_hello,
+                                                                                    HelloRequest('Alice')))
+            finally:
+                await self._stop(client, server)
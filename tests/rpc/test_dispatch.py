@@ -0,0 +1,115 @@
+from unittest import TestCase
+
+from venom import Message
+from venom.protocol import JSONProtocol
+from venom.rpc import Service, Venom, http, rpc
+from venom.rpc.dispatch import UnknownMethod
+from venom.rpc.method import HTTPVerb, Method
+
+
+class Snake(Message):
+    id: int
+    name: str
+
+
+class SnakeService(Service):
+    @http.GET('./{id}', request=Snake)
+    def read(self, id: int) -> Snake:
+        return Snake(id)
+
+    @rpc
+    def hiss(self) -> None:
+        pass
+
+
+class DispatchTableTestCase(TestCase):
+    def test_add_service(self):
+        venom = Venom()
+        venom.add(SnakeService)
+
+        self.assertEqual(2, len(venom.dispatch_table))
+        self.assertEqual([SnakeService.__methods__['read'], SnakeService.__methods__['hiss']],
+                         list(venom.iter_methods()))
+
+        entry = venom.get_method('snake', 'read')
+        self.assertIs(SnakeService.__methods__['read'], entry.method)
+        self.assertIs(SnakeService, entry.service)
+        self.assertIs(entry, venom.dispatch_table[entry.index])
+        self.assertEqual('snake.read', entry.name)
+
+        self.assertIs(entry, venom.dispatch_table.get_http(HTTPVerb.GET, '/snake/{id}'))
+        self.assertIs(venom.get_method('snake', 'hiss'), venom.dispatch_table.get_http('POST', '/snake/hiss'))
+
+    def test_unknown_method(self):
+        venom = Venom()
+        venom.add(SnakeService)
+
+        with self.assertRaises(UnknownMethod):
+            venom.get_method('snake', 'bite')
+
+        with self.assertRaises(UnknownMethod):
+            venom.dispatch_table.get_http(HTTPVerb.DELETE, '/snake/{id}')
+
+    def test_private_service(self):
+        venom = Venom()
+        venom.add(SnakeService, public=False)
+        self.assertEqual(0, len(venom.dispatch_table))
+
+    def test_duplicate_http_route(self):
+        class OtherSnakeService(Service):
+            class Meta:
+                name = 'other_snake'
+
+            @http.GET('/snake/{id}', request=Snake)
+            def read(self, id: int) -> Snake:
+                return Snake(id)
+
+        venom = Venom()
+        venom.add(SnakeService)
+
+        with self.assertRaises(ValueError):
+            venom.add(OtherSnakeService)
+
+        # a conflicting service is not registered at all
+        with self.assertRaises(RuntimeError):
+            venom.get_instance(OtherSnakeService)
+        self.assertEqual(2, len(venom.dispatch_table))
+
+        class ThirdSnakeService(Service):
+            class Meta:
+                name = 'other_snake'
+
+            @http.GET('/snake/{id}/name', request=Snake)
+            def read(self, id: int) -> Snake:
+                return Snake(id)
+
+        venom.add(ThirdSnakeService)
+        self.assertEqual(3, len(venom.dispatch_table))
+
+    def test_duplicate_http_route_lazy(self):
+        class LazySnakeService(Service):
+            class Meta:
+                name = 'lazy_snake'
+                lazy = True
+
+            @http.GET('/snake/{id}', request=Snake)
+            def read(self, id: int) -> Snake:
+                return Snake(id)
+
+        venom = Venom()
+        venom.add(SnakeService)
+
+        with self.assertRaises(ValueError):
+            venom.add(LazySnakeService)
+        self.assertNotIsInstance(LazySnakeService.__dict__['read'], Method)
+
+    def test_entry_protocols(self):
+        venom = Venom()
+        venom.add(SnakeService)
+        entry = venom.get_method('snake', 'read')
+
+        request_protocol, response_protocol = entry.protocols(JSONProtocol)
+        self.assertIsInstance(request_protocol, JSONProtocol)
+        self.assertIs(Snake, request_protocol.message)
+        self.assertIs(Snake, response_protocol.message)
+        self.assertEqual((request_protocol, response_protocol), entry.protocols(JSONProtocol))
@@ -1,5 +1,5 @@
 from collections import namedtuple
-from typing import List, Dict, NewType, Any
+from typing import List, Dict, NewType, Any, AsyncIterator
 from unittest import SkipTest
 
 from venom import Empty, Message
@@ -271,3 +271,33 @@ class InspectionTestCase(AioTestCase):
         self.assertEqual(inspect.response, IntegerValue)
         self.assertEqual(inspect.request, IntegerValue)
         self.assertEqual(await inspect.invokable(None, IntegerValue(42)), IntegerValue(42))
+
+    async def test_magic_streaming(self):
+        async def func(self, name: str) -> AsyncIterator[str]:
+            for i in range(3):
+                yield f'{name} {i}'
+
+        inspect = magic_normalize(func, auto_generate_request=True, converters=[StringValueConverter()])
+        self.assertEqual((False, True), (inspect.client_streaming, inspect.server_streaming))
+        self.assertEqual(StringValue, inspect.response)
+        responses = await inspect.invokable(None, inspect.request(name='a'))
+        self.assertEqual([StringValue('a 0'), StringValue('a 1'), StringValue('a 2')],
+                         [response async for response in responses])
+
+        async def func(self, requests: AsyncIterator[IntegerValue]) -> IntegerValue:
+            return IntegerValue(sum([request.value async for request in requests]))
+
+        async def requests():
+            for i in range(4):
+                yield IntegerValue(i)
+
+        inspect = magic_normalize(func)
+        self.assertEqual((True, False), (inspect.client_streaming, inspect.server_streaming))
+        self.assertEqual(IntegerValue, inspect.request)
+        self.assertEqual(IntegerValue(6), await inspect.invokable(None, requests()))
+
+        def func(self, requests: AsyncIterator[IntegerValue], required: int) -> IntegerValue:
+            pass
+
+        with self.assertRaises(RuntimeError):
+            magic_normalize(func)
@@ -0,0 +1,97 @@
+from unittest import TestCase
+
+from venom import Message
+from venom.fields import Int32, String
+from venom.rpc import Service, http
+from venom.rpc.method import HTTPVerb
+from venom.rpc.routing import Router
+
+
+class Snake(Message):
+    id = Int32()
+    snake_name = String()
+
+
+class SnakeService(Service):
+    @http.GET('.', request=Snake)
+    def all(self) -> None:
+        pass
+
+    @http.GET('./{id}', request=Snake)
+    def read(self) -> None:
+        pass
+
+    @http.POST('./{id}/hiss', request=Snake)
+    def hiss(self) -> None:
+        pass
+
+    @http.GET('./by-name/{snake_name}', request=Snake)
+    def read_by_name(self) -> None:
+        pass
+
+    @http.GET('./by-name/{snake_name}.json', request=Snake)
+    def read_json(self) -> None:
+        pass
+
+    @http.GET('./special', request=Snake)
+    def special(self) -> None:
+        pass
+
+
+def _router():
+    router = Router()
+    for name, method in SnakeService.__methods__.items():
+        router.add(method, name)
+    return router
+
+
+class RouterTestCase(TestCase):
+    def test_static(self):
+        router = _router()
+        self.assertEqual(('all', {}), router.match('GET', '/snake'))
+        self.assertEqual(('special', {}), router.match(HTTPVerb.GET, '/snake/special'))
+        self.assertEqual(None, router.match('GET', '/snake/'))
+        self.assertEqual(None, router.match('GET', '/snakes'))
+
+    def test_int_parameter(self):
+        router = _router()
+        self.assertEqual(('read', {'id': 42}), router.match('GET', '/snake/42'))
+        self.assertEqual(('hiss', {'id': 7}), router.match('POST', '/snake/7/hiss'))
+        self.assertEqual(None, router.match('GET', '/snake/bite'))
+        self.assertEqual(None, router.match('GET', '/snake/-1'))
+
+    def test_str_parameter(self):
+        router = _router()
+        self.assertEqual(('read_by_name', {'snakeName': 'Kaa'}), router.match('GET', '/snake/by-name/Kaa'))
+        self.assertEqual(('read_by_name', {'snakeName': 'Mr Snek'}), router.match('GET', '/snake/by-name/Mr%20Snek'))
+        self.assertEqual(('read_json', {'snakeName': 'Kaa'}), router.match('GET', '/snake/by-name/Kaa.json'))
+        self.assertEqual(None, router.match('GET', '/snake/by-name/'))
+
+    def test_backtracking(self):
+        class BranchService(Service):
+            @http.GET('/a/{id}/b', request=Snake)
+            def b(self) -> None:
+                pass
+
+            @http.GET('/a/{snake_name}/c', request=Snake)
+            def c(self) -> None:
+                pass
+
+        router = Router()
+        for name, method in BranchService.__methods__.items():
+            router.add(method, name)
+
+        self.assertEqual(('c', {'snakeName': '1'}), router.match('GET', '/a/1/c'))
+        self.assertEqual(('b', {'id': 1}), router.match('GET', '/a/1/b'))
+
+    def test_verbs(self):
+        router = _router()
+        self.assertEqual(None, router.match('DELETE', '/snake/1'))
+        self.assertEqual(None, router.match('OPTIONS', '/snake/1'))
+        self.assertEqual({HTTPVerb.POST}, router.allowed_verbs('/snake/1/hiss'))
+        self.assertEqual(set(), router.allowed_verbs('/nowhere'))
+
+    def test_duplicate_route(self):
+        router = _router()
+        with self.assertRaises(ValueError):
+            router.add(SnakeService.__methods__['read'], 'again')
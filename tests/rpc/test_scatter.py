@@ -0,0 +1,109 @@
+import asyncio
+
+from venom import Message
+from venom.exceptions import NotFound
+from venom.fields import Int32, String, repeated
+from venom.rpc import Service, Stub, Venom, rpc
+from venom.rpc.comms.local import LocalClient
+from venom.rpc.scatter import scatter_gather
+from venom.rpc.test_utils import AioTestCase
+
+
+class Hit(Message):
+    name = String()
+    score = Int32()
+
+
+class SearchRequest(Message):
+    query = String()
+    page_size = Int32()
+    page_token = String()
+
+
+class SearchResponse(Message):
+    hits = repeated(Hit)
+    next_page_token = String()
+
+
+class SearchStub(Stub):
+    class Meta:
+        name = 'search'
+
+    @rpc(gather_field='hits', sort_key='score', descending=True)
+    def search(self, request: SearchRequest) -> SearchResponse:
+        raise NotImplementedError
+
+
+class SearchService(Service):
+    class Meta:
+        name = 'search'
+
+    @rpc
+    async def search(self, request: SearchRequest) -> SearchResponse:
+        options = self.venom.options
+        options['requests'].append(request.page_token)
+
+        if options.get('delay'):
+            await asyncio.sleep(options['delay'])
+        if options.get('error'):
+            raise options['error']
+
+        start = int(request.page_token or 0)
+        end = start + (request.page_size or len(options['scores']))
+        hits = [Hit(f"{options['name']}{score}", score) for score in options['scores'][start:end]]
+        return SearchResponse(hits, str(end) if end < len(options['scores']) else None)
+
+
+def _shard(name, scores, **options):
+    venom = Venom(name=name, scores=sorted(scores, reverse=True), requests=[], **options)
+    venom.add(SearchService)
+    return LocalClient(SearchStub(venom), venom)
+
+
+class ScatterGatherTestCase(AioTestCase):
+    async def test_merge(self):
+        shards = [_shard('a', [9, 5, 1]), _shard('b', [8, 7, 2]), _shard('c', [])]
+        hits = await scatter_gather(shards, 'search', SearchRequest('q')).all()
+        self.assertEqual(['a9', 'b8', 'b7', 'a5', 'b2', 'a1'], [hit.name for hit in hits])
+
+        hits = await scatter_gather(shards, 'search', SearchRequest('q'), sort_key=lambda hit: -hit.score,
+                                    descending=False, limit=4).all()
+        self.assertEqual(['a9', 'b8', 'b7', 'a5'], [hit.name for hit in hits])
+
+    async def test_paging(self):
+        shards = [_shard('a', range(0, 100, 2)), _shard('b', range(1, 100, 2))]
+        results = scatter_gather(shards, 'search', SearchRequest('q', page_size=10))
+
+        scores = []
+        async for hit in results:
+            scores.append(hit.score)
+            if len(scores) == 15:
+                break
+
+        self.assertEqual(list(range(99, 84, -1)), scores)
+        self.assertEqual([''], shards[0]._venom.options['requests'])
+        self.assertEqual([''], shards[1]._venom.options['requests'])
+
+        async for hit in results:
+            scores.append(hit.score)
+
+        self.assertEqual(list(range(99, -1, -1)), scores)
+        self.assertEqual(['', '10', '20', '30', '40'], shards[0]._venom.options['requests'])
+
+    async def test_partial_results(self):
+        shards = [_shard('a', [3, 1]), _shard('b', [2], delay=1)]
+        results = scatter_gather(shards, 'search', SearchRequest('q'), timeout=0.05)
+        self.assertEqual(['a3', 'a1'], [hit.name for hit in await results.all()])
+        self.assertEqual([1], list(results.failures))
+        self.assertIsInstance(results.failures[1], asyncio.TimeoutError)
+
+        shards = [_shard('a', [3, 1]), _shard('b', [2], error=NotFound())]
+        with self.assertRaises(NotFound):
+            await scatter_gather(shards, 'search', SearchRequest('q')).all()
+
+        results = scatter_gather(shards, 'search', SearchRequest('q'), tolerate=(NotFound,))
+        self.assertEqual(['a3', 'a1'], [hit.name for hit in await results.all()])
+
+    def test_field_required(self):
+        with self.assertRaises(ValueError):
+            scatter_gather([object()], 'search', SearchRequest('q'))
@@ -0,0 +1,148 @@
+import asyncio
+import json
+import os
+import signal
+import socket
+import tempfile
+import time
+from unittest import TestCase, skipUnless
+from urllib.request import urlopen, Request
+
+import aiohttp
+
+from venom import Message
+from venom.rpc import Service, Stub, Venom, http
+from venom.rpc.comms.aiohttp import HTTPClient
+from venom.rpc.serve import Server, load_venom
+
+
+class GreetRequest(Message):
+    name: str
+
+
+class GreeterStub(Stub):
+    class Meta:
+        name = 'greeter'
+
+    @http.POST('./greet')
+    def greet(self, request: GreetRequest) -> str:
+        raise NotImplementedError
+
+
+class GreeterService(Service):
+    @http.POST('./greet', auto=True)
+    def greet(self, name: str) -> str:
+        return f'Hello, {name}!'
+
+    @http.GET('./pid')
+    def pid(self) -> int:
+        return os.getpid()
+
+
+def create_venom():
+    venom = Venom()
+    venom.add(GreeterService)
+    return venom
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+class ServerTestCase(TestCase):
+    def _request(self, server, path, body=None):
+        url = f'http://127.0.0.1:{server.port}{path}'
+        for attempt in range(50):
+            try:
+                request = Request(url, data=body, headers={'content-type': 'application/json'})
+                with urlopen(request, timeout=5) as response:
+                    return json.loads(response.read().decode('utf-8'))
+            except OSError:
+                time.sleep(0.1)
+        raise AssertionError(f'Unable to reach {url}')
+
+    def _start(self, **kwargs):
+        server = Server(create_venom, '127.0.0.1', restart_delay=0, **kwargs)
+        server.start()
+        self.addCleanup(server.stop)
+        return server
+
+    def test_load_venom(self):
+        venom = create_venom()
+        self.assertIs(venom, load_venom(venom))
+        self.assertIsInstance(load_venom(create_venom), Venom)
+        self.assertIsInstance(load_venom(f'{__name__}:create_venom'), Venom)
+
+        with self.assertRaises(ValueError):
+            load_venom(lambda: None)
+
+    def test_serve_and_restart(self):
+        server = self._start(port=0, workers=2, reuse_port=False)
+        self.assertTrue(server.venom.frozen)
+        self.assertEqual(2, len(set(server.pids)))
+
+        self.assertEqual('Hello, Alice!', self._request(server, '/greeter/greet', b'{"name": "Alice"}'))
+        for _ in range(4):
+            self.assertIn(self._request(server, '/greeter/pid'), server.pids)
+
+        metrics = server.metrics()
+        self.assertEqual(5, metrics.requests)
+        self.assertEqual(0, metrics.errors)
+        self.assertEqual(5, sum(worker.requests for worker in metrics.workers))
+
+        killed = server.pids[0]
+        os.kill(killed, signal.SIGKILL)
+
+        deadline = time.monotonic() + 10
+        while server.metrics().restarts == 0 and time.monotonic() < deadline:
+            server.poll()
+            time.sleep(0.01)
+
+        self.assertEqual(1, server.metrics().restarts)
+        self.assertNotIn(killed, server.pids)
+        self.assertNotIn(None, server.pids)
+        self.assertEqual('Hello, Bob!', self._request(server, '/greeter/greet', b'{"name": "Bob"}'))
+
+        server.stop()
+        self.assertEqual([None, None], server.pids)
+
+    @skipUnless(hasattr(socket, 'SO_REUSEPORT'), 'requires SO_REUSEPORT')
+    def test_reuse_port(self):
+        server = self._start(port=_free_port(), workers=2)
+        self.assertTrue(server.reuse_port)
+        self.assertEqual('Hello, Alice!', self._request(server, '/greeter/greet', b'{"name": "Alice"}'))
+        self.assertEqual(1, server.metrics().requests)
+
+    def test_unix_socket(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'greeter.sock')
+            server = self._start(path=path, workers=1)
+            self.assertFalse(server.reuse_port)
+
+            venom = Venom()
+            venom.add(GreeterStub, HTTPClient, f'unix://{path}')
+            greeter = venom.get_instance(GreeterStub)
+
+            async def greet():
+                try:
+                    for attempt in range(50):
+                        try:
+                            return await greeter.greet(GreetRequest('Alice'))
+                        except aiohttp.ClientConnectionError:
+                            await asyncio.sleep(0.1)
+                finally:
+                    await venom.close()
+
+            loop = asyncio.new_event_loop()
+            try:
+                self.assertEqual('Hello, Alice!', loop.run_until_complete(greet()).value)
+            finally:
+                loop.close()
+
+            server.stop()
+            self.assertFalse(os.path.exists(path))
+
+        with self.assertRaises(ValueError):
+            Server(create_venom, path='/tmp/greeter.sock', reuse_port=True)
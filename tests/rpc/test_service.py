@@ -1,8 +1,12 @@
-from venom import Empty
+from venom import Empty, Message
 from venom.common import StringValue
+from venom.exceptions import NotImplemented_
 from venom.rpc import RequestContext, Venom, http
 from venom.rpc import rpc, Service
 from venom.rpc.inspection import schema
+from venom.fields import Field, String
+from venom.protocol import JSONProtocol
+from venom.protocol.transcode import MessageTranscoder
 from venom.rpc.test_utils import AioTestCase
 
 
@@ -61,3 +65,168 @@ class ServiceTestCase(AioTestCase):
 
         self.assertEqual(await GreeterService().say_hello(GreeterService.say_hello.request(name='Alice')),
                          StringValue('Hi Alice!'))
+
+
+class LazyServiceTestCase(AioTestCase):
+    def test_lazy_methods(self):
+        class GreeterService(Service):
+            class Meta:
+                lazy = True
+
+            @rpc
+            def broken(self, name: str) -> str:
+                pass
+
+            @rpc(auto=True)
+            def greet(self, name: str) -> str:
+                return f'Hi {name}!'
+
+        self.assertEqual({'broken', 'greet'}, set(GreeterService.__methods__.keys()))
+
+        with self.assertRaises(RuntimeError):
+            GreeterService.__methods__['broken']
+
+        self.assertIs(GreeterService.__methods__['greet'], GreeterService.greet)
+        self.assertIs(GreeterService.greet, GreeterService.__dict__['greet'])
+
+    async def test_lazy_invoke(self):
+        class GreeterService(Service):
+            class Meta:
+                lazy = True
+
+            @rpc(auto=True)
+            def greet(self, name: str) -> str:
+                return f'Hi {name}!'
+
+        class BrokenService(Service):
+            class Meta:
+                lazy = True
+
+            @rpc
+            def broken(self, name: str) -> str:
+                pass
+
+        venom = Venom()
+        venom.add(GreeterService)
+        venom.add(BrokenService)
+
+        entry = venom.get_method('greeter', 'greet')
+        self.assertEqual(StringValue('Hi Alice!'), await GreeterService().greet(entry.method.request(name='Alice')))
+
+        with self.assertRaises(RuntimeError):
+            list(venom.iter_methods())
+
+    async def test_lazy_inheritance_and_stub(self):
+        from venom.rpc import Stub
+
+        class GreeterStub(Stub):
+            class Meta:
+                lazy = True
+
+            @rpc(auto=True)
+            def greet(self, name: str) -> str:
+                raise NotImplementedError
+
+            @rpc(auto=True)
+            def shout(self, name: str) -> str:
+                raise NotImplementedError
+
+        class GreeterService(Service):
+            class Meta:
+                stub = GreeterStub
+                lazy = True
+
+            @rpc
+            def greet(self, name: str) -> str:
+                return f'Hi {name}!'
+
+        class LoudGreeterService(GreeterService):
+            class Meta:
+                name = 'loud_greeter'
+                stub = GreeterStub
+
+            @rpc
+            def greet(self, name: str) -> str:
+                return f'HI {name.upper()}!'
+
+        request = GreeterStub.greet.request(name='Alice')
+        self.assertIs(GreeterStub.__methods__['greet'].request, GreeterService.greet.request)
+        self.assertEqual(StringValue('Hi Alice!'), await GreeterService().greet(request))
+        self.assertEqual(StringValue('HI ALICE!'), await LoudGreeterService().greet(request))
+        self.assertIs(LoudGreeterService, LoudGreeterService.greet.service)
+
+        with self.assertRaises(NotImplemented_):
+            await LoudGreeterService().shout(request)
+
+    async def test_lazy_stub_client(self):
+        from venom.rpc import Stub
+        from venom.rpc.comms.local import LocalClient
+        from venom.rpc.method import Method
+
+        class GreeterStub(Stub):
+            class Meta:
+                name = 'greeter'
+                lazy = True
+
+            @rpc(auto=True)
+            def greet(self, name: str) -> str:
+                raise NotImplementedError
+
+            @rpc
+            def broken(self, name: str) -> str:
+                raise NotImplementedError
+
+        class GreeterService(Service):
+            class Meta:
+                name = 'greeter'
+
+            @rpc(auto=True)
+            def greet(self, name: str) -> str:
+                return f'Hi {name}!'
+
+        venom = Venom()
+        venom.add(GreeterService)
+
+        client_venom = Venom()
+        client_venom.add(GreeterStub, LocalClient, venom)
+        greeter = client_venom.get_instance(GreeterStub)
+        self.assertEqual({'greet', 'broken'}, set(greeter.__methods__))
+        self.assertNotIsInstance(GreeterStub.__dict__['greet'], Method)
+
+        self.assertEqual(StringValue('Hi Alice!'), await greeter.greet(GreeterStub.greet.request(name='Alice')))
+        self.assertIsInstance(GreeterStub.__dict__['greet'], Method)
+        self.assertNotIsInstance(GreeterStub.__dict__['broken'], Method)
+
+
+class Owner(Message):
+    name = String()
+
+
+class Pet(Message):
+    name = String()
+    owner = Field(f'{__name__}.Owner')
+
+
+class FreezeTestCase(AioTestCase):
+    def test_freeze(self):
+        class PetService(Service):
+            class Meta:
+                lazy = True
+
+            @rpc
+            def adopt(self, request: Pet) -> Pet:
+                return request
+
+        venom = Venom()
+        venom.add(PetService)
+        self.assertFalse(venom.frozen)
+        self.assertNotIn('type', vars(Pet.owner))
+
+        self.assertIs(venom, venom.freeze())
+        self.assertTrue(venom.frozen)
+        self.assertIs(Owner, vars(Pet.owner)['type'])
+        self.assertIn((JSONProtocol, Owner), MessageTranscoder._instance_cache)
+        self.assertIs(PetService.adopt, venom.get_method('pet', 'adopt').method)
+
+        with self.assertRaises(RuntimeError):
+            venom.add(PetService)
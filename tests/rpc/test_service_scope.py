@@ -0,0 +1,242 @@
+import asyncio
+
+from typing import AsyncIterator
+
+from venom import Empty
+from venom.common import IntegerValue
+from venom.rpc import Service, Venom, rpc, proxy, ServiceScope, ServicePool
+from venom.rpc.context import DictRequestContext
+from venom.rpc.test_utils import AioTestCase
+
+
+class ServiceScopeTestCase(AioTestCase):
+    async def test_singleton(self):
+        class CounterService(Service):
+            def __init__(self, venom=None):
+                super().__init__(venom)
+                self.count = 0
+
+            @rpc
+            def increment(self) -> int:
+                self.count += 1
+                return self.count
+
+        venom = Venom()
+        venom.add(CounterService)
+        self.assertIs(venom.get_instance(CounterService), venom.get_instance('counter'))
+        self.assertEqual(IntegerValue(1), await venom.invoke(CounterService.increment, Empty()))
+        self.assertEqual(IntegerValue(2), await venom.invoke(CounterService.increment, Empty()))
+
+    async def test_request_scope(self):
+        class CounterService(Service):
+            class Meta:
+                scope = ServiceScope.REQUEST
+
+            def __init__(self, venom=None):
+                super().__init__(venom)
+                self.count = 0
+
+            @rpc
+            def increment(self) -> int:
+                self.count += 1
+                return self.count
+
+        venom = Venom()
+        venom.add(CounterService)
+
+        with self.assertRaises(RuntimeError):
+            venom.get_instance(CounterService)
+
+        with venom.get_request_context():
+            instance = venom.get_instance(CounterService)
+            self.assertIsInstance(instance, CounterService)
+            self.assertIs(instance, venom.get_instance(CounterService))
+
+        self.assertEqual(IntegerValue(1), await venom.invoke(CounterService.increment, Empty()))
+        self.assertEqual(IntegerValue(1), await venom.invoke(CounterService.increment, Empty()))
+
+    async def test_request_scope_string(self):
+        class CounterService(Service):
+            class Meta:
+                scope = 'request'
+
+        self.assertEqual(ServiceScope.REQUEST, CounterService.__meta__.scope)
+
+    async def test_pooled(self):
+        active = set()
+        peak = []
+
+        class WorkerService(Service):
+            class Meta:
+                scope = ServiceScope.POOLED
+                pool_size = 2
+
+            @rpc
+            async def work(self) -> int:
+                self.assert_not_active()
+                active.add(self)
+                peak.append(len(active))
+                await asyncio.sleep(0.01)
+                active.remove(self)
+                return id(self)
+
+            def assert_not_active(self):
+                if self in active:
+                    raise AssertionError('Instance checked out twice')
+
+        venom = Venom()
+        venom.add(WorkerService)
+
+        pool = venom.get_instance(WorkerService)
+        self.assertIsInstance(pool, ServicePool)
+        self.assertEqual(2, pool.available)
+
+        results = await asyncio.gather(*[venom.invoke(WorkerService.work, Empty()) for _ in range(6)])
+        self.assertEqual(2, len({result.value for result in results}))
+        self.assertEqual(2, max(peak))
+        self.assertEqual(2, pool.available)
+
+    async def test_pooled_constructor_error(self):
+        attempts = []
+
+        class WorkerService(Service):
+            class Meta:
+                scope = ServiceScope.POOLED
+                pool_size = 1
+
+            def __init__(self, venom=None):
+                attempts.append(self)
+                if len(attempts) == 1:
+                    raise RuntimeError('Not ready')
+                super().__init__(venom)
+
+            @rpc
+            def work(self) -> int:
+                return 42
+
+        venom = Venom()
+        venom.add(WorkerService)
+        pool = venom.get_instance(WorkerService)
+
+        with self.assertRaises(RuntimeError):
+            await venom.invoke(WorkerService.work, Empty())
+        self.assertEqual(1, pool.available)
+
+        self.assertEqual(IntegerValue(42), await asyncio.wait_for(venom.invoke(WorkerService.work, Empty()), 1))
+        self.assertEqual(1, pool.available)
+
+    async def test_pooled_streaming(self):
+        class WorkerService(Service):
+            class Meta:
+                scope = ServiceScope.POOLED
+                pool_size = 1
+
+            @rpc
+            async def count(self, request: IntegerValue) -> AsyncIterator[IntegerValue]:
+                for i in range(request.value):
+                    await asyncio.sleep(0)
+                    yield IntegerValue(self.context['offset'] + i)
+
+        venom = Venom()
+        venom.add(WorkerService)
+        pool = venom.get_instance(WorkerService)
+
+        context = DictRequestContext()
+        context['offset'] = 10
+        responses = await venom.invoke(WorkerService.count, IntegerValue(3), context=context)
+        self.assertEqual(IntegerValue(10), await responses.__anext__())
+        self.assertEqual(0, pool.available)
+        self.assertEqual([11, 12], [response.value async for response in responses])
+        self.assertEqual(1, pool.available)
+
+        # the instance is released when the consumer stops early
+        context = DictRequestContext()
+        context['offset'] = 0
+        responses = await venom.invoke(WorkerService.count, IntegerValue(100), context=context)
+        self.assertEqual(IntegerValue(0), await responses.__anext__())
+        await responses.aclose()
+        await asyncio.sleep(0)
+        self.assertEqual(1, pool.available)
+
+    async def test_proxy_to_pooled(self):
+        class WorkerService(Service):
+            class Meta:
+                scope = ServiceScope.POOLED
+                pool_size = 1
+
+            @rpc
+            def work(self) -> int:
+                return 42
+
+        class ManagerService(Service):
+            worker = proxy(WorkerService)
+
+            @rpc
+            async def manage(self) -> int:
+                return (await self.worker.work(Empty())).value
+
+        venom = Venom()
+        venom.add(WorkerService)
+        venom.add(ManagerService)
+
+        self.assertEqual(IntegerValue(42), await venom.invoke(ManagerService.manage, Empty()))
+        self.assertEqual(1, venom.get_instance(WorkerService).available)
+
+    async def test_proxy_cached(self):
+        class LocationService(Service):
+            @rpc
+            def exotic(self) -> str:
+                return 'Bermuda'
+
+        class VisitorService(Service):
+            class Meta:
+                scope = ServiceScope.REQUEST
+
+        class ConspiracyService(Service):
+            location = proxy(LocationService)
+            visitor = proxy(VisitorService)
+
+        venom = Venom()
+        venom.add(LocationService)
+        venom.add(VisitorService)
+        venom.add(ConspiracyService)
+
+        conspiracy = venom.get_instance(ConspiracyService)
+        self.assertNotIn('location', vars(conspiracy))
+        self.assertIs(venom.get_instance(LocationService), conspiracy.location)
+        self.assertIs(venom.get_instance(LocationService), vars(conspiracy)['location'])
+
+        with venom.get_request_context():
+            visitor = conspiracy.visitor
+            self.assertIs(visitor, conspiracy.visitor)
+
+        with venom.get_request_context():
+            self.assertIsNot(visitor, conspiracy.visitor)
+        self.assertNotIn('visitor', vars(conspiracy))
+
+    def test_iter(self):
+        class SingletonService(Service):
+            pass
+
+        class RequestService(Service):
+            class Meta:
+                scope = ServiceScope.REQUEST
+
+        class PooledService(Service):
+            class Meta:
+                scope = ServiceScope.POOLED
+
+        venom = Venom()
+        added = []
+        Venom.on_add_public_service.connect(lambda sender, service: added.append(service), sender=venom, weak=False)
+
+        venom.add(SingletonService)
+        venom.add(RequestService)
+        venom.add(PooledService)
+
+        services = list(venom)
+        self.assertEqual(services, added)
+        self.assertIs(venom.get_instance(SingletonService), services[0])
+        self.assertIs(RequestService, services[1])
+        self.assertIsInstance(services[2], ServicePool)
+        self.assertIs(PooledService, services[2].service)
@@ -14,6 +14,8 @@ class ErrorResponse(Message):
     def raise_(self):
         if self.status == 501:
             raise NotImplemented_()
+        if self.status == 503:
+            raise ServiceUnavailable(self.description or None)
         # if self.status == 500:
         #         raise ServerError(self.message or '')
         #     if self.status == 404:
@@ -59,16 +61,41 @@ class Forbidden(Error):
     description = 'Forbidden'
 
 
+class MethodNotAllowed(Error):
+    http_status = 405
+    description = 'Method Not Allowed'
+
+
 class Conflict(Error):
     http_status = 409
     description = 'Conflict'
 
 
+class PayloadTooLarge(Error):
+    http_status = 413
+    description = 'Payload Too Large'
+
+
+class UnsupportedMediaType(Error):
+    http_status = 415
+    description = 'Unsupported Media Type'
+
+
+class HeadersTooLarge(Error):
+    http_status = 431
+    description = 'Request Header Fields Too Large'
+
+
 class ServerError(Error):
     http_status = 500
     description = 'Internal Server Error'
 
 
+class ServiceUnavailable(Error):
+    http_status = 503
+    description = 'Service Unavailable'
+
+
 class ValidationError(BadRequest):
     def __init__(self, message, path=None):
         super().__init__(message)
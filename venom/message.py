@@ -142,6 +142,26 @@ def merge_into(message: _M, *others: _M):
     return message
 
 
+def referenced_messages(message: Type[Message]) -> Iterable[Type[Message]]:
+    """
+    :returns: the message and all message types referenced by its fields, recursively. String references to field
+        types are resolved along the way.
+    """
+    seen = []
+    pending = [message]
+
+    while pending:
+        msg = pending.pop()
+        if msg in seen:
+            continue
+
+        seen.append(msg)
+        for field in msg.__fields__.values():
+            if isinstance(field.type, type) and issubclass(field.type, Message):
+                pending.append(field.type)
+    return tuple(seen)
+
+
 def is_empty(message: Type[Message]) -> bool:
     return not fields(message)
 
@@ -85,15 +85,12 @@ class DictMessageTranscoder(MessageTranscoder):
 
         super().__init__(protocol, message, default=field_mask is None)
 
-        self.field_encoders = {
-            (field.name, field.json_name): self.field_encoder_factory(field)
-            for field in message.__fields__.values()
-            if not field_mask or field_mask.match_path(field.name)}
-
-        self.field_decoders = {
-            (field.name, field.json_name): self.field_decoder_factory(field)
-            for field in message.__fields__.values()
-            if not field_mask or field_mask.match_path(field.name)}
+        fields = [(field, (field.name, field.json_name))
+                  for field in message.__fields__.values()
+                  if not field_mask or field_mask.match_path(field.name)]
+
+        self.field_encoders = {key: self.field_encoder_factory(field) for field, key in fields}
+        self.field_decoders = {key: self.field_decoder_factory(field) for field, key in fields}
 
     def encode(self, message: Message) -> Dict[str, _Value]:
         obj = {}
@@ -1,30 +1,38 @@
 import asyncio
 
 from blinker import Signal
-from typing import Type, Union, Iterable, ClassVar, TypeVar, overload, Mapping
+from typing import Type, Union, Iterable, ClassVar, TypeVar, overload, Mapping, Sequence
 
+from venom.exceptions import ErrorResponse
+from venom.message import referenced_messages
 from venom.rpc.context import RequestContext, DictRequestContext
+from venom.rpc.dispatch import DispatchTable, DispatchEntry
 from venom.rpc.stub import Stub
 from venom.validation import MessageValidator
 from .method import rpc, http, Method
+from .pool import ServicePool
 from .proxy import ServiceProxy, proxy
-from .service import Service
+from .service import Service, ServiceScope
 
 
 class UnknownService(RuntimeError):
     pass
 
 
+_END_OF_STREAM = object()
+
+
 S = TypeVar('S', bound=Service)
 
 
 class Venom(object):
     on_add_service: ClassVar[Signal] = Signal('add-service')
+    # sent with the object that serves a public service: see __iter__()
     on_add_public_service: ClassVar[Signal] = Signal('add-public-service')
     before_invoke: ClassVar[Signal] = Signal('before-invoke')
 
     _default_request_context_cls: Type[RequestContext]
-    _instances: Mapping[Service, Union[Service, 'venom.rpc.comms.AbstractClient']]
+    _instances: Mapping[Type[Service], Union[Service, ServicePool]]
 
     def __init__(self, *, default_request_context_cls: Type[RequestContext] = DictRequestContext, **options):
         self._default_request_context_cls = default_request_context_cls
@@ -32,6 +40,8 @@ class Venom(object):
         self._services = {}
         self._public_services = {}
         self._clients = {}
+        self._dispatch_table = DispatchTable()
+        self._frozen = False
         self.options = options
 
     # TODO change signature so that all keyword arguments go to the client_cls on init.
@@ -43,24 +53,41 @@ class Venom(object):
             public: bool = None,
             **client_kwargs) -> None:
 
+        if self._frozen:
+            raise RuntimeError(f'Unable to add {service}: This Venom is frozen')
+
         name = service.__meta__.name
         if name in self._services:
             if self._services[name] is service:
                 return
             raise ValueError(f"A service with name '{name}' already exists")
 
-        self._services[name] = service
-
+        instance = None
         if client:
-            self._clients[service] = client(service(self), *client_args, **client_kwargs)
+            instance = client(service(self), *client_args, **client_kwargs)
         elif public is None:
             public = True
 
+        # routes are checked before anything is registered, so that a conflict leaves the Venom unchanged
+        if public:
+            self._dispatch_table.add(service)
+
+        self._services[name] = service
+        if instance is not None:
+            self._clients[service] = instance
+
         service.__manager__.register(self)
 
         if public:
+            scope = service.__meta__.scope
+            if scope == ServiceScope.SINGLETON:
+                self._instances[service] = instance = service(self)
+            elif scope == ServiceScope.POOLED:
+                self._instances[service] = instance = ServicePool(service, self, service.__meta__.pool_size)
+            else:
+                instance = service
+
             self._public_services[name] = service
-            self._instances[service] = instance = service(self)
             self.on_add_public_service.send(self, service=instance)
 
     def _resolve_service_cls(self, reference: Union[str, Type[Service]]):
@@ -69,9 +96,23 @@ class Venom(object):
                 return self._services[reference]
             except KeyError:
                 raise UnknownService(f"No service with name '{reference}' is known to this Venom")
-        elif reference not in self._services.values():
-            raise UnknownService("'{}' is not known to this Venom".format(reference))
-        return reference
+
+        try:
+            if self._services[reference.__meta__.name] is reference:
+                return reference
+        except (KeyError, AttributeError):
+            pass
+        raise UnknownService("'{}' is not known to this Venom".format(reference))
+
+    def is_static(self, reference: Union[str, Type[Service]]) -> bool:
+        """
+        :returns: ``True`` if :meth:`get_instance` always returns the same object for ``reference``.
+        """
+        try:
+            cls = self._resolve_service_cls(reference)
+        except UnknownService:
+            return False
+        return cls in self._instances or cls in self._clients
 
     @overload
     def get_instance(self, reference: Type[S]) -> S:
@@ -91,25 +132,158 @@ class Venom(object):
 
         if issubclass(cls, Stub):
             instance = self._clients[cls]
+        elif cls.__meta__.scope == ServiceScope.REQUEST:
+            instance = self._get_request_instance(cls)
         else:
             raise RuntimeError
             # self._instances[cls] = instance = cls(venom=self)
 
         return instance
 
+    def _get_request_instance(self, cls: Type[S]) -> S:
+        context = RequestContext.current()
+        if context is None:
+            raise RuntimeError(f"Unable to get an instance of request-scoped {cls}: No current RequestContext")
+
+        if context._service_instances is None:
+            context._service_instances = {}
+
+        try:
+            return context._service_instances[cls]
+        except KeyError:
+            context._service_instances[cls] = instance = cls(self)
+            return instance
+
+    @property
+    def dispatch_table(self) -> DispatchTable:
+        return self._dispatch_table
+
+    def get_method(self, service_name: str, method_name: str) -> DispatchEntry:
+        return self._dispatch_table.get(service_name, method_name)
+
     def iter_methods(self) -> Iterable[Method]:
-        for instance in self._instances.values():
-            for method in instance.__methods__.values():
-                yield method
+        for entry in self._dispatch_table:
+            yield entry.method
+
+    @property
+    def frozen(self) -> bool:
+        return self._frozen
+
+    def freeze(self, protocols: Sequence[Type['venom.protocol.Protocol']] = None) -> 'Venom':
+        """
+        Prepares every registered method ahead of the first request and makes the Venom immutable.
+
+        All methods are prepared and indexed, field types referenced by name are resolved, and the transcoders,
+        validators and HTTP bindings of every method and message are built for each of the given protocols. Afterwards,
+        no more services can be added.
+
+        When serving from several pre-forked worker processes, freeze the Venom in the parent process before forking so
+        that the workers inherit the prepared state instead of each building it again.
+
+        :param protocols: the protocol factories to prepare; defaults to :class:`venom.protocol.JSONProtocol`.
+        """
+        from venom.protocol import JSONProtocol
+        from venom.rpc.comms.binding import HTTPBinding
+
+        if protocols is None:
+            protocols = (JSONProtocol,)
+
+        methods = [entry.method for entry in self._dispatch_table]
+        for client in self._clients.values():
+            client.warm_up()
+            methods.extend(client.__methods__.values())
+
+        messages = set(referenced_messages(ErrorResponse))
+        for method in methods:
+            messages.update(referenced_messages(method.request))
+            messages.update(referenced_messages(method.response))
+
+        for message in messages:
+            MessageValidator(message)
+            for protocol_factory in protocols:
+                protocol_factory(message)
+
+        for entry in self._dispatch_table:
+            for protocol_factory in protocols:
+                entry.protocols(protocol_factory)
+                HTTPBinding.get(entry.method, protocol_factory)
+
+        self._frozen = True
+        return self
+
+    async def close(self) -> None:
+        """
+        Closes all clients of this Venom, releasing their connections.
+        """
+        for client in self._clients.values():
+            await client.close()
 
     def get_request_context(self) -> RequestContext:
         return self._default_request_context_cls()
 
+    async def invoke_in_context(self, method: Method, request: 'venom.Message'):
+        """
+        Invokes a method within the request context that is current, without entering a new one.
+
+        Transports use this to run additional code, such as a version hook, in the same request context as the method,
+        so that request-scoped services are shared between the two.
+        """
+        instance = self.get_instance(method.service)
+        self.before_invoke.send(self, method=method, request=request)
+        if isinstance(instance, ServicePool):
+            return await instance.invoke(method, request)
+        return await method.invoke(instance, request)
+
     async def _invoke(self, method: Method, request: 'venom.Message', context: RequestContext):
         with context:
-            instance = self.get_instance(method.service)
-            self.before_invoke.send(self, method=method, request=request)
-            return await method.invoke(instance, request)
+            return await self.invoke_in_context(method, request)
+
+    async def _produce_stream(self,
+                              method: Method,
+                              request: 'venom.Message',
+                              context: RequestContext,
+                              queue: asyncio.Queue) -> None:
+        try:
+            with context:
+                instance = pool = self.get_instance(method.service)
+                self.before_invoke.send(self, method=method, request=request)
+                if isinstance(pool, ServicePool):
+                    instance = await pool.acquire()
+
+                try:
+                    async for response in await method.invoke(instance, request):
+                        await queue.put(response)
+                finally:
+                    if isinstance(pool, ServicePool):
+                        pool.release(instance)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            await queue.put(e)
+        else:
+            await queue.put(_END_OF_STREAM)
+
+    async def _stream(self,
+                      method: Method,
+                      request: 'venom.Message',
+                      context: RequestContext,
+                      loop: 'asyncio.AbstractEventLoop'):
+        """
+        Runs a server-streaming method to completion in a single task, so that the request context stays current and a
+        pooled instance stays checked out while the stream is being consumed.
+        """
+        queue = asyncio.Queue(maxsize=1, loop=loop)
+        producer = loop.create_task(self._produce_stream(method, request, context, queue))
+        try:
+            while True:
+                item = await queue.get()
+                if item is _END_OF_STREAM:
+                    return
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            producer.cancel()
 
     async def invoke(self,
                      method: Method,
@@ -123,7 +297,16 @@ class Venom(object):
 
         if loop is None:
             loop = asyncio.get_event_loop()
+
+        if method.server_streaming:
+            return self._stream(method, request, context, loop)
         return await loop.create_task(self._invoke(method, request, context))
 
-    def __iter__(self) -> Iterable[Type[Service]]:
-        return iter(self._instances.values())
+    def __iter__(self) -> Iterable[Union[Service, ServicePool, Type[Service]]]:
+        """
+        Iterates over the objects that serve the public services: the instance of a singleton service, the
+        :class:`ServicePool` of a pooled service and the class itself of a request-scoped service, as these have no
+        instance outside of a request. Each of these has the ``__methods__`` of the service.
+        """
+        for service in self._public_services.values():
+            yield self._instances.get(service, service)
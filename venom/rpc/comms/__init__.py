@@ -1,9 +1,11 @@
 from abc import abstractmethod, ABC
+from functools import partial
 
-from typing import Type, Generic, TypeVar, ClassVar
+from typing import Type, Generic, TypeVar, ClassVar, Iterable, Mapping
 
 from venom.protocol import Protocol, JSONProtocol
 from venom.rpc.method import Method, Req, Res
+from venom.util import LazyMapping
 
 S = TypeVar('S', bound='venom.rcp.service.Service')
 
@@ -27,21 +29,53 @@ class ClientMethod(Method[S, Req, Res]):
 class AbstractClient(ABC, Generic[S]):
     client_method_cls: ClassVar[Type['ClientMethod']] = ClientMethod
     stub: S
+    __methods__: Mapping[str, ClientMethod]
 
     def __init__(self, stub: S, *, protocol_factory: Type[Protocol] = None):
         self.stub = stub
-        # NOTE method bindings for all methods in the stub.
-        for name, stub_method in stub.__methods__.items():
-            method = self.client_method_cls(self, stub_method)
-            # self.__methods__[name] = method
-            setattr(self, name, method.__get__(stub))
+        # NOTE client methods are only created --- and the stub methods prepared --- when first used.
+        self.__methods__ = LazyMapping({name: partial(self._bind_method, name) for name in stub.__methods__.keys()})
 
         if protocol_factory is None:
             protocol_factory = JSONProtocol
 
         self._protocol_factory = protocol_factory
 
+    def _bind_method(self, name: str) -> ClientMethod:
+        method = self.client_method_cls(self, self.stub.__methods__[name])
+        setattr(self, name, method.__get__(self.stub))
+        return method
+
+    def _eager_methods(self) -> Iterable[ClientMethod]:
+        """
+        :returns: the methods to set up when the client is created: all of them, unless the stub is lazy.
+        """
+        if self.stub.__meta__.lazy:
+            return ()
+        return self.__methods__.values()
+
+    def __getattr__(self, name: str):
+        methods = self.__dict__.get('__methods__')
+        if methods is None or name not in methods:
+            raise AttributeError(name)
+        methods[name]
+        return self.__dict__[name]
+
+    def warm_up(self) -> None:
+        """
+        Builds everything the client needs to invoke its methods ahead of the first call.
+        """
+        for method in self.__methods__.values():
+            self._protocol_factory(method.request)
+            self._protocol_factory(method.response)
+
     @abstractmethod
     async def invoke(self, method: Method, request: 'venom.message.Message', *,
                      loop: 'asyncio.AbstractEventLoop' = None):
         raise NotImplementedError
+
+    async def close(self) -> None:
+        """
+        Releases any connections held by the client.
+        """
+        pass
@@ -1,21 +1,41 @@
 import asyncio
+from urllib.parse import quote
+from weakref import WeakKeyDictionary, WeakSet, finalize
 
 import aiohttp
 from aiohttp.web_request import BaseRequest
-from typing import Type
+from aiohttp.web_urldispatcher import Resource, ResourceRoute, UrlMappingMatchInfo
+from typing import Type, Dict, NamedTuple, Set, Optional, MutableMapping, Union, Sequence, Callable, List, Tuple, Any
+from yarl import URL
 
-from venom.common import FieldMask
-from venom.exceptions import Error, ErrorResponse
-from venom.protocol import JSONProtocol, Protocol, URIStringProtocol, URIStringDictMessageTranscoder
+from venom.exceptions import Error, ErrorResponse, ServiceUnavailable, NotFound, NotImplemented_, BadRequest, \
+    PayloadTooLarge, ServerError
+from venom.protocol import JSONProtocol, Protocol
 from venom.rpc import RequestContext
 from venom.rpc.comms import AbstractClient
-from venom.rpc.method import Method, HTTPVerb, HTTPFieldLocation
+from venom.rpc.comms.balancing import Balancer, Policy, routing_key
+from venom.rpc.comms.cache import ResponseCache, cache_control, compute_etag, etag_matches, version_etag
+from venom.rpc.comms.compression import Compression, compress, negotiate
+from venom.rpc.comms.limits import LimitAlgorithm, Limiter
+from venom.rpc.comms.resilience import CallPolicy, CallStats, RetryBudget
+from venom.rpc.comms.binding import HTTPBinding, add_http_routes
+from venom.rpc.dispatch import DispatchEntry, UnknownMethod
+from venom.rpc.method import HTTPVerb, Method
+from venom.rpc.pool import ServicePool
+from venom.rpc.routing import Router
 
 try:
     from aiohttp import web, ClientSession
 except ImportError:
     raise RuntimeError("You must install the 'aiohttp' package to use the AioHTTP features of Venom RPC")
 
+try:
+    import ujson as json
+except ImportError:
+    import json
+
+MAX_BATCH_SIZE = 256
+
 
 class AioHTTPRequestContext(RequestContext):
     request: BaseRequest
@@ -24,34 +44,171 @@ class AioHTTPRequestContext(RequestContext):
         self.request = request
 
 
-def _route_handler(venom: 'venom.rpc.Venom', method: Method, protocol_factory: Type[Protocol]):
-    rpc_response = protocol_factory(method.response)
+async def _resolve_version(venom: 'venom.rpc.Venom', method: Method, hook: str, request):
+    instance = pool = venom.get_instance(method.service)
+    if isinstance(pool, ServicePool):
+        instance = await pool.acquire()
+
+    try:
+        version = getattr(instance, hook)(request)
+        if asyncio.iscoroutine(version) or isinstance(version, asyncio.Future):
+            version = await version
+        return version
+    finally:
+        if isinstance(pool, ServicePool):
+            pool.release(instance)
+
+
+async def _invoke_versioned(venom: 'venom.rpc.Venom',
+                            method: Method,
+                            hook: str,
+                            request,
+                            context: RequestContext,
+                            if_none_match: Optional[str]) -> Tuple[str, Optional[Any]]:
+    """
+    Resolves the version of a response with a version hook and, unless the client already has that version, invokes
+    the method. Both run in the same request context.
+
+    :returns: the ETag of the version and the response, or ``None`` if ``if_none_match`` matches the ETag.
+    """
+    with context:
+        etag = version_etag(await _resolve_version(venom, method, hook, request))
+        if etag_matches(if_none_match, etag):
+            return etag, None
+        return etag, await venom.invoke_in_context(method, request)
+
+
+def _compressed_response(http_request: BaseRequest,
+                         compression: Compression,
+                         body: bytes,
+                         *,
+                         headers: Dict[str, str] = None,
+                         **kwargs) -> web.Response:
+    if compression.threshold is not None:
+        headers = {**(headers or {}), 'Vary': 'Accept-Encoding'}
+        encoding = negotiate(http_request.headers.get('Accept-Encoding')) if compression.should_compress(body) else None
+
+        if encoding is not None:
+            body = compress(body, encoding, compression.level)
+            headers['Content-Encoding'] = encoding
+
+            # the compressed body is a different representation of the same response
+            if 'ETag' in headers and not headers['ETag'].startswith('W/'):
+                headers['ETag'] = 'W/' + headers['ETag']
+
+    return web.Response(body=body, headers=headers, **kwargs)
+
+
+def _route_handler(venom: 'venom.rpc.Venom',
+                   entry: DispatchEntry,
+                   protocol_factory: Type[Protocol],
+                   compression: Compression = Compression(None)):
+    method = entry.method
+    binding = HTTPBinding.get(method, protocol_factory)
+    rpc_response = binding.response
     rpc_error_response = protocol_factory(ErrorResponse)
 
     http_status = method.http_status
+    compression = compression.for_method(method)
 
-    http_field_locations = method.http_field_locations()
+    cacheable = method.http_method == HTTPVerb.GET
+    etag_option = method.options.get('etag', True) if cacheable else False
+    cache_headers = {}
+    if cacheable and cache_control(method.options):
+        cache_headers['Cache-Control'] = cache_control(method.options)
 
-    http_request_body = JSONProtocol(method.request, FieldMask(http_field_locations[HTTPFieldLocation.BODY]))
+    if isinstance(etag_option, str) and not callable(getattr(method.service, etag_option, None)):
+        raise ValueError(f"Version hook '{etag_option}' of {method.service.__name__}.{method.name} does not exist")
 
-    http_request_query = URIStringDictMessageTranscoder(URIStringProtocol,
-                                                        method.request,
-                                                        FieldMask(http_field_locations[HTTPFieldLocation.QUERY]))
+    # a 304 response carries the headers that would have varied the 200 response
+    not_modified_headers = dict(cache_headers)
+    if compression.threshold is not None:
+        not_modified_headers['Vary'] = 'Accept-Encoding'
 
-    http_request_path = URIStringDictMessageTranscoder(URIStringProtocol,
-                                                       method.request,
-                                                       FieldMask(http_field_locations[HTTPFieldLocation.PATH]))
+    def not_modified(etag: str):
+        return web.Response(status=304, headers={'ETag': etag, **not_modified_headers})
 
     async def handler(http_request):
         try:
-            request = http_request_body.unpack(await http_request.read())
-            http_request_query.decode(http_request.url.query, request)
-            http_request_path.decode(http_request.match_info, request)
-
-            response = await venom.invoke(method, request, context=AioHTTPRequestContext(http_request))
-            return web.Response(body=rpc_response.pack(response),
-                                content_type=rpc_response.mime,
-                                status=http_status)
+            request = binding.decode_request(await http_request.read(),
+                                             http_request.url.query,
+                                             http_request.match_info)
+
+            etag = None
+            if isinstance(etag_option, str):
+                etag, response = await asyncio.get_event_loop().create_task(
+                    _invoke_versioned(venom, method, etag_option, request, AioHTTPRequestContext(http_request),
+                                      http_request.headers.get('If-None-Match')))
+                if response is None:
+                    return not_modified(etag)
+            else:
+                response = await venom.invoke(method, request, context=AioHTTPRequestContext(http_request))
+
+            body = rpc_response.pack(response)
+
+            if etag_option is True:
+                etag = compute_etag(body)
+                if etag_matches(http_request.headers.get('If-None-Match'), etag):
+                    return not_modified(etag)
+
+            headers = dict(cache_headers)
+            if etag is not None:
+                headers['ETag'] = etag
+
+            return _compressed_response(http_request, compression, body,
+                                        content_type=rpc_response.mime,
+                                        status=http_status,
+                                        headers=headers)
+        except Error as e:
+            return web.Response(body=rpc_error_response.pack(e.format()),
+                                content_type=rpc_error_response.mime,
+                                status=e.http_status)
+
+    return handler
+
+
+def _batch_handler(venom: 'venom.rpc.Venom',
+                   protocol_factory: Type[Protocol],
+                   compression: Compression = Compression(None),
+                   max_batch_size: int = MAX_BATCH_SIZE):
+    rpc_error_response = protocol_factory(ErrorResponse)
+
+    async def invoke(http_request, call) -> Dict[str, Any]:
+        try:
+            service_name, method_name = call.get('service'), call.get('method')
+            if not isinstance(service_name, str) or not isinstance(method_name, str):
+                raise BadRequest("A call needs a 'service' and a 'method' name")
+
+            try:
+                entry = venom.get_method(service_name, method_name)
+            except UnknownMethod:
+                raise NotFound(f"Unknown method {service_name}.{method_name}")
+
+            if entry.method.client_streaming or entry.method.server_streaming:
+                raise NotImplemented_('Streaming methods cannot be batched')
+
+            request_protocol, response_protocol = entry.protocols(protocol_factory)
+            request = request_protocol.decode(call.get('request') or {})
+            response = await venom.invoke(entry.method, request, context=AioHTTPRequestContext(http_request))
+            return {'status': entry.method.http_status, 'response': response_protocol.encode(response)}
+        except Error as e:
+            return {'status': e.http_status, 'error': rpc_error_response.encode(e.format())}
+
+    async def handler(http_request):
+        try:
+            try:
+                calls = json.loads(await http_request.read())
+                if not isinstance(calls, list) or not all(isinstance(call, dict) for call in calls):
+                    raise ValueError('Expected a list of calls')
+            except ValueError as e:
+                raise BadRequest(f'Invalid batch: {e}')
+
+            if len(calls) > max_batch_size:
+                raise PayloadTooLarge(f'Batches are limited to {max_batch_size} calls')
+
+            results = await asyncio.gather(*(invoke(http_request, call) for call in calls))
+            return _compressed_response(http_request, compression, json.dumps(results).encode('utf-8'),
+                                        content_type='application/json')
         except Error as e:
             return web.Response(body=rpc_error_response.pack(e.format()),
                                 content_type=rpc_error_response.mime,
@@ -66,35 +223,503 @@ def _path_field_template(field, default):
     return default
 
 
+class VenomResource(Resource):
+    """
+    A single aiohttp resource that routes requests to all methods of a Venom using a :class:`venom.rpc.routing.Router`
+    instead of trying a regular expression for each method in turn.
+
+    The resource can be mounted in a sub-application with :meth:`aiohttp.web.Application.add_subapp`, in which case
+    the prefix is stripped before routing. URLs are built with :meth:`url_for` from the ``'service.method'`` name of a
+    method and its path parameters.
+    """
+
+    def __init__(self, *, name: str = None) -> None:
+        super().__init__(name=name)
+        self._router = Router()
+        self._methods: Dict[str, Method] = {}
+        self._prefix = ''
+
+    @property
+    def canonical(self) -> str:
+        return self._prefix or '/'
+
+    def add_method(self, method: Method, handler) -> ResourceRoute:
+        route = ResourceRoute(method.http_method.value, handler, self)
+        self._router.add(method, route)
+        self._methods[f'{method.service.__meta__.name}.{method.name}'] = method
+        self.register_route(route)
+        return route
+
+    def _strip_prefix(self, path: str) -> Optional[str]:
+        if not self._prefix:
+            return path
+        if not path.startswith(self._prefix + '/'):
+            return None
+        return path[len(self._prefix):]
+
+    def _match(self, path: str) -> Optional[Dict[str, Any]]:
+        """
+        :returns: the path parameters of the first route matching the path with any HTTP verb, or ``None``.
+        """
+        path = self._strip_prefix(path)
+        if path is None:
+            return None
+
+        for verb in HTTPVerb:
+            match = self._router.match(verb, path)
+            if match is not None:
+                return match[1]
+        return None
+
+    async def resolve(self, request: BaseRequest):
+        path = self._strip_prefix(request.rel_url.raw_path)
+        if path is None:
+            return None, set()
+
+        match = self._router.match(request.method, path)
+        if match is None:
+            return None, {verb.value for verb in self._router.allowed_verbs(path)}
+
+        route, params = match
+        return UrlMappingMatchInfo(params, route), {route.method}
+
+    def add_prefix(self, prefix: str) -> None:
+        assert prefix.startswith('/')
+        assert not prefix.endswith('/')
+        assert len(prefix) > 1
+        self._prefix = prefix + self._prefix
+
+    def raw_match(self, path: str) -> bool:
+        return any(self._prefix + method.http_path == path for method in self._methods.values())
+
+    def get_info(self):
+        return {'prefix': self._prefix,
+                'methods': {name: self._prefix + method.http_path for name, method in self._methods.items()}}
+
+    def url_for(self, method: str, **params) -> URL:
+        """
+        :param method: the ``'service.method'`` name of a method.
+        :param params: the values of the path parameters of the method.
+        """
+        template = self._methods[method].format_http_path(json_names=False)
+        path = template.format_map({name: quote(str(value), safe='') for name, value in params.items()})
+        return URL.build(path=self._prefix + path, encoded=True)
+
+    def __repr__(self):
+        return f'<VenomResource {self._prefix or "/"} {len(self._routes)} routes>'
+
+
 def create_app(venom: 'venom.rpc.Venom',
                app: web.Application = None,
-               protocol_factory: Type[Protocol] = JSONProtocol):
+               protocol_factory: Type[Protocol] = JSONProtocol,
+               *,
+               warm: bool = False,
+               batch_path: str = None,
+               max_batch_size: int = MAX_BATCH_SIZE,
+               compression_threshold: Optional[int] = 1024,
+               compression_level: int = 6):
+    """
+    :param warm: when ``True``, the Venom is frozen with :meth:`venom.rpc.Venom.freeze` before the app is created.
+    :param batch_path: when given, a ``POST`` endpoint at this path accepts a JSON list of
+        ``{"service", "method", "request"}`` calls, invokes them concurrently and responds with a list of
+        ``{"status", "response"}`` or ``{"status", "error"}`` results in the same order. Only available with
+        :class:`venom.protocol.JSONProtocol`.
+    :param max_batch_size: the largest number of calls accepted in one batch; larger batches are rejected with status
+        413.
+    :param compression_threshold: the size in bytes from which responses are compressed for clients that accept
+        ``gzip`` or ``deflate``, or ``None`` to never compress. Methods can override it with the
+        ``compression_threshold`` option; see :mod:`venom.rpc.comms.compression`.
+    :param compression_level: the zlib compression level, unless overridden by the ``compression_level`` option.
+    """
+    if batch_path is not None and not issubclass(protocol_factory, JSONProtocol):
+        raise ValueError('Batch requests are only supported with the JSON protocol')
+
     if app is None:
         app = web.Application()
 
-    for method in venom.iter_methods():
-        app.router.add_route(method.http_method.value,
-                             method.format_http_path(json_names=True, field_template_hook=_path_field_template),
-                             _route_handler(venom, method, protocol_factory))
+    compression = Compression(compression_threshold, compression_level)
+
+    resource = VenomResource()
+    add_http_routes(venom,
+                    protocol_factory,
+                    resource.add_method,
+                    lambda entry: _route_handler(venom, entry, protocol_factory, compression),
+                    warm=warm)
+
+    if batch_path is not None:
+        app.router.add_post(batch_path, _batch_handler(venom, protocol_factory, compression, max_batch_size))
 
+    app.router.register_resource(resource)
     return app
 
 
+UNIX_SCHEME = 'unix://'
+
+
+def unix_socket_path(url: str) -> Optional[str]:
+    """
+    :returns: the socket path of a ``unix:///path/to/socket`` URL, or ``None`` for any other URL.
+    """
+    if url.startswith(UNIX_SCHEME):
+        return url[len(UNIX_SCHEME):]
+    return None
+
+
+class ConnectionPoolStats(NamedTuple):
+    limit: int
+    limit_per_host: int
+    acquired: int
+    idle: int
+    requests: int
+    connections_created: int
+    connections_reused: int
+
+
+class _CountingConnector(object):
+    """
+    Counts the connections that are checked out of a connector, and keeps track of the protocols of the connections it
+    handed out, so that pool usage can be reported without reading the private state of the connector.
+    """
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.acquired = 0
+        self._protocols = WeakSet()
+
+    async def connect(self, req, *args, **kwargs):
+        connection = await super().connect(req, *args, **kwargs)
+        self.acquired += 1
+        self._protocols.add(connection.protocol)
+        connection.add_callback(self._connection_released)
+        return connection
+
+    def _connection_released(self) -> None:
+        self.acquired -= 1
+
+    @property
+    def idle(self) -> int:
+        connected = sum(1 for protocol in self._protocols if protocol.is_connected())
+        return max(0, connected - self.acquired)
+
+
+class _TCPConnector(_CountingConnector, aiohttp.TCPConnector):
+    pass
+
+
+class _UnixConnector(_CountingConnector, aiohttp.UnixConnector):
+    pass
+
+
+class ConnectorRegistry(object):
+    """
+    Shares pooled keep-alive connections between all :class:`HTTPClient` instances of a :class:`venom.rpc.Venom`,
+    with one :class:`aiohttp.TCPConnector` and session per origin (scheme, host and port), or one
+    :class:`aiohttp.UnixConnector` and session per socket for ``unix://`` URLs.
+
+    Each Venom gets its own registry through :meth:`get`, configured from the ``http_connectors`` option of the Venom::
+
+        venom = Venom(http_connectors={'limit_per_host': 20, 'keepalive_timeout': 30})
+
+    Clients created without a Venom share a default registry. The sessions of a registry are closed once all clients
+    using it are closed, e.g. with :meth:`venom.rpc.Venom.close`, or have been garbage-collected. Sessions can only be
+    closed from their event loop: when the last client is collected while that loop is not running, the sessions are
+    left open until :meth:`close` is called.
+    """
+    __registries: MutableMapping['venom.rpc.Venom', 'ConnectorRegistry'] = WeakKeyDictionary()
+    __default: Optional['ConnectorRegistry'] = None
+
+    def __init__(self,
+                 *,
+                 limit: int = 100,
+                 limit_per_host: int = 0,
+                 keepalive_timeout: float = 15.0,
+                 use_dns_cache: bool = True,
+                 ttl_dns_cache: Optional[int] = 10,
+                 **session_kwargs) -> None:
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.use_dns_cache = use_dns_cache
+        self.ttl_dns_cache = ttl_dns_cache
+        self._session_kwargs = session_kwargs
+        self._sessions: Dict[str, aiohttp.ClientSession] = {}
+        self._counters: Dict[str, Dict[str, int]] = {}
+        self._clients: Set['HTTPClient'] = WeakSet()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @classmethod
+    def get(cls, venom: 'venom.rpc.Venom' = None) -> 'ConnectorRegistry':
+        if venom is None:
+            if ConnectorRegistry.__default is None:
+                ConnectorRegistry.__default = cls()
+            return ConnectorRegistry.__default
+
+        try:
+            return cls.__registries[venom]
+        except KeyError:
+            cls.__registries[venom] = registry = cls(**venom.options.get('http_connectors', {}))
+            return registry
+
+    @staticmethod
+    def origin(url: str) -> str:
+        if unix_socket_path(url) is not None:
+            return url
+        return str(URL(url).origin())
+
+    def _trace_config(self, counters: Dict[str, int]) -> aiohttp.TraceConfig:
+        def counter(name):
+            async def increment(session, context, params):
+                counters[name] += 1
+            return increment
+
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_request_start.append(counter('requests'))
+        trace_config.on_connection_create_end.append(counter('connections_created'))
+        trace_config.on_connection_reuseconn.append(counter('connections_reused'))
+        return trace_config
+
+    def session(self, url: str) -> aiohttp.ClientSession:
+        """
+        :returns: the session for the origin of ``url``, creating it if necessary.
+        """
+        origin = self.origin(url)
+
+        try:
+            session = self._sessions[origin]
+            if not session.closed:
+                return session
+        except KeyError:
+            pass
+
+        counters = self._counters.setdefault(origin, {'requests': 0, 'connections_created': 0, 'connections_reused': 0})
+        socket_path = unix_socket_path(url)
+        if socket_path is not None:
+            connector = _UnixConnector(socket_path,
+                                       limit=self.limit,
+                                       limit_per_host=self.limit_per_host,
+                                       keepalive_timeout=self.keepalive_timeout)
+        else:
+            connector = _TCPConnector(limit=self.limit,
+                                      limit_per_host=self.limit_per_host,
+                                      keepalive_timeout=self.keepalive_timeout,
+                                      use_dns_cache=self.use_dns_cache,
+                                      ttl_dns_cache=self.ttl_dns_cache)
+
+        self._loop = asyncio.get_event_loop()
+        self._sessions[origin] = session = aiohttp.ClientSession(connector=connector,
+                                                                 trace_configs=[self._trace_config(counters)],
+                                                                 **self._session_kwargs)
+        return session
+
+    def stats(self) -> Dict[str, ConnectionPoolStats]:
+        """
+        :returns: connection pool usage for each origin, keyed by origin URL.
+        """
+        stats = {}
+        for origin, session in self._sessions.items():
+            connector = session.connector
+            counters = self._counters[origin]
+
+            if connector is None or connector.closed:
+                acquired = idle = 0
+            else:
+                acquired = connector.acquired
+                idle = connector.idle
+
+            stats[origin] = ConnectionPoolStats(self.limit,
+                                                self.limit_per_host,
+                                                acquired,
+                                                idle,
+                                                counters['requests'],
+                                                counters['connections_created'],
+                                                counters['connections_reused'])
+        return stats
+
+    def register(self, client: 'HTTPClient') -> None:
+        self._clients.add(client)
+        finalize(client, self._client_collected)
+
+    async def release(self, client: 'HTTPClient') -> None:
+        """
+        Unregisters a client and closes all sessions once no more clients are registered.
+        """
+        self._clients.discard(client)
+        if not self._clients:
+            await self.close()
+
+    def _client_collected(self) -> None:
+        # finalizers can run in any thread, and at any time; the client may also still be in the set while its
+        # finalizer runs, so the check happens in a later callback on the loop of the sessions
+        loop = self._loop
+        if self._sessions and loop is not None and loop.is_running():
+            loop.call_soon_threadsafe(self._close_unused)
+
+    def _close_unused(self) -> None:
+        if self._sessions and not self._clients:
+            self._loop.create_task(self.close())
+
+    async def close(self) -> None:
+        sessions, self._sessions = self._sessions, {}
+        for session in sessions.values():
+            await session.close()
+
+
+_RESILIENCE_OPTIONS = frozenset(('idempotent', 'hedge', 'retries'))
+
+# responses that indicate the endpoint, rather than the call, has a problem
+_UNHEALTHY_STATUSES = frozenset((502, 503, 504))
+
+
 class HTTPClient(AbstractClient):
+    """
+    :param base_url: the base URL of the service, or ``unix:///path/to/socket`` to connect to a server on a Unix domain
+        socket (see :class:`venom.rpc.serve.Server`). Given a list of base URLs, or a callback returning one, calls are
+        balanced between them by a :class:`venom.rpc.comms.balancing.Balancer`.
+    :param balancing: the policy to choose an endpoint with when several base URLs are given, or a
+        :class:`venom.rpc.comms.balancing.Balancer`. Methods with a ``routing_key`` option are routed by consistent
+        hashing of that request field instead.
+    :param batch_path: the ``batch_path`` of a server created with :func:`create_app`. When given, concurrent calls to
+        the same endpoint are buffered for up to ``batch_delay`` seconds or ``batch_size`` calls and sent as one batch
+        request. Only available with :class:`venom.protocol.JSONProtocol`.
+    :param cache: a :class:`venom.rpc.comms.cache.ResponseCache` to keep the responses of ``GET`` methods in. Fresh
+        responses are returned without a request; stale ones are revalidated with their ``ETag``. Batched calls bypass
+        the cache.
+    :param compression_threshold: the size in bytes from which request bodies are compressed with ``gzip``, or ``None``
+        to never compress them. Only use it with servers that accept compressed requests, such as those created with
+        :func:`create_app`. Methods can override the threshold and level with the ``compression_threshold`` and
+        ``compression_level`` options. Responses are always decompressed.
+    :param compression_level: the zlib compression level for request bodies.
+    :param concurrency_limit: a callable returning a :class:`venom.rpc.comms.limits.Limiter` or
+        :class:`venom.rpc.comms.limits.LimitAlgorithm`, such as :class:`venom.rpc.comms.limits.AIMDLimit`. When given,
+        each endpoint gets its own adaptive limit on calls in flight; calls beyond it wait or fail with
+        :class:`venom.rpc.comms.limits.LimitExceeded`.
+    :param retry_budget: the budget for hedged and retried calls of idempotent methods; see
+        :mod:`venom.rpc.comms.resilience`.
+    :param session: a session to use instead of the shared connection pool; the caller remains responsible for closing
+        it.
+    :param connectors: the registry to take a connection pool from. Defaults to the registry of the Venom of the
+        stub.
+    :param session_kwargs: when given, the client creates a session of its own with these arguments instead of using a
+        shared connection pool.
+    """
+
     def __init__(self,
                  stub: Type['venom.rpc.Service'],
-                 base_url: str,
+                 base_url: Union[str, Sequence[str], Callable[[], Sequence[str]]],
                  *,
                  protocol_factory: Type[Protocol] = None,
+                 balancing: Union[Policy, Balancer] = None,
+                 retry_budget: RetryBudget = None,
+                 batch_path: str = None,
+                 batch_size: int = 32,
+                 batch_delay: float = 0.002,
+                 concurrency_limit: Callable[[], Union[Limiter, LimitAlgorithm]] = None,
+                 cache: ResponseCache = None,
+                 compression_threshold: Optional[int] = None,
+                 compression_level: int = 6,
                  session: aiohttp.ClientSession = None,
+                 connectors: ConnectorRegistry = None,
                  **session_kwargs):
         super().__init__(stub, protocol_factory=protocol_factory)
-        self._base_url = base_url
 
-        if session is None:
-            self._session = aiohttp.ClientSession(**session_kwargs)
+        if batch_path is not None and not issubclass(self._protocol_factory, JSONProtocol):
+            raise ValueError('Batch requests are only supported with the JSON protocol')
+
+        if isinstance(balancing, Balancer):
+            self._balancer = balancing
+        elif isinstance(base_url, str):
+            self._balancer = None
         else:
-            self._session = session
+            self._balancer = Balancer(base_url, balancing)
+
+        self._base_url = base_url if self._balancer is None else None
+        self._retry_budget = retry_budget or RetryBudget()
+        self._error_response = self._protocol_factory(ErrorResponse)
+
+        self._batch_path = batch_path
+        self._batch_size = batch_size
+        self._batch_delay = batch_delay
+        self._batches: Dict[str, List[Tuple[Method, 'venom.message.Message', asyncio.Future]]] = {}
+        self._batch_timers: Dict[str, asyncio.Handle] = {}
+
+        self._cache = cache if batch_path is None else None
+
+        self._compression = Compression(compression_threshold, compression_level)
+        self._concurrency_limit = concurrency_limit
+        self._limiters: Dict[str, Limiter] = {}
+
+        self._prepared: Set[str] = set()
+        self._routing_keys: Dict[str, Callable[['venom.message.Message'], str]] = {}
+        self._call_policies: Dict[str, CallPolicy] = {}
+        self._method_compression: Dict[str, Compression] = {}
+        for method in self._eager_methods():
+            self._prepare(method)
+
+        self._session = session
+        self._session_kwargs = session_kwargs
+        self._owns_session = False
+        self._connectors = None
+
+        if session is None and not session_kwargs:
+            if connectors is None:
+                connectors = ConnectorRegistry.get(getattr(stub, 'venom', None))
+            self._connectors = connectors
+            connectors.register(self)
+
+    @property
+    def balancer(self) -> Optional[Balancer]:
+        return self._balancer
+
+    def _get_session(self, base_url: str) -> aiohttp.ClientSession:
+        if self._connectors is not None:
+            return self._connectors.session(base_url)
+
+        if self._session is None:
+            session_kwargs = self._session_kwargs
+            socket_path = unix_socket_path(base_url)
+            if socket_path is not None and 'connector' not in session_kwargs:
+                session_kwargs = {'connector': aiohttp.UnixConnector(socket_path), **session_kwargs}
+
+            self._session = aiohttp.ClientSession(**session_kwargs)
+            self._owns_session = True
+        return self._session
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        if self._balancer is not None:
+            return self._get_session(self._balancer.choose().url)
+        return self._get_session(self._base_url)
+
+    @staticmethod
+    def _url(base_url: str, path: str) -> str:
+        if unix_socket_path(base_url) is not None:
+            # the socket path is the whole base URL; the host is only used for the Host header
+            return 'http://localhost' + path
+        return base_url + path
+
+    def _prepare(self, method: Method) -> None:
+        """
+        Sets up the routing key, call policy and request compression of a method on its first use.
+        """
+        if 'routing_key' in method.options:
+            self._routing_keys[method.name] = routing_key(method)
+        if _RESILIENCE_OPTIONS & method.options.keys():
+            self._call_policies[method.name] = CallPolicy(method,
+                                                          self._retry_budget,
+                                                          retryable=(aiohttp.ClientConnectionError, ServiceUnavailable))
+        if self._compression.threshold is not None:
+            self._method_compression[method.name] = self._compression.for_method(method)
+        self._prepared.add(method.name)
+
+    def call_stats(self) -> Dict[str, CallStats]:
+        """
+        :returns: call, retry and hedge counters for every method that is hedged or retried.
+        """
+        return {name: policy.stats() for name, policy in self._call_policies.items()}
+
+    def warm_up(self) -> None:
+        for method in self.__methods__.values():
+            HTTPBinding.get(method, self._protocol_factory)
 
     async def invoke(self,
                      method: Method,
@@ -105,39 +730,226 @@ class HTTPClient(AbstractClient):
                      timeout: int = None):
 
         # TODO optional timeouts
+        binding = HTTPBinding.get(method, self._protocol_factory)
+        if method.name not in self._prepared:
+            self._prepare(method)
+
+        key = None
+        if self._balancer is not None and method.name in self._routing_keys:
+            key = self._routing_keys[method.name](request)
+
+        cache_key = None
+        if self._cache is not None and method.http_method == HTTPVerb.GET:
+            path, params, _ = binding.encode_request(request)
+            cache_key = self._cache.key(path, params)
+            entry = self._cache.get(cache_key)
+            if entry is not None and self._cache.fresh(entry):
+                self._cache.hits += 1
+                return binding.response.unpack(entry.body)
 
-        if method.http_path_parameters():
-            url = self._base_url + method.http_path.format(**request)
-        else:
-            url = self._base_url + method.http_path
-
-        headers = None
-        if method.http_method in (HTTPVerb.POST, HTTPVerb.PUT, HTTPVerb.PATCH):
-            headers = {'content-type': self._protocol_factory.mime}
+        try:
+            policy = self._call_policies[method.name]
+        except KeyError:
+            return await self._attempt(binding, request, key, cache_key)
+        return await policy.call(lambda: self._attempt(binding, request, key, cache_key))
+
+    async def _send(self,
+                    binding: HTTPBinding,
+                    request: 'venom.message.Message',
+                    base_url: str,
+                    cache_key: str = None):
+        """
+        :returns: the HTTP status and a function that returns the response or raises the error.
+        """
+        path, params, body = binding.encode_request(request)
+
+        headers, entry = binding.request_headers, None
+        compression = self._method_compression.get(binding.method.name)
+        if compression is not None and body and compression.should_compress(body):
+            body = compress(body, 'gzip', compression.level)
+            headers = {**(headers or {}), 'Content-Encoding': 'gzip'}
+
+        if cache_key is not None:
+            entry = self._cache.get(cache_key)
+            if entry is not None and entry.etag is not None:
+                headers = {**(headers or {}), 'If-None-Match': entry.etag}
+
+        async with self._get_session(base_url).request(binding.http_verb.value, self._url(base_url, path),
+                                                       headers=headers,
+                                                       data=body,
+                                                       params=params) as response:
+            status, body = response.status, await response.read()
+
+            if cache_key is not None:
+                if status == 304 and entry is not None:
+                    self._cache.revalidations += 1
+                    self._cache.refresh(entry, response.headers.get('Cache-Control'))
+                    body = entry.body
+                elif status == 200:
+                    self._cache.misses += 1
+                    self._cache.store(cache_key, body, response.headers.get('ETag'),
+                                      response.headers.get('Cache-Control'))
+
+        if 200 <= status < 400:
+            return status, lambda: binding.response.unpack(body)
+        return status, lambda: self._error_response.unpack(body).raise_()
+
+    def _enqueue(self, base_url: str, method: Method, request: 'venom.message.Message') -> asyncio.Future:
+        loop = asyncio.get_event_loop()
+        future = loop.create_future()
 
-        http_field_locations = method.http_field_locations()
+        try:
+            batch = self._batches[base_url]
+        except KeyError:
+            self._batches[base_url] = batch = []
+            self._batch_timers[base_url] = loop.call_later(self._batch_delay, self._flush, base_url)
 
-        params = URIStringDictMessageTranscoder(
-            URIStringProtocol,
-            method.request,
-            FieldMask(http_field_locations[HTTPFieldLocation.QUERY])).encode(request)
+        batch.append((method, request, future))
+        if len(batch) >= self._batch_size:
+            self._flush(base_url)
+        return future
 
-        body = self._protocol_factory(method.request,
-                                      http_field_locations[HTTPFieldLocation.BODY]).pack(request)
+    def _flush(self, base_url: str) -> None:
+        self._batch_timers.pop(base_url).cancel()
+        asyncio.ensure_future(self._send_batch(base_url, self._batches.pop(base_url)))
 
-        async with self._session.request(method.http_method.value.lower(), url,
-                                         headers=headers,
-                                         data=body,
-                                         params=params) as response:
-            if 200 <= response.status < 400:
-                return self._protocol_factory(method.response).unpack(await response.read())
+    async def _send_batch(self, base_url: str, calls: List[Tuple[Method, 'venom.message.Message', asyncio.Future]]):
+        try:
+            await self._send_calls(base_url, calls)
+        finally:
+            # no caller is ever left waiting, whatever the server replied
+            for method, request, future in calls:
+                if not future.done():
+                    future.set_exception(ServerError(f'No result for {method.name} in the batch response'))
+
+    async def _send_calls(self, base_url: str, calls: List[Tuple[Method, 'venom.message.Message', asyncio.Future]]):
+        if len(calls) == 1:
+            method, request, future = calls[0]
+            try:
+                result = await self._send(HTTPBinding.get(method, self._protocol_factory), request, base_url)
+            except Exception as e:
+                if not future.done():
+                    future.set_exception(e)
             else:
-                self._protocol_factory(ErrorResponse).unpack(await response.read()).raise_()
+                if not future.done():
+                    future.set_result(result)
+            return
 
-    # XXX not sure if session should be opened for each request, and why an unclosed session is such a bad thing.
-    def __del__(self):
-        if self._session:
-            self._session.close()
+        body = json.dumps([{'service': self.stub.__meta__.name,
+                            'method': method.name,
+                            'request': self._protocol_factory(method.request).encode(request)}
+                           for method, request, future in calls]).encode('utf-8')
+
+        headers = {'content-type': JSONProtocol.mime}
+        if self._compression.should_compress(body):
+            body = compress(body, 'gzip', self._compression.level)
+            headers['Content-Encoding'] = 'gzip'
+
+        try:
+            async with self._get_session(base_url).post(self._url(base_url, self._batch_path),
+                                                        headers=headers,
+                                                        data=body) as response:
+                status, body = response.status, await response.read()
+
+            if status != 200:
+                self._error_response.unpack(body).raise_()
+            results = json.loads(body)
+            if not isinstance(results, list) or len(results) != len(calls) \
+                    or not all(isinstance(result, dict) for result in results):
+                raise ServerError(f'Invalid batch response: expected a list of {len(calls)} results')
+        except Exception as e:
+            for method, request, future in calls:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (method, request, future), result in zip(calls, results):
+            if future.done():
+                continue
+            try:
+                if 'error' in result:
+                    error = self._error_response.decode(result['error'])
+                    future.set_result((result['status'], error.raise_))
+                else:
+                    response = HTTPBinding.get(method, self._protocol_factory).response.decode(result['response'])
+                    future.set_result((result['status'], lambda response=response: response))
+            except Exception as e:
+                error = ServerError(f'Invalid result for {method.name} in the batch response')
+                error.__cause__ = e
+                future.set_exception(error)
+
+    def _get_limiter(self, base_url: str) -> Optional[Limiter]:
+        if self._concurrency_limit is None:
+            return None
+
+        try:
+            return self._limiters[base_url]
+        except KeyError:
+            limiter = self._concurrency_limit()
+            if isinstance(limiter, LimitAlgorithm):
+                limiter = Limiter(limiter)
+            self._limiters[base_url] = limiter
+            return limiter
+
+    def limiters(self) -> Dict[str, Limiter]:
+        """
+        :returns: the concurrency limiter of every endpoint called so far.
+        """
+        return dict(self._limiters)
+
+    async def _attempt(self,
+                       binding: HTTPBinding,
+                       request: 'venom.message.Message',
+                       key: str = None,
+                       cache_key: str = None):
+        if self._balancer is None:
+            base_url, endpoint = self._base_url, None
+        else:
+            endpoint = self._balancer.choose(key)
+            base_url = endpoint.url
+
+        limiter = self._get_limiter(base_url)
+        if limiter is not None:
+            limit_started = await limiter.acquire()
+
+        if endpoint is not None:
+            started = self._balancer.started(endpoint)
+
+        healthy = cancelled = False
+        try:
+            if self._batch_path is None:
+                status, result = await self._send(binding, request, base_url, cache_key)
+            else:
+                status, result = await self._enqueue(base_url, binding.method, request)
+
+            healthy = status not in _UNHEALTHY_STATUSES
+            return result()
+        except asyncio.CancelledError:
+            cancelled = True
+            raise
+        finally:
+            if limiter is not None:
+                limiter.release(limit_started, dropped=not healthy, ignore=cancelled)
+
+            if endpoint is not None:
+                if cancelled:
+                    self._balancer.cancelled(endpoint)
+                elif healthy:
+                    self._balancer.succeeded(endpoint, started)
+                else:
+                    self._balancer.failed(endpoint)
+
+    async def close(self) -> None:
+        for base_url in list(self._batches):
+            self._batch_timers.pop(base_url).cancel()
+            await self._send_batch(base_url, self._batches.pop(base_url))
+
+        if self._connectors is not None:
+            connectors, self._connectors = self._connectors, None
+            await connectors.release(self)
+        elif self._owns_session:
+            session, self._session = self._session, None
+            await session.close()
 
 
 Client = HTTPClient
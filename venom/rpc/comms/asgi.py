@@ -0,0 +1,134 @@
+"""
+An `ASGI <https://asgi.readthedocs.io/>`_ application for a :class:`venom.rpc.Venom`, so that it can be served by any
+ASGI server::
+
+    app = create_asgi_app(venom)
+
+    # uvicorn myapp.asgi:app
+
+Requests are routed with the same :class:`venom.rpc.routing.Router` and mapped onto messages with the same
+:class:`venom.rpc.comms.binding.HTTPBinding` as :func:`venom.rpc.comms.aiohttp.create_app`, and errors are returned as
+:class:`venom.exceptions.ErrorResponse` in the same way. Bodies are read from ``receive`` and written to ``send``
+directly. Response compression and caching headers are left to the ASGI server or middleware.
+"""
+import logging
+from urllib.parse import quote
+
+from typing import Any, Awaitable, Callable, Dict, List, MutableMapping, Tuple, Type
+
+from venom.exceptions import Error, ErrorResponse, MethodNotAllowed, NotFound, ServerError
+from venom.protocol import JSONProtocol, Protocol
+from venom.rpc import RequestContext
+from venom.rpc.comms.binding import HTTPBinding, add_http_routes
+from venom.rpc.dispatch import DispatchEntry
+from venom.rpc.routing import Router
+
+logger = logging.getLogger(__name__)
+
+Scope = MutableMapping[str, Any]
+Receive = Callable[[], Awaitable[Dict[str, Any]]]
+Send = Callable[[Dict[str, Any]], Awaitable[None]]
+
+_Headers = List[Tuple[bytes, bytes]]
+
+
+class ASGIRequestContext(RequestContext):
+    scope: Scope
+
+    def __init__(self, scope: Scope):
+        self.scope = scope
+
+
+async def _read_body(receive: Receive) -> bytes:
+    message = await receive()
+    body = message.get('body', b'')
+    if not message.get('more_body', False):
+        return body
+
+    chunks = [body]
+    while message.get('more_body', False):
+        message = await receive()
+        chunks.append(message.get('body', b''))
+    return b''.join(chunks)
+
+
+async def _respond(send: Send, status: int, headers: _Headers, body: bytes) -> None:
+    await send({'type': 'http.response.start',
+                'status': status,
+                'headers': headers + [(b'content-length', str(len(body)).encode('latin-1'))]})
+    await send({'type': 'http.response.body', 'body': body})
+
+
+def _route_handler(venom: 'venom.rpc.Venom', entry: DispatchEntry, protocol_factory: Type[Protocol]):
+    method = entry.method
+    binding = HTTPBinding.get(method, protocol_factory)
+    http_status = method.http_status
+    headers = [(b'content-type', binding.response.mime.encode('latin-1'))]
+
+    async def handler(scope: Scope, receive: Receive, send: Send, path_parameters: Dict[str, Any]) -> None:
+        body = await binding.invoke(venom,
+                                    await _read_body(receive),
+                                    scope.get('query_string', b'').decode('latin-1'),
+                                    path_parameters,
+                                    ASGIRequestContext(scope))
+        await _respond(send, http_status, headers, body)
+
+    return handler
+
+
+async def _lifespan(venom: 'venom.rpc.Venom', receive: Receive, send: Send) -> None:
+    while True:
+        message = await receive()
+        if message['type'] == 'lifespan.startup':
+            await send({'type': 'lifespan.startup.complete'})
+        elif message['type'] == 'lifespan.shutdown':
+            await venom.close()
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
+
+
+def create_asgi_app(venom: 'venom.rpc.Venom',
+                    protocol_factory: Type[Protocol] = JSONProtocol,
+                    *,
+                    warm: bool = False) -> Callable[[Scope, Receive, Send], Awaitable[None]]:
+    """
+    :param warm: when ``True``, the Venom is frozen with :meth:`venom.rpc.Venom.freeze` before the app is created.
+    :returns: an ASGI 3 application serving all methods of the Venom.
+    """
+    router = Router()
+    add_http_routes(venom, protocol_factory, router.add, lambda entry: _route_handler(venom, entry, protocol_factory),
+                    warm=warm)
+
+    rpc_error_response = protocol_factory(ErrorResponse)
+    error_headers = [(b'content-type', rpc_error_response.mime.encode('latin-1'))]
+
+    async def app(scope: Scope, receive: Receive, send: Send) -> None:
+        if scope['type'] == 'lifespan':
+            return await _lifespan(venom, receive, send)
+
+        if scope['type'] != 'http':
+            raise ValueError(f"Unsupported ASGI scope type '{scope['type']}'")
+
+        raw_path = scope.get('raw_path')
+        path = raw_path.decode('latin-1') if raw_path else quote(scope['path'])
+        headers = error_headers
+
+        try:
+            match = router.match(scope['method'], path)
+            if match is None:
+                allowed = router.allowed_verbs(path)
+                if allowed:
+                    allow = ', '.join(sorted(verb.value for verb in allowed))
+                    headers = headers + [(b'allow', allow.encode('latin-1'))]
+                    raise MethodNotAllowed()
+                raise NotFound()
+
+            handler, path_parameters = match
+            await handler(scope, receive, send, path_parameters)
+        except Error as e:
+            await _respond(send, e.http_status, headers, rpc_error_response.pack(e.format()))
+        except Exception:
+            logger.exception('Unhandled exception in %s %s', scope['method'], path)
+            await _respond(send, ServerError.http_status, headers, rpc_error_response.pack(ServerError().format()))
+
+    return app
@@ -0,0 +1,298 @@
+"""
+Client-side load balancing across several endpoints of the same service.
+
+A :class:`Balancer` keeps track of a set of :class:`Endpoint` instances, either a fixed list or one obtained from a
+resolver callback, and picks one for each call using a :class:`Policy`. Endpoints that fail repeatedly are ejected for
+a while; once the ejection expires they are reintroduced gradually, receiving a growing share of calls over
+``ramp_up`` seconds.
+
+Methods that declare a ``routing_key`` option, naming a field of their request message, are routed with a
+:class:`HashRing` instead, so that calls with the same key go to the same endpoint for as long as it is available::
+
+    @http.GET('./users/{user_id}', routing_key='user_id')
+    def get_user(self, request: UserRequest) -> User:
+        raise NotImplementedError
+"""
+import hashlib
+import random
+import time
+from abc import ABC, abstractmethod
+from bisect import bisect
+
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Union
+
+from venom.message import Message
+
+
+class Endpoint(object):
+    """
+    An endpoint with its load and health statistics.
+
+    :ivar outstanding: the number of calls currently in flight.
+    :ivar latency: an exponentially weighted moving average of successful call latencies in seconds.
+    """
+
+    def __init__(self, url: str, *, decay: float = 0.3) -> None:
+        self.url = url
+        self.decay = decay
+        self.outstanding = 0
+        self.latency = 0.0
+        self.requests = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.ejections = 0
+        self.ejected_until = 0.0
+        self.reintroduced_at: Optional[float] = None
+
+    def ejected(self, now: float) -> bool:
+        return now < self.ejected_until
+
+    def weight(self, now: float, ramp_up: float) -> float:
+        """
+        :returns: the share of calls the endpoint should receive, between 0 and 1, growing linearly after
+            reintroduction.
+        """
+        if self.reintroduced_at is None or ramp_up <= 0:
+            return 1.0
+        return min(1.0, max(0.05, (now - self.reintroduced_at) / ramp_up))
+
+    def record_success(self, latency: float) -> None:
+        self.requests += 1
+        self.consecutive_failures = 0
+        if self.latency == 0.0:
+            self.latency = latency
+        else:
+            self.latency += self.decay * (latency - self.latency)
+
+    def record_failure(self) -> None:
+        self.requests += 1
+        self.failures += 1
+        self.consecutive_failures += 1
+
+    def __repr__(self):
+        return f'<Endpoint {self.url} outstanding={self.outstanding} latency={self.latency:.4f}>'
+
+
+class Policy(ABC):
+    @abstractmethod
+    def choose(self, endpoints: Sequence[Endpoint]) -> Endpoint:
+        """
+        :param endpoints: a non-empty sequence of candidates.
+        """
+        raise NotImplementedError
+
+
+class RoundRobin(Policy):
+    def __init__(self) -> None:
+        self._next = 0
+
+    def choose(self, endpoints: Sequence[Endpoint]) -> Endpoint:
+        index = self._next % len(endpoints)
+        self._next = index + 1
+        return endpoints[index]
+
+
+class LeastOutstanding(Policy):
+    """
+    Chooses the endpoint with the fewest calls in flight, preferring the earlier one on a tie.
+    """
+
+    def choose(self, endpoints: Sequence[Endpoint]) -> Endpoint:
+        return min(endpoints, key=lambda endpoint: endpoint.outstanding)
+
+
+class PowerOfTwoChoices(Policy):
+    """
+    Picks two endpoints at random and chooses the one with the lower expected cost, estimated as the observed latency
+    scaled by the number of calls in flight.
+    """
+
+    def __init__(self, random_: random.Random = None) -> None:
+        self._random = random_ or random.Random()
+
+    @staticmethod
+    def cost(endpoint: Endpoint) -> float:
+        return endpoint.latency * (endpoint.outstanding + 1)
+
+    def choose(self, endpoints: Sequence[Endpoint]) -> Endpoint:
+        if len(endpoints) == 1:
+            return endpoints[0]
+        a, b = self._random.sample(endpoints, 2)
+        return a if self.cost(a) <= self.cost(b) else b
+
+
+class HashRing(object):
+    """
+    A consistent-hash ring. Each node is placed on the ring ``replicas`` times; a key belongs to the first node
+    following its hash. Adding or removing a node only moves the keys of that node.
+    """
+
+    def __init__(self, nodes: Iterable[str] = (), *, replicas: int = 100) -> None:
+        self.replicas = replicas
+        self._nodes = set()
+        self._hashes: List[int] = []
+        self._owners: Dict[int, str] = {}
+
+        for node in nodes:
+            self.add(node)
+
+    @staticmethod
+    def hash(key: str) -> int:
+        return int.from_bytes(hashlib.md5(key.encode('utf-8')).digest()[:8], 'big')
+
+    @property
+    def nodes(self) -> frozenset:
+        return frozenset(self._nodes)
+
+    def add(self, node: str) -> None:
+        if node in self._nodes:
+            return
+        self._nodes.add(node)
+        for replica in range(self.replicas):
+            self._owners[self.hash(f'{node}#{replica}')] = node
+        self._hashes = sorted(self._owners)
+
+    def remove(self, node: str) -> None:
+        if node not in self._nodes:
+            return
+        self._nodes.remove(node)
+        for replica in range(self.replicas):
+            self._owners.pop(self.hash(f'{node}#{replica}'), None)
+        self._hashes = sorted(self._owners)
+
+    def update(self, nodes: Iterable[str]) -> None:
+        nodes = set(nodes)
+        for node in self._nodes - nodes:
+            self.remove(node)
+        for node in nodes - self._nodes:
+            self.add(node)
+
+    def get(self, key: str) -> str:
+        if not self._hashes:
+            raise KeyError(key)
+        index = bisect(self._hashes, self.hash(key)) % len(self._hashes)
+        return self._owners[self._hashes[index]]
+
+    def __len__(self):
+        return len(self._nodes)
+
+
+def routing_key(method: 'venom.rpc.method.Method') -> Optional[Callable[[Message], str]]:
+    """
+    :returns: a function returning the routing key of a request to the method, or ``None`` if the method has no
+        ``routing_key`` option.
+    :raises ValueError: if the routing key is not a field of the request message.
+    """
+    name = method.options.get('routing_key')
+    if name is None:
+        return None
+
+    if name not in method.request.__fields__:
+        raise ValueError(f"Routing key '{name}' of {method.name} is not a field of {method.request.__name__}")
+
+    def get_key(request: Message) -> str:
+        return str(request.get(name))
+
+    return get_key
+
+
+class Balancer(object):
+    """
+    :param endpoints: a list of endpoint URLs, or a callback returning one. The callback is called again at most every
+        ``resolve_interval`` seconds; endpoints that it keeps returning retain their statistics.
+    :param policy: defaults to :class:`RoundRobin`.
+    :param max_failures: the number of consecutive failures after which an endpoint is ejected.
+    :param ejection_time: the number of seconds an endpoint stays ejected on its first ejection; the time doubles with
+        each subsequent ejection, up to ``max_ejection_time``.
+    :param ramp_up: the number of seconds over which a reintroduced endpoint returns to its full share of calls.
+    """
+
+    def __init__(self,
+                 endpoints: Union[Sequence[str], Callable[[], Sequence[str]]],
+                 policy: Policy = None,
+                 *,
+                 max_failures: int = 3,
+                 ejection_time: float = 10.0,
+                 max_ejection_time: float = 300.0,
+                 ramp_up: float = 30.0,
+                 resolve_interval: float = 30.0,
+                 clock: Callable[[], float] = time.monotonic,
+                 random_: random.Random = None) -> None:
+        self.policy = policy or RoundRobin()
+        self.max_failures = max_failures
+        self.ejection_time = ejection_time
+        self.max_ejection_time = max_ejection_time
+        self.ramp_up = ramp_up
+        self.resolve_interval = resolve_interval
+        self._clock = clock
+        self._random = random_ or random.Random()
+        self._endpoints: Dict[str, Endpoint] = {}
+        self._resolved_at: Optional[float] = None
+        self._ring = HashRing()
+
+        if callable(endpoints):
+            self._resolver = endpoints
+        else:
+            self._resolver = None
+            self._update(endpoints)
+
+    def _update(self, urls: Sequence[str]) -> None:
+        self._endpoints = {url: self._endpoints.get(url) or Endpoint(url) for url in urls}
+
+    @property
+    def endpoints(self) -> List[Endpoint]:
+        if self._resolver is not None:
+            now = self._clock()
+            if self._resolved_at is None or now - self._resolved_at >= self.resolve_interval:
+                self._update(self._resolver())
+                self._resolved_at = now
+        return list(self._endpoints.values())
+
+    def choose(self, key: str = None) -> Endpoint:
+        """
+        Chooses an endpoint among those that are not ejected. Reintroduced endpoints are skipped at random according to
+        their weight. When every endpoint is ejected, all of them are considered, so that calls still go somewhere.
+
+        :param key: when given, the endpoint is chosen from a consistent-hash ring of the endpoints that are not
+            ejected instead of by the policy.
+        """
+        endpoints = self.endpoints
+        if not endpoints:
+            raise RuntimeError('No endpoints available')
+
+        now = self._clock()
+
+        if key is not None:
+            available = {endpoint.url for endpoint in endpoints if not endpoint.ejected(now)}
+            self._ring.update(available or (endpoint.url for endpoint in endpoints))
+            return self._endpoints[self._ring.get(key)]
+
+        candidates = [endpoint for endpoint in endpoints
+                      if not endpoint.ejected(now) and self._random.random() < endpoint.weight(now, self.ramp_up)]
+
+        if not candidates:
+            candidates = [endpoint for endpoint in endpoints if not endpoint.ejected(now)] or endpoints
+        return self.policy.choose(candidates)
+
+    def started(self, endpoint: Endpoint) -> float:
+        endpoint.outstanding += 1
+        return self._clock()
+
+    def succeeded(self, endpoint: Endpoint, started: float) -> None:
+        endpoint.outstanding -= 1
+        endpoint.record_success(self._clock() - started)
+
+    def cancelled(self, endpoint: Endpoint) -> None:
+        endpoint.outstanding -= 1
+
+    def failed(self, endpoint: Endpoint) -> None:
+        endpoint.outstanding -= 1
+        endpoint.record_failure()
+
+        if endpoint.consecutive_failures >= self.max_failures:
+            now = self._clock()
+            duration = min(self.max_ejection_time, self.ejection_time * 2 ** endpoint.ejections)
+            endpoint.ejections += 1
+            endpoint.consecutive_failures = 0
+            endpoint.ejected_until = now + duration
+            endpoint.reintroduced_at = now + duration
@@ -0,0 +1,147 @@
+from urllib.parse import quote, parse_qsl
+from weakref import WeakKeyDictionary
+
+from typing import Type, FrozenSet, Dict, Tuple, Any, Mapping, Optional, Callable
+
+from venom.common import FieldMask
+from venom.message import Message
+from venom.protocol import Protocol, URIStringProtocol, URIStringDictMessageTranscoder
+from venom.rpc.dispatch import DispatchEntry
+from venom.rpc.method import Method, HTTPVerb, HTTPFieldLocation
+
+
+def add_http_routes(venom: 'venom.rpc.Venom',
+                    protocol_factory: Type[Protocol],
+                    add_route: Callable[[Method, Any], Any],
+                    handler_factory: Callable[[DispatchEntry], Any],
+                    *,
+                    warm: bool = False) -> None:
+    """
+    Adds a route to an HTTP server for every method of a Venom, except for streaming methods, which are only
+    available over gRPC.
+
+    :param add_route: called with each method and its handler, e.g. :meth:`venom.rpc.routing.Router.add`.
+    :param handler_factory: called with the dispatch entry of each method to create its handler.
+    :param warm: when ``True``, the Venom is frozen with :meth:`venom.rpc.Venom.freeze` for ``protocol_factory`` first.
+    """
+    if warm:
+        venom.freeze(protocols=(protocol_factory,))
+
+    for entry in venom.dispatch_table:
+        if not (entry.method.client_streaming or entry.method.server_streaming):
+            add_route(entry.method, handler_factory(entry))
+
+
+def parse_query_string(query_string: str) -> Dict[str, str]:
+    """
+    :returns: the first value of each parameter in a URL query string.
+    """
+    query = {}
+    for name, value in parse_qsl(query_string, keep_blank_values=True):
+        query.setdefault(name, value)
+    return query
+
+
+class HTTPBinding(object):
+    """
+    Immutable plan for mapping the request message of a :class:`Method` onto an HTTP request and back.
+
+    A binding is computed once per method and protocol factory and then shared by HTTP clients and servers, so that
+    only the actual encoding and decoding of values happens for each request.
+    """
+    __slots__ = ('method',
+                 'http_verb',
+                 'http_path',
+                 'path_template',
+                 'path_fields',
+                 'query_fields',
+                 'body_fields',
+                 'path',
+                 'query',
+                 'body',
+                 'response',
+                 'request_headers')
+
+    __bindings: Mapping[Method, Dict[Type[Protocol], 'HTTPBinding']] = WeakKeyDictionary()
+
+    method: Method
+    http_verb: HTTPVerb
+    http_path: str
+    path_template: str
+    path_fields: FrozenSet[str]
+    query_fields: FrozenSet[str]
+    body_fields: FrozenSet[str]
+    path: URIStringDictMessageTranscoder
+    query: URIStringDictMessageTranscoder
+    body: Protocol
+    response: Protocol
+    request_headers: Optional[Dict[str, str]]
+
+    def __init__(self, method: Method, protocol_factory: Type[Protocol]) -> None:
+        locations = method.http_field_locations()
+
+        self.method = method
+        self.http_verb = method.http_method
+        self.http_path = method.http_path
+        self.path_template = method.format_http_path(json_names=True)
+        self.path_fields = frozenset(locations[HTTPFieldLocation.PATH])
+        self.query_fields = frozenset(locations[HTTPFieldLocation.QUERY])
+        self.body_fields = frozenset(locations[HTTPFieldLocation.BODY])
+
+        self.path = URIStringDictMessageTranscoder(URIStringProtocol, method.request, FieldMask(self.path_fields))
+        self.query = URIStringDictMessageTranscoder(URIStringProtocol, method.request, FieldMask(self.query_fields))
+        self.body = protocol_factory(method.request, FieldMask(self.body_fields))
+        self.response = protocol_factory(method.response)
+
+        if method.http_method in (HTTPVerb.POST, HTTPVerb.PUT, HTTPVerb.PATCH):
+            self.request_headers = {'content-type': protocol_factory.mime}
+        else:
+            self.request_headers = None
+
+    @classmethod
+    def get(cls, method: Method, protocol_factory: Type[Protocol]) -> 'HTTPBinding':
+        try:
+            bindings = cls.__bindings[method]
+        except KeyError:
+            cls.__bindings[method] = bindings = {}
+
+        try:
+            return bindings[protocol_factory]
+        except KeyError:
+            bindings[protocol_factory] = binding = cls(method, protocol_factory)
+            return binding
+
+    def format_path(self, request: Message) -> str:
+        if not self.path_fields:
+            return self.http_path
+        values = self.path.encode(request)
+        return self.path_template.format_map({name: quote(value, safe='') for name, value in values.items()})
+
+    def encode_request(self, request: Message) -> Tuple[str, Dict[str, Any], bytes]:
+        """
+        :returns: a ``(path, query, body)`` tuple
+        """
+        return self.format_path(request), self.query.encode(request), self.body.pack(request)
+
+    def decode_request(self, body: bytes, query: Mapping[str, Any], path: Mapping[str, Any]) -> Message:
+        request = self.body.unpack(body)
+        if self.query_fields:
+            self.query.decode(query, request)
+        if self.path_fields:
+            self.path.decode(path, request)
+        return request
+
+    async def invoke(self,
+                     venom: 'venom.rpc.Venom',
+                     body: bytes,
+                     query_string: str,
+                     path: Mapping[str, Any],
+                     context: 'venom.rpc.RequestContext') -> bytes:
+        """
+        Decodes a request received by an HTTP server, invokes the method with it and encodes the response.
+
+        :returns: the encoded response body.
+        """
+        request = self.decode_request(body, parse_query_string(query_string) if self.query_fields else {}, path)
+        response = await venom.invoke(self.method, request, context=context)
+        return self.response.pack(response)
@@ -0,0 +1,165 @@
+"""
+HTTP caching of ``GET`` methods.
+
+Servers created with :func:`venom.rpc.comms.aiohttp.create_app` send a strong ``ETag`` with every response to a
+``GET`` method and answer a matching ``If-None-Match`` with ``304 Not Modified``. The ETag is a hash of the packed
+response, or, when the method names a version hook with the ``etag`` option, the version that the hook returns for the
+request --- which lets the server skip the method entirely when the client is up to date::
+
+    class CatalogService(Service):
+        @http.GET('./items/{id}', etag='item_version', max_age=60)
+        def get_item(self, request: ItemRequest) -> Item:
+            ...
+
+        def item_version(self, request: ItemRequest) -> str:
+            return self.db.version_of(request.id)
+
+``max_age`` (or ``cache_control``, for any other ``Cache-Control`` value) sets the ``Cache-Control`` header;
+``etag=False`` turns ETags off.
+
+A :class:`ResponseCache` given to :class:`venom.rpc.comms.aiohttp.HTTPClient` keeps responses in memory, serves them
+while they are fresh and revalidates them with ``If-None-Match`` afterwards.
+"""
+import hashlib
+import time
+from collections import OrderedDict
+
+from typing import Any, Callable, Mapping, NamedTuple, Optional
+
+
+def compute_etag(body: bytes) -> str:
+    return '"{}"'.format(hashlib.blake2b(body, digest_size=16).hexdigest())
+
+
+def version_etag(version) -> str:
+    return '"v{}"'.format(str(version).replace('"', ''))
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    :returns: whether an ``If-None-Match`` header matches the ETag, using weak comparison.
+    """
+    if not if_none_match:
+        return False
+
+    if if_none_match.strip() == '*':
+        return True
+
+    for tag in if_none_match.split(','):
+        tag = tag.strip()
+        if tag.startswith('W/'):
+            tag = tag[2:]
+        if tag == etag:
+            return True
+    return False
+
+
+def cache_control(options: dict) -> Optional[str]:
+    """
+    :returns: the ``Cache-Control`` header for the method options ``cache_control`` or ``max_age``, if any.
+    """
+    if options.get('cache_control'):
+        return options['cache_control']
+    if options.get('max_age') is not None:
+        return f"max-age={int(options['max_age'])}"
+    return None
+
+
+class CacheDirectives(NamedTuple):
+    no_store: bool
+    no_cache: bool
+    max_age: Optional[int]
+
+    @classmethod
+    def parse(cls, header: Optional[str]) -> 'CacheDirectives':
+        no_store = no_cache = False
+        max_age = None
+
+        for directive in (header or '').split(','):
+            name, _, value = directive.strip().partition('=')
+            name = name.lower()
+            if name == 'no-store':
+                no_store = True
+            elif name == 'no-cache':
+                no_cache = True
+            elif name == 'max-age':
+                try:
+                    max_age = int(value.strip('"'))
+                except ValueError:
+                    pass
+        return cls(no_store, no_cache, max_age)
+
+
+class CacheEntry(object):
+    __slots__ = ('body', 'etag', 'expires')
+
+    def __init__(self, body: bytes, etag: Optional[str], expires: float) -> None:
+        self.body = body
+        self.etag = etag
+        self.expires = expires
+
+
+class ResponseCache(object):
+    """
+    An in-memory cache of response bodies with least-recently-used eviction.
+
+    Responses are stored when they carry an ``ETag`` or a ``max-age``, unless they are marked ``no-store``. They are
+    served from the cache while fresh; once stale, the client revalidates them with the stored ETag.
+
+    Responses are keyed by path and query, so that they are shared between the endpoints of a balanced client. Only
+    share a cache between clients that call the same deployment of a service.
+
+    :param max_entries: the number of responses to keep.
+    """
+
+    def __init__(self, max_entries: int = 1024, *, clock: Callable[[], float] = time.monotonic) -> None:
+        self.max_entries = max_entries
+        self.hits = 0
+        self.revalidations = 0
+        self.misses = 0
+        self._clock = clock
+        self._entries: 'OrderedDict[str, CacheEntry]' = OrderedDict()
+
+    @staticmethod
+    def key(path: str, params: Mapping[str, Any]) -> str:
+        """
+        :returns: the key of a response by its path, relative to the base URL, and query parameters.
+        """
+        if not params:
+            return path
+        return path + '?' + '&'.join(f'{name}={value}' for name, value in sorted(params.items()))
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        try:
+            entry = self._entries[key]
+        except KeyError:
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def fresh(self, entry: CacheEntry) -> bool:
+        return self._clock() < entry.expires
+
+    def store(self, key: str, body: bytes, etag: Optional[str], cache_control: Optional[str]) -> None:
+        directives = CacheDirectives.parse(cache_control)
+        if directives.no_store or (etag is None and not directives.max_age):
+            self._entries.pop(key, None)
+            return
+
+        max_age = 0 if directives.no_cache else directives.max_age or 0
+        self._entries[key] = CacheEntry(body, etag, self._clock() + max_age)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def refresh(self, entry: CacheEntry, cache_control: Optional[str]) -> None:
+        directives = CacheDirectives.parse(cache_control)
+        max_age = 0 if directives.no_cache else directives.max_age or 0
+        entry.expires = self._clock() + max_age
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
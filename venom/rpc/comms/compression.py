@@ -0,0 +1,83 @@
+"""
+Compression of HTTP request and response bodies with ``gzip`` or ``deflate``.
+
+Servers created with :func:`venom.rpc.comms.aiohttp.create_app` compress responses of at least
+``compression_threshold`` bytes with the best encoding the client accepts in its ``Accept-Encoding`` header.
+:class:`venom.rpc.comms.aiohttp.HTTPClient` can compress request bodies in the same way. The threshold and the zlib
+compression level can be set per method, e.g. to skip the CPU cost for a method whose responses compress badly::
+
+    class CatalogService(Service):
+        @http.GET('./items', compression_threshold=16 * 1024, compression_level=1)
+        def list_items(self) -> ItemList:
+            ...
+
+A ``compression_threshold`` of ``None`` turns compression off.
+"""
+import zlib
+
+from typing import NamedTuple, Optional
+
+ENCODINGS = ('gzip', 'deflate')
+
+_WBITS = {
+    'gzip': 16 + zlib.MAX_WBITS,
+    'deflate': zlib.MAX_WBITS
+}
+
+
+class Compression(NamedTuple):
+    """
+    :param threshold: the smallest body in bytes that is compressed, or ``None`` to never compress.
+    :param level: the zlib compression level, from 1 (fastest) to 9 (smallest).
+    """
+    threshold: Optional[int] = 1024
+    level: int = 6
+
+    def for_method(self, method: 'venom.rpc.method.Method') -> 'Compression':
+        """
+        :returns: the settings with the ``compression_threshold`` and ``compression_level`` options of the method.
+        """
+        options = method.options
+        return Compression(options.get('compression_threshold', self.threshold),
+                           options.get('compression_level', self.level))
+
+    def should_compress(self, body: bytes) -> bool:
+        return self.threshold is not None and len(body) >= self.threshold
+
+
+def negotiate(accept_encoding: Optional[str]) -> Optional[str]:
+    """
+    :returns: the supported encoding with the highest quality in an ``Accept-Encoding`` header, preferring ``gzip``
+        on ties, or ``None`` if the client accepts neither.
+    """
+    if not accept_encoding:
+        return None
+
+    qualities = {}
+    for item in accept_encoding.split(','):
+        coding, *params = item.strip().split(';')
+        quality = 1.0
+        for param in params:
+            name, _, value = param.strip().partition('=')
+            if name == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[coding.strip().lower()] = quality
+
+    best, best_quality = None, 0.0
+    for encoding in ENCODINGS:
+        quality = qualities.get(encoding, qualities.get('*', 0.0))
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def compress(body: bytes, encoding: str, level: int = 6) -> bytes:
+    compressor = zlib.compressobj(level, zlib.DEFLATED, _WBITS[encoding])
+    return compressor.compress(body) + compressor.flush()
+
+
+def decompress(body: bytes, encoding: str) -> bytes:
+    return zlib.decompress(body, _WBITS[encoding])
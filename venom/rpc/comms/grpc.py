@@ -1,108 +1,268 @@
 import asyncio
-from functools import partial
-from threading import Thread
+from collections import defaultdict
 
-from typing import Type
+from typing import Type, Dict, Sequence, Tuple, Any, List, AsyncIterator, Optional
 
+from venom.exceptions import Error, BadRequest, Unauthorized, Forbidden, NotFound, Conflict, NotImplemented_, \
+    ServerError, ServiceUnavailable
 from venom.protocol import Protocol, JSONProtocol
+from venom.rpc import RequestContext
 from venom.rpc.comms import AbstractClient
+from venom.rpc.comms.balancing import HashRing, routing_key
+from venom.rpc.dispatch import DispatchEntry
+from venom.rpc.method import Method
 
 try:
-    from grpc.beta import implementations
-    from grpc.framework.interfaces.face import utilities
+    import grpc
+    from grpc import aio
 except ImportError:
     raise RuntimeError("You must install the 'grpcio' package to use the GRPC features of Venom RPC")
 
+_STATUS_CODES = {
+    400: grpc.StatusCode.INVALID_ARGUMENT,
+    401: grpc.StatusCode.UNAUTHENTICATED,
+    403: grpc.StatusCode.PERMISSION_DENIED,
+    404: grpc.StatusCode.NOT_FOUND,
+    409: grpc.StatusCode.ABORTED,
+    429: grpc.StatusCode.RESOURCE_EXHAUSTED,
+    501: grpc.StatusCode.UNIMPLEMENTED,
+    503: grpc.StatusCode.UNAVAILABLE,
+    504: grpc.StatusCode.DEADLINE_EXCEEDED,
+}
+
+_ERRORS = {
+    grpc.StatusCode.INVALID_ARGUMENT: BadRequest,
+    grpc.StatusCode.UNAUTHENTICATED: Unauthorized,
+    grpc.StatusCode.PERMISSION_DENIED: Forbidden,
+    grpc.StatusCode.NOT_FOUND: NotFound,
+    grpc.StatusCode.ABORTED: Conflict,
+    grpc.StatusCode.UNIMPLEMENTED: NotImplemented_,
+    grpc.StatusCode.UNAVAILABLE: ServiceUnavailable,
+}
+
+
+def grpc_method_name(service_name: str, method_name: str) -> str:
+    return f'/{service_name}/{method_name}'
+
+
+class GRPCRequestContext(RequestContext):
+    context: 'grpc.aio.ServicerContext'
+
+    def __init__(self, context: 'grpc.aio.ServicerContext'):
+        self.context = context
+
+
+def _rpc_method_handler(venom: 'venom.rpc.Venom', entry: DispatchEntry, protocol_factory: Type[Protocol]):
+    method = entry.method
+    request_protocol, response_protocol = entry.protocols(protocol_factory)
+
+    async def abort(context, error: Error):
+        await context.abort(_STATUS_CODES.get(error.http_status, grpc.StatusCode.INTERNAL), error.description)
+
+    if method.server_streaming:
+        async def handler(request, context):
+            responses = await venom.invoke(method, request, context=GRPCRequestContext(context))
+            try:
+                async for response in responses:
+                    yield response
+            except Error as e:
+                await abort(context, e)
+            finally:
+                # stops the method and releases its service instance when the call ends early
+                await responses.aclose()
+    else:
+        async def handler(request, context):
+            try:
+                return await venom.invoke(method, request, context=GRPCRequestContext(context))
+            except Error as e:
+                await abort(context, e)
+
+    if method.client_streaming and method.server_streaming:
+        handler_factory = grpc.stream_stream_rpc_method_handler
+    elif method.client_streaming:
+        handler_factory = grpc.stream_unary_rpc_method_handler
+    elif method.server_streaming:
+        handler_factory = grpc.unary_stream_rpc_method_handler
+    else:
+        handler_factory = grpc.unary_unary_rpc_method_handler
+
+    return handler_factory(handler,
+                           request_deserializer=request_protocol.unpack,
+                           response_serializer=response_protocol.pack)
 
-# TODO WARNING: GRPC Core is not asynchronous (as of October 2016). Therefore all calls made to the server are blocking.
 
 def create_server(venom: 'venom.rpc.Venom',
                   *,
                   protocol_factory: Type[Protocol] = JSONProtocol,
-                  pool=None,
-                  pool_size=None,
-                  default_timeout=None,
-                  maximum_timeout=None,
-                  loop=None):
-    if loop is None:
-        loop = asyncio.new_event_loop()
-
-    request_deserializers = {}
-    response_serializers = {}
-    method_implementations = {}
-
-    def grpc_unary_unary(rpc, venom, service, request, context, *, loop):
-        instance = venom.get_instance(service)
-        future = asyncio.run_coroutine_threadsafe(rpc.invoke(instance, request), loop)
-        # TODO use context.timeout
-        return future.result()
-
-    for service, rpc in venom.iter_methods():
-        grpc_name = (service.__meta__.name, rpc.name)
-        request_deserializers[grpc_name] = protocol_factory(rpc.request).unpack
-        response_serializers[grpc_name] = protocol_factory(rpc.response).pack
-        method_implementations[grpc_name] = utilities.unary_unary_inline(partial(grpc_unary_unary,
-                                                                                 rpc,
-                                                                                 venom,
-                                                                                 service,
-                                                                                 loop=loop))
-
-    server_options = implementations.server_options(request_deserializers=request_deserializers,
-                                                    response_serializers=response_serializers,
-                                                    thread_pool=pool, thread_pool_size=pool_size,
-                                                    default_timeout=default_timeout,
-                                                    maximum_timeout=maximum_timeout)
-
-    def event_loop_runner(loop):
-        asyncio.set_event_loop(loop)
-        loop.run_forever()
-
-    t = Thread(target=event_loop_runner, args=(loop,))
-    t.daemon = True
-    t.start()
-
-    return implementations.server(method_implementations, options=server_options)
+                  server: 'grpc.aio.Server' = None,
+                  **server_kwargs) -> 'grpc.aio.Server':
+    """
+    Creates a :class:`grpc.aio.Server` (or adds to the given one) with a generic handler for every service in the
+    Venom. Calls are made on the event loop the server runs on; ports still need to be added before the server is
+    started::
+
+        server = create_server(venom)
+        server.add_insecure_port('[::]:50051')
+        await server.start()
+
+    Methods are named ``/{service name}/{method name}``. Methods that take an async iterator of requests are
+    client-streaming and methods that are async generators (or return an async iterator) are server-streaming; methods
+    that do both are bidirectional.
+
+    :param server_kwargs: keyword arguments for :func:`grpc.aio.server` when no ``server`` is given.
+    """
+    if server is None:
+        server = aio.server(**server_kwargs)
+
+    handlers = defaultdict(dict)
+    for entry in venom.dispatch_table:
+        handlers[entry.service.__meta__.name][entry.method.name] = _rpc_method_handler(venom, entry, protocol_factory)
+
+    server.add_generic_rpc_handlers(tuple(grpc.method_handlers_generic_handler(service_name, method_handlers)
+                                          for service_name, method_handlers in handlers.items()))
+    return server
 
 
 class Client(AbstractClient):
-    def __init__(self, stub: Type['venom.rpc.Service'], host=None, port=50051, *,
-                 protocol_factory: Type[Protocol] = None):
+    """
+    A client for a Venom served with :func:`create_server`.
+
+    Calls are distributed round-robin over a pool of ``channels`` channels, each with its own HTTP/2 connection, so
+    that the stream limit and flow-control window of a single connection do not cap throughput. Channels are opened on
+    first use, on the event loop of the first call.
+
+    Given several ``endpoints``, every endpoint gets its own pool and calls are distributed over all of them. Calls to
+    methods with a ``routing_key`` option go to the endpoint chosen by consistent hashing of that request field.
+
+    Server-streaming methods return an async iterator of responses; client-streaming methods take an async iterator or
+    an iterable of requests.
+
+    :param endpoints: ``'host:port'`` targets to use instead of ``host`` and ``port``.
+    :param channels: the number of channels in the pool of each endpoint.
+    :param channel_options: options passed to :func:`grpc.aio.insecure_channel` or :func:`grpc.aio.secure_channel`.
+    :param credentials: channel credentials for a secure channel; an insecure channel is used otherwise.
+    """
+
+    def __init__(self,
+                 stub: Type['venom.rpc.Service'],
+                 host: str = None,
+                 port: int = 50051,
+                 *,
+                 endpoints: Sequence[str] = None,
+                 protocol_factory: Type[Protocol] = None,
+                 credentials: 'grpc.ChannelCredentials' = None,
+                 channel_options: Sequence[Tuple[str, Any]] = None,
+                 channels: int = 1):
         super().__init__(stub, protocol_factory=protocol_factory)
-        channel = implementations.insecure_channel(host, port)
-        self._group = stub.__meta__.name
-        self._grpc_stub = self._create_grpc_stub(stub, channel)
 
-    def _create_grpc_stub(self, stub, channel, host=None, metadata_transformer=None, pool=None, pool_size=None):
-        request_serializers = {}
-        response_deserializers = {}
+        if channels < 1:
+            raise ValueError('A client needs at least one channel')
+
+        self._targets = list(endpoints or [f'{host or "localhost"}:{port}'])
+        self._credentials = credentials
+        self._channel_options = list(channel_options or ())
+        self._pool_size = channels
+        self._channels: List[Optional['grpc.aio.Channel']] = [None] * (len(self._targets) * channels)
+        self._callables: List[Dict[str, Any]] = [{} for _ in self._channels]
+        self._next_channel = 0
+        self._next_slot = [0] * len(self._targets)
+        self._ring = HashRing(self._targets)
+        self._routing_keys = {method.name: routing_key(method) for method in self._eager_methods()}
+
+    def _create_channel(self, target: str) -> 'grpc.aio.Channel':
+        options = self._channel_options
+        if self._pool_size > 1:
+            # without a local subchannel pool, channels to the same target would share one connection
+            options = options + [('grpc.use_local_subchannel_pool', 1)]
+
+        if self._credentials is not None:
+            return aio.secure_channel(target, self._credentials, options=options)
+        return aio.insecure_channel(target, options=options)
+
+    def _channel_index(self, key: str = None) -> int:
+        # channels are ordered slot by slot, so that consecutive indices alternate between endpoints
+        if key is None:
+            index = self._next_channel
+            self._next_channel = (index + 1) % len(self._channels)
+            return index
 
-        for rpc in stub.__methods__.values():
-            request_serializers[(self._group, rpc.name)] = self._protocol_factory(rpc.request).pack
-            response_deserializers[(self._group, rpc.name)] = self._protocol_factory(rpc.response).unpack
+        target = self._targets.index(self._ring.get(key))
+        slot = self._next_slot[target]
+        self._next_slot[target] = (slot + 1) % self._pool_size
+        return slot * len(self._targets) + target
 
-        stub_options = implementations.stub_options(host=host,
-                                                    metadata_transformer=metadata_transformer,
-                                                    request_serializers=request_serializers,
-                                                    response_deserializers=response_deserializers,
-                                                    thread_pool=pool,
-                                                    thread_pool_size=pool_size)
+    def _get_callable(self, method: Method, key: str = None):
+        index = self._channel_index(key)
 
-        return implementations.generic_stub(channel, stub_options)
+        channel = self._channels[index]
+        if channel is None:
+            self._channels[index] = channel = self._create_channel(self._targets[index % len(self._targets)])
+
+        callables = self._callables[index]
+        try:
+            return callables[method.name]
+        except KeyError:
+            pass
+
+        if method.client_streaming and method.server_streaming:
+            callable_factory = channel.stream_stream
+        elif method.client_streaming:
+            callable_factory = channel.stream_unary
+        elif method.server_streaming:
+            callable_factory = channel.unary_stream
+        else:
+            callable_factory = channel.unary_unary
+
+        callables[method.name] = callable_ = callable_factory(
+            grpc_method_name(self.stub.__meta__.name, method.name),
+            request_serializer=self._protocol_factory(method.request).pack,
+            response_deserializer=self._protocol_factory(method.response).unpack)
+        return callable_
+
+    @staticmethod
+    def _error(error: 'grpc.aio.AioRpcError') -> Error:
+        if error.code() in _ERRORS:
+            return _ERRORS[error.code()](error.details())
+        return ServerError(error.details())
+
+    async def _stream(self, call) -> AsyncIterator['venom.message.Message']:
+        try:
+            async for response in call:
+                yield response
+        except aio.AioRpcError as e:
+            raise self._error(e)
 
     async def invoke(self,
-                     rpc: 'venom.stub.RPC',
+                     method: Method,
                      request: 'venom.message.Message',
                      *,
                      context: 'venom.rpc.RequestContext' = None,
                      loop: asyncio.AbstractEventLoop = None,
                      timeout: int = None):
-        if loop is None:
-            loop = asyncio.get_event_loop()
+        try:
+            get_key = self._routing_keys[method.name]
+        except KeyError:
+            get_key = self._routing_keys[method.name] = routing_key(method)
+
+        key = None
+        if get_key is not None and not method.client_streaming:
+            key = get_key(request)
+
+        call = self._get_callable(method, key)(request, timeout=timeout)
+
+        if method.server_streaming:
+            return self._stream(call)
 
-        future = loop.run_in_executor(None, partial(self._grpc_stub.blocking_unary_unary,
-                                                    self._group,
-                                                    rpc.name,
-                                                    request,
-                                                    timeout=timeout))
+        try:
+            return await call
+        except aio.AioRpcError as e:
+            raise self._error(e)
 
-        return await future
+    async def close(self) -> None:
+        channels = self._channels
+        self._channels = [None] * len(channels)
+        self._callables = [{} for _ in channels]
+        self._next_channel = 0
+        for channel in channels:
+            if channel is not None:
+                await channel.close()
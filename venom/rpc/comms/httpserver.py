@@ -0,0 +1,425 @@
+"""
+A lean HTTP/1.1 server for a :class:`venom.rpc.Venom`, built directly on :class:`asyncio.Protocol`::
+
+    server = await create_server(venom, '0.0.0.0', 8080)
+
+Requests are routed and mapped onto messages with the same :class:`venom.rpc.routing.Router` and
+:class:`venom.rpc.comms.binding.HTTPBinding` as :func:`venom.rpc.comms.aiohttp.create_app`, and errors are returned
+as :class:`venom.exceptions.ErrorResponse` in the same way. Only the request line and the ``Content-Length``,
+``Content-Type``, ``Connection`` and ``Expect`` headers are parsed; there are no middlewares, and no request or
+header objects beyond what a handler needs.
+
+Connections are kept alive following HTTP/1.1 (or ``Connection: keep-alive`` with HTTP/1.0), and pipelined requests
+are answered one after another in the order they arrived. Chunked request bodies, response compression and ETags are
+not supported; use :func:`venom.rpc.comms.aiohttp.create_app` where those are needed.
+"""
+import asyncio
+import logging
+import time
+from collections import deque
+from email.utils import formatdate
+from http import HTTPStatus
+
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional, Tuple, Type
+
+from venom.exceptions import BadRequest, Error, ErrorResponse, HeadersTooLarge, MethodNotAllowed, NotFound, \
+    NotImplemented_, PayloadTooLarge, ServerError, UnsupportedMediaType
+from venom.protocol import JSONProtocol, Protocol
+from venom.rpc import RequestContext
+from venom.rpc.comms.binding import HTTPBinding, add_http_routes
+from venom.rpc.dispatch import DispatchEntry
+from venom.rpc.routing import Router
+
+logger = logging.getLogger(__name__)
+
+MAX_HEADER_SIZE = 8 * 1024
+MAX_BODY_SIZE = 1024 * 1024
+MAX_PIPELINED_REQUESTS = 32
+
+_STATUS_LINES = {status.value: f'HTTP/1.1 {status.value} {status.phrase}\r\n'.encode('latin-1')
+                 for status in HTTPStatus}
+
+_CONTINUE = b'HTTP/1.1 100 Continue\r\n\r\n'
+_CONNECTION_CLOSE = b'connection: close\r\n'
+_CONNECTION_KEEP_ALIVE = b'connection: keep-alive\r\n'
+
+
+class HTTPRequest(object):
+    """
+    The parts of an HTTP request a handler needs.
+    """
+    __slots__ = ('method', 'path', 'query_string', 'content_type', 'content_length', 'keep_alive', 'version', 'body',
+                 'error')
+
+    def __init__(self, method: str, path: str, query_string: str, content_type: Optional[str],
+                 content_length: int, keep_alive: bool, version: str = 'HTTP/1.1') -> None:
+        self.method = method
+        self.path = path
+        self.query_string = query_string
+        self.content_type = content_type
+        self.content_length = content_length
+        self.keep_alive = keep_alive
+        self.version = version
+        self.body = b''
+        self.error: Optional[Error] = None
+
+
+class HTTPRequestContext(RequestContext):
+    request: HTTPRequest
+
+    def __init__(self, request: HTTPRequest):
+        self.request = request
+
+
+_Handler = Callable[[HTTPRequest, Dict[str, Any]], Awaitable[Tuple[int, bytes, bytes]]]
+
+
+class _Date(object):
+    """
+    The value of the ``Date`` header, formatted at most once per second.
+    """
+
+    def __init__(self) -> None:
+        self._second = None
+        self._header = b''
+
+    def header(self) -> bytes:
+        second = int(time.time())
+        if second != self._second:
+            self._second = second
+            self._header = f'date: {formatdate(second, usegmt=True)}\r\n'.encode('latin-1')
+        return self._header
+
+
+def _status_line(status: int) -> bytes:
+    try:
+        return _STATUS_LINES[status]
+    except KeyError:
+        pass
+
+    # an Error may have any status; one that is not a valid status code is answered as a server error
+    if not 100 <= status <= 999:
+        return _STATUS_LINES[500]
+    return f'HTTP/1.1 {status} Unknown\r\n'.encode('latin-1')
+
+
+def _content_type_header(mime: str) -> bytes:
+    return f'content-type: {mime}\r\n'.encode('latin-1')
+
+
+def _parse_head(head: bytes, max_body_size: int) -> Tuple[HTTPRequest, bool]:
+    """
+    :returns: the request without its body, and whether the client expects a ``100 Continue`` before sending it.
+    """
+    lines = head.decode('latin-1').split('\r\n')
+
+    try:
+        method, target, version = lines[0].split(' ')
+    except ValueError:
+        raise BadRequest('Invalid request line')
+
+    if version == 'HTTP/1.1':
+        keep_alive = True
+    elif version == 'HTTP/1.0':
+        keep_alive = False
+    else:
+        raise NotImplemented_(f'Unsupported HTTP version {version!r}')
+
+    content_type = None
+    content_length = 0
+    expect_continue = False
+
+    for line in lines[1:]:
+        name, separator, value = line.partition(':')
+        if not separator:
+            raise BadRequest('Invalid header line')
+
+        name = name.strip().lower()
+        if name == 'content-length':
+            try:
+                content_length = int(value)
+            except ValueError:
+                raise BadRequest('Invalid Content-Length')
+            if content_length < 0:
+                raise BadRequest('Invalid Content-Length')
+        elif name == 'content-type':
+            content_type = value.strip()
+        elif name == 'connection':
+            tokens = {token.strip().lower() for token in value.split(',')}
+            if 'close' in tokens:
+                keep_alive = False
+            elif 'keep-alive' in tokens:
+                keep_alive = True
+        elif name == 'transfer-encoding':
+            raise NotImplemented_('Chunked request bodies are not supported')
+        elif name == 'expect':
+            expect_continue = value.strip().lower() == '100-continue'
+
+    if content_length > max_body_size:
+        raise PayloadTooLarge(f'Request bodies are limited to {max_body_size} bytes')
+
+    path, _, query_string = target.partition('?')
+    return HTTPRequest(method, path, query_string, content_type, content_length, keep_alive, version), expect_continue
+
+
+def _route_handler(venom: 'venom.rpc.Venom', entry: DispatchEntry, protocol_factory: Type[Protocol]) -> _Handler:
+    method = entry.method
+    binding = HTTPBinding.get(method, protocol_factory)
+    http_status = method.http_status
+    headers = _content_type_header(binding.response.mime)
+    mime = protocol_factory.mime
+
+    async def handler(http_request: HTTPRequest, path_parameters: Dict[str, Any]) -> Tuple[int, bytes, bytes]:
+        if http_request.body and http_request.content_type is not None \
+                and http_request.content_type.partition(';')[0].strip().lower() != mime:
+            raise UnsupportedMediaType(f'Expected a request body of type {mime}')
+
+        body = await binding.invoke(venom,
+                                    http_request.body,
+                                    http_request.query_string,
+                                    path_parameters,
+                                    HTTPRequestContext(http_request))
+        return http_status, headers, body
+
+    return handler
+
+
+class HTTPServerProtocol(asyncio.Protocol):
+    """
+    One HTTP/1.1 connection, with the requests that have been received but not yet answered.
+    """
+
+    def __init__(self,
+                 router: Router,
+                 protocol_factory: Type[Protocol],
+                 *,
+                 keepalive_timeout: Optional[float] = 75.0,
+                 max_body_size: int = MAX_BODY_SIZE,
+                 date: _Date = None) -> None:
+        self._router = router
+        self._rpc_error_response = protocol_factory(ErrorResponse)
+        self._error_headers = _content_type_header(self._rpc_error_response.mime)
+        self._keepalive_timeout = keepalive_timeout
+        self._max_body_size = max_body_size
+        self._date = date or _Date()
+
+        self._loop = asyncio.get_event_loop()
+        self._transport: Optional[asyncio.Transport] = None
+        self._buffer = bytearray()
+        self._request: Optional[HTTPRequest] = None
+        self._requests: Deque[HTTPRequest] = deque()
+        self._expect_continue = False
+        self._task: Optional[asyncio.Task] = None
+        self._idle_handle: Optional[asyncio.Handle] = None
+        self._drained: Optional[asyncio.Future] = None
+        self._reading_paused = False
+        self._closed = False
+        self._broken = False
+
+    def connection_made(self, transport: asyncio.Transport) -> None:
+        self._transport = transport
+        self._start_idle_timer()
+
+    def connection_lost(self, exc: Optional[Exception]) -> None:
+        self._closed = True
+        self._cancel_idle_timer()
+        if self._task is not None:
+            self._task.cancel()
+        if self._drained is not None and not self._drained.done():
+            self._drained.set_result(None)
+
+    def pause_writing(self) -> None:
+        self._drained = self._loop.create_future()
+
+    def resume_writing(self) -> None:
+        if self._drained is not None and not self._drained.done():
+            self._drained.set_result(None)
+        self._drained = None
+
+    def data_received(self, data: bytes) -> None:
+        if self._broken:
+            return
+
+        self._cancel_idle_timer()
+        self._buffer.extend(data)
+        self._parse()
+
+        if self._requests and self._task is None:
+            self._task = self._loop.create_task(self._process())
+        elif self._task is None and not self._requests:
+            self._start_idle_timer()
+
+        if len(self._requests) >= MAX_PIPELINED_REQUESTS and not self._reading_paused:
+            self._reading_paused = True
+            self._transport.pause_reading()
+
+    def _parse(self) -> None:
+        while not self._broken:
+            if self._request is None:
+                end = self._buffer.find(b'\r\n\r\n')
+                if end < 0:
+                    if len(self._buffer) > MAX_HEADER_SIZE:
+                        self._fail(HeadersTooLarge())
+                    return
+                if end > MAX_HEADER_SIZE:
+                    self._fail(HeadersTooLarge())
+                    return
+
+                head = bytes(self._buffer[:end])
+                del self._buffer[:end + 4]
+
+                try:
+                    self._request, expect_continue = _parse_head(head, self._max_body_size)
+                except Error as e:
+                    self._fail(e)
+                    return
+
+                # a 100 Continue must not overtake the responses to earlier requests; if any are pending, it is sent
+                # once they have been written
+                if expect_continue and len(self._buffer) < self._request.content_length:
+                    if self._requests or self._task is not None:
+                        self._expect_continue = True
+                    else:
+                        self._transport.write(_CONTINUE)
+
+            request = self._request
+            if len(self._buffer) < request.content_length:
+                return
+
+            if request.content_length:
+                request.body = bytes(self._buffer[:request.content_length])
+                del self._buffer[:request.content_length]
+
+            self._request = None
+            self._expect_continue = False
+            self._requests.append(request)
+
+    def _fail(self, error: Error) -> None:
+        """
+        Answers a request that could not be parsed after all earlier requests, and then closes the connection.
+        """
+        request = HTTPRequest('', '', '', None, 0, keep_alive=False)
+        request.error = error
+        self._requests.append(request)
+        self._buffer.clear()
+        self._broken = True
+
+    async def _process(self) -> None:
+        try:
+            while self._requests and not self._closed:
+                request = self._requests.popleft()
+
+                if self._reading_paused and len(self._requests) < MAX_PIPELINED_REQUESTS // 2:
+                    self._reading_paused = False
+                    self._transport.resume_reading()
+
+                status, headers, body = await self._respond(request)
+                if self._closed:
+                    return
+
+                if not request.keep_alive:
+                    connection = _CONNECTION_CLOSE
+                elif request.version == 'HTTP/1.0':
+                    connection = _CONNECTION_KEEP_ALIVE
+                else:
+                    connection = b''
+
+                self._transport.write(b''.join((
+                    _status_line(status),
+                    self._date.header(),
+                    headers,
+                    b'' if status in (204, 304) else b'content-length: %d\r\n' % len(body),
+                    connection,
+                    b'\r\n',
+                    body)))
+
+                if not request.keep_alive:
+                    self._transport.close()
+                    return
+
+                if self._expect_continue and not self._requests:
+                    self._expect_continue = False
+                    self._transport.write(_CONTINUE)
+
+                if self._drained is not None:
+                    await self._drained
+        finally:
+            self._task = None
+
+        if not self._closed and not self._requests:
+            self._start_idle_timer()
+
+    async def _respond(self, request: HTTPRequest) -> Tuple[int, bytes, bytes]:
+        headers = self._error_headers
+        try:
+            if request.error is not None:
+                raise request.error
+
+            match = self._router.match(request.method, request.path)
+            if match is None:
+                allowed = self._router.allowed_verbs(request.path)
+                if allowed:
+                    allow = ', '.join(sorted(verb.value for verb in allowed))
+                    headers += f'allow: {allow}\r\n'.encode('latin-1')
+                    raise MethodNotAllowed()
+                raise NotFound()
+
+            handler, path_parameters = match
+            return await handler(request, path_parameters)
+        except Error as e:
+            return e.http_status, headers, self._rpc_error_response.pack(e.format())
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception('Unhandled exception in %s %s', request.method, request.path)
+            return ServerError.http_status, headers, self._rpc_error_response.pack(ServerError().format())
+
+    def _start_idle_timer(self) -> None:
+        if self._keepalive_timeout is not None and self._idle_handle is None and not self._closed:
+            self._idle_handle = self._loop.call_later(self._keepalive_timeout, self._transport.close)
+
+    def _cancel_idle_timer(self) -> None:
+        if self._idle_handle is not None:
+            self._idle_handle.cancel()
+            self._idle_handle = None
+
+
+async def create_server(venom: 'venom.rpc.Venom',
+                        host: str = None,
+                        port: int = 8080,
+                        *,
+                        path: str = None,
+                        protocol_factory: Type[Protocol] = JSONProtocol,
+                        warm: bool = False,
+                        keepalive_timeout: Optional[float] = 75.0,
+                        max_body_size: int = MAX_BODY_SIZE,
+                        loop: asyncio.AbstractEventLoop = None,
+                        **server_kwargs) -> asyncio.AbstractServer:
+    """
+    Starts serving the Venom over HTTP/1.1 on ``host`` and ``port``, or on a Unix domain socket at ``path``.
+
+    :param warm: when ``True``, the Venom is frozen with :meth:`venom.rpc.Venom.freeze` before serving.
+    :param keepalive_timeout: the number of seconds an idle connection is kept open, or ``None`` to keep it open.
+    :param max_body_size: the largest request body accepted, in bytes.
+    :param server_kwargs: keyword arguments for :meth:`asyncio.AbstractEventLoop.create_server` or
+        :meth:`asyncio.AbstractEventLoop.create_unix_server`.
+    """
+    if loop is None:
+        loop = asyncio.get_event_loop()
+
+    router = Router()
+    add_http_routes(venom, protocol_factory, router.add, lambda entry: _route_handler(venom, entry, protocol_factory),
+                    warm=warm)
+
+    date = _Date()
+
+    def protocol():
+        return HTTPServerProtocol(router,
+                                  protocol_factory,
+                                  keepalive_timeout=keepalive_timeout,
+                                  max_body_size=max_body_size,
+                                  date=date)
+
+    if path is not None:
+        return await loop.create_unix_server(protocol, path, **server_kwargs)
+    return await loop.create_server(protocol, host, port, **server_kwargs)
@@ -0,0 +1,198 @@
+"""
+Adaptive limits on the number of calls a client has in flight to an endpoint.
+
+A :class:`Limiter` admits calls while fewer than its current limit are in flight. Further calls wait in a local queue,
+or fail right away with :class:`LimitExceeded` once the queue is full. After every call, the limit is adjusted by an
+algorithm based on the call's latency and whether it was dropped (timed out, refused, or answered with
+502/503/504):
+
+- :class:`AIMDLimit` grows the limit additively while latency stays close to the lowest observed latency and cuts it
+  multiplicatively when a call is dropped or latency rises.
+- :class:`GradientLimit` scales the limit by the ratio of the lowest observed latency to the current latency, plus
+  headroom for a small queue, so that it settles where latency just starts to rise.
+
+Usage::
+
+    venom.add(CatalogStub, HTTPClient, urls, concurrency_limit=AIMDLimit)
+"""
+import asyncio
+import math
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+
+from typing import Callable, Optional
+
+from venom.exceptions import Error
+
+
+class LimitExceeded(Error):
+    http_status = 503
+    description = 'Concurrency limit exceeded'
+
+
+class LimitAlgorithm(ABC):
+    """
+    :param initial_limit: the limit before any calls have completed.
+    :param probe_interval: the number of samples after which the lowest observed latency is forgotten, so that it can
+        adapt when the backend gets slower for good.
+    """
+
+    def __init__(self,
+                 initial_limit: int = 20,
+                 *,
+                 min_limit: int = 1,
+                 max_limit: int = 1000,
+                 probe_interval: int = 1000) -> None:
+        self.limit = float(initial_limit)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.probe_interval = probe_interval
+        self.min_latency: Optional[float] = None
+        self._samples = 0
+
+    def update(self, latency: float, dropped: bool, in_flight: int) -> int:
+        """
+        Records a completed call and returns the new limit.
+        """
+        self._samples += 1
+        if self._samples >= self.probe_interval:
+            self._samples = 0
+            self.min_latency = None
+
+        if not dropped and (self.min_latency is None or latency < self.min_latency):
+            self.min_latency = latency
+
+        self.limit = min(self.max_limit, max(self.min_limit, self._update(latency, dropped, in_flight)))
+        return int(self.limit)
+
+    @abstractmethod
+    def _update(self, latency: float, dropped: bool, in_flight: int) -> float:
+        raise NotImplementedError
+
+
+class AIMDLimit(LimitAlgorithm):
+    """
+    :param tolerance: how many times the lowest observed latency a call may take before the limit is cut.
+    :param backoff: the factor the limit is multiplied with when cut.
+    """
+
+    def __init__(self, initial_limit: int = 20, *, tolerance: float = 2.0, backoff: float = 0.9, **kwargs) -> None:
+        super().__init__(initial_limit, **kwargs)
+        self.tolerance = tolerance
+        self.backoff = backoff
+
+    def _update(self, latency: float, dropped: bool, in_flight: int) -> float:
+        if dropped or latency > self.min_latency * self.tolerance:
+            return self.limit * self.backoff
+
+        # only grow while the limit is actually being used, and by about one per limit's worth of calls
+        if in_flight * 2 >= self.limit:
+            return self.limit + 1 / self.limit
+        return self.limit
+
+
+class GradientLimit(LimitAlgorithm):
+    """
+    :param tolerance: how many times the lowest observed latency is still considered no slower.
+    :param smoothing: how much of the newly computed limit is applied on each update.
+    """
+
+    def __init__(self, initial_limit: int = 20, *, tolerance: float = 1.5, smoothing: float = 0.2, **kwargs) -> None:
+        super().__init__(initial_limit, **kwargs)
+        self.tolerance = tolerance
+        self.smoothing = smoothing
+
+    def _update(self, latency: float, dropped: bool, in_flight: int) -> float:
+        if dropped:
+            gradient = 0.5
+        else:
+            gradient = max(0.5, min(1.0, self.min_latency * self.tolerance / max(latency, 1e-9)))
+
+        new_limit = self.limit * gradient + math.sqrt(self.limit)
+        return self.limit * (1 - self.smoothing) + new_limit * self.smoothing
+
+
+class Limiter(object):
+    """
+    Admits calls to one endpoint according to a :class:`LimitAlgorithm`.
+
+    :param max_queue: the number of calls that may wait for the limit; further calls fail with :class:`LimitExceeded`.
+        Use ``0`` to fail fast.
+    :param queue_timeout: the number of seconds a call may wait before it fails with :class:`LimitExceeded`.
+    """
+
+    def __init__(self,
+                 algorithm: LimitAlgorithm = None,
+                 *,
+                 max_queue: int = 100,
+                 queue_timeout: float = None,
+                 clock: Callable[[], float] = time.monotonic) -> None:
+        self.algorithm = algorithm or AIMDLimit()
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.in_flight = 0
+        self.rejected = 0
+        self._clock = clock
+        self._limit = int(self.algorithm.limit)
+        self._waiters = deque()
+
+    @property
+    def limit(self) -> int:
+        return self._limit
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    async def acquire(self) -> float:
+        """
+        Waits until the call may proceed.
+
+        :returns: the start time to pass to :meth:`release`.
+        :raises LimitExceeded: if the queue is full or the call has waited for ``queue_timeout`` seconds.
+        """
+        if self.in_flight >= self._limit or self._waiters:
+            if len(self._waiters) >= self.max_queue:
+                self.rejected += 1
+                raise LimitExceeded()
+
+            waiter = asyncio.get_event_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                await asyncio.wait_for(waiter, self.queue_timeout)
+            except BaseException as e:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+                elif waiter.done() and not waiter.cancelled():
+                    # a slot was handed over just as the wait ended; give it back
+                    self.in_flight -= 1
+                    self._wake()
+
+                if isinstance(e, asyncio.TimeoutError):
+                    self.rejected += 1
+                    raise LimitExceeded(f'Waited more than {self.queue_timeout}s for the concurrency limit')
+                raise
+
+            # the slot was handed over by _wake() and is already counted in in_flight
+            return self._clock()
+
+        self.in_flight += 1
+        return self._clock()
+
+    def release(self, started: float, *, dropped: bool = False, ignore: bool = False) -> None:
+        """
+        :param dropped: whether the call timed out or was refused by the backend.
+        :param ignore: whether the call ended without a meaningful outcome, e.g. because it was cancelled.
+        """
+        self.in_flight -= 1
+        if not ignore:
+            self._limit = self.algorithm.update(self._clock() - started, dropped, self.in_flight + 1)
+        self._wake()
+
+    def _wake(self) -> None:
+        while self._waiters and self.in_flight < self._limit:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self.in_flight += 1
+                waiter.set_result(None)
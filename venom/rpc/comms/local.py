@@ -0,0 +1,65 @@
+import asyncio
+from copy import deepcopy
+
+from typing import Type, Dict
+
+from venom.message import Message
+from venom.protocol import Protocol
+from venom.rpc.comms import AbstractClient
+from venom.rpc.dispatch import DispatchEntry
+from venom.rpc.method import Method
+
+
+class LocalClient(AbstractClient):
+    """
+    A client that invokes the implementation of a stub in the same process, without packing or sending any messages.
+
+    The implementation is looked up by service and method name in the :class:`venom.rpc.Venom` given to the client
+    (or else the Venom the stub is added to) on first use. Messages are passed through as they are unless ``copy`` is
+    set, in which case requests and responses are deep-copied so that neither side can see the other's changes ---
+    the same isolation a network transport provides.
+
+    Usage::
+
+        venom.add(HelloService)
+        ...
+        client_venom.add(HelloStub, LocalClient, venom)
+
+    """
+
+    def __init__(self,
+                 stub: 'venom.rpc.Service',
+                 venom: 'venom.rpc.Venom' = None,
+                 *,
+                 copy: bool = False,
+                 protocol_factory: Type[Protocol] = None):
+        super().__init__(stub, protocol_factory=protocol_factory)
+        self._venom = venom or stub.venom
+        self._copy = copy
+        self._entries: Dict[str, DispatchEntry] = {}
+
+    def _get_entry(self, method: Method) -> DispatchEntry:
+        try:
+            return self._entries[method.name]
+        except KeyError:
+            pass
+
+        self._entries[method.name] = entry = self._venom.get_method(self.stub.__meta__.name, method.name)
+        return entry
+
+    async def invoke(self,
+                     method: Method,
+                     request: Message,
+                     *,
+                     context: 'venom.rpc.RequestContext' = None,
+                     loop: 'asyncio.AbstractEventLoop' = None):
+        entry = self._get_entry(method)
+
+        if self._copy:
+            request = deepcopy(request)
+
+        response = await self._venom.invoke(entry.method, request, context=context, loop=loop)
+
+        if self._copy:
+            return deepcopy(response)
+        return response
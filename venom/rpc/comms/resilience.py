@@ -0,0 +1,200 @@
+"""
+Hedging and retries for client calls to idempotent methods.
+
+Both are configured per method through method options on the stub::
+
+    class CatalogStub(Stub):
+        @http.GET('./items/{id}', idempotent=True, hedge=True, retries=2)
+        def get_item(self, request: ItemRequest) -> Item:
+            raise NotImplementedError
+
+``hedge=True`` sends a second request once the call has taken longer than the 95th percentile (``hedge_percentile``)
+of the latencies observed so far; a number gives a fixed delay in seconds instead. The first successful response is
+returned and the other request is cancelled. ``retries`` is the number of times a call is retried after a connection
+error or a :class:`venom.exceptions.ServiceUnavailable` error, with exponential backoff and jitter starting at
+``retry_backoff`` seconds. Neither applies to methods that are not marked ``idempotent``.
+
+Hedges and retries are drawn from a :class:`RetryBudget` shared by all methods of a client, so that they cannot
+multiply the load on a struggling backend.
+"""
+import asyncio
+import random
+import time
+from collections import deque
+
+from typing import Any, Awaitable, Callable, Dict, NamedTuple, Optional, Tuple, Type
+
+from venom.exceptions import ServiceUnavailable
+from venom.rpc.method import Method
+
+
+class CallStats(NamedTuple):
+    calls: int
+    retries: int
+    hedges: int
+    hedge_wins: int
+    budget_exhausted: int
+
+
+class RetryBudget(object):
+    """
+    A token bucket that allows hedges and retries for a ``ratio`` of calls, plus ``min_per_second`` regardless of the
+    call volume.
+    """
+
+    def __init__(self,
+                 ratio: float = 0.1,
+                 *,
+                 min_per_second: float = 10.0,
+                 capacity: float = 100.0,
+                 clock: Callable[[], float] = time.monotonic) -> None:
+        self.ratio = ratio
+        self.min_per_second = min_per_second
+        self.capacity = capacity
+        self._clock = clock
+        self._tokens = capacity
+        self._updated_at = clock()
+
+    def deposit(self) -> None:
+        self._tokens = min(self.capacity, self._tokens + self.ratio)
+
+    def withdraw(self) -> bool:
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.min_per_second)
+        self._updated_at = now
+
+        if self._tokens < 1:
+            return False
+        self._tokens -= 1
+        return True
+
+
+class LatencyTracker(object):
+    """
+    Keeps the latencies of the last ``window`` successful calls to estimate a percentile.
+    """
+
+    def __init__(self, window: int = 1000, *, min_samples: int = 20) -> None:
+        self.min_samples = min_samples
+        self._samples = deque(maxlen=window)
+        self._percentiles: Dict[float, float] = {}
+        self._stale = 0
+
+    def add(self, latency: float) -> None:
+        self._samples.append(latency)
+        self._stale += 1
+        if self._stale >= self.min_samples:
+            self._percentiles.clear()
+            self._stale = 0
+
+    def percentile(self, percentile: float) -> Optional[float]:
+        """
+        :returns: the latency at the given percentile, or ``None`` while fewer than ``min_samples`` are known.
+        """
+        if len(self._samples) < self.min_samples:
+            return None
+
+        try:
+            return self._percentiles[percentile]
+        except KeyError:
+            samples = sorted(self._samples)
+            index = min(len(samples) - 1, int(len(samples) * percentile / 100))
+            self._percentiles[percentile] = value = samples[index]
+            return value
+
+
+class CallPolicy(object):
+    """
+    Invokes attempts of a method with the hedging and retry behavior given by its options.
+
+    :param retryable: the exception types that cause an attempt to be retried.
+    """
+
+    def __init__(self,
+                 method: Method,
+                 budget: RetryBudget,
+                 *,
+                 retryable: Tuple[Type[BaseException], ...] = (ConnectionError, ServiceUnavailable),
+                 random_: random.Random = None) -> None:
+        options = method.options
+        self.idempotent = options.get('idempotent', False)
+        self.hedge: Any = options.get('hedge', False)
+        self.hedge_percentile: float = options.get('hedge_percentile', 95)
+        self.retries: int = options.get('retries', 2 if self.idempotent else 0)
+        self.retry_backoff: float = options.get('retry_backoff', 0.05)
+
+        if not self.idempotent and (self.hedge or self.retries):
+            raise ValueError(f'Unable to hedge or retry {method.name}: The method is not marked idempotent')
+
+        self.budget = budget
+        self.retryable = retryable
+        self.latencies = LatencyTracker()
+        self._random = random_ or random.Random()
+        self._calls = self._retries = self._hedges = self._hedge_wins = self._budget_exhausted = 0
+
+    def stats(self) -> CallStats:
+        return CallStats(self._calls, self._retries, self._hedges, self._hedge_wins, self._budget_exhausted)
+
+    def hedge_delay(self) -> Optional[float]:
+        if not self.hedge:
+            return None
+        if self.hedge is True:
+            return self.latencies.percentile(self.hedge_percentile)
+        return float(self.hedge)
+
+    def _withdraw(self) -> bool:
+        if self.budget.withdraw():
+            return True
+        self._budget_exhausted += 1
+        return False
+
+    async def _timed(self, attempt: Callable[[], Awaitable]):
+        started = time.monotonic()
+        result = await attempt()
+        self.latencies.add(time.monotonic() - started)
+        return result
+
+    async def _hedged(self, attempt: Callable[[], Awaitable], delay: Optional[float]):
+        if delay is None:
+            return await self._timed(attempt)
+
+        first = asyncio.ensure_future(self._timed(attempt))
+        pending = {first}
+        try:
+            done, pending = await asyncio.wait(pending, timeout=delay)
+            if not done and self._withdraw():
+                self._hedges += 1
+                pending.add(asyncio.ensure_future(self._timed(attempt)))
+
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is not first:
+                            self._hedge_wins += 1
+                        return task.result()
+
+            # every attempt failed; report the most recent failure
+            return done.pop().result()
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def call(self, attempt: Callable[[], Awaitable]):
+        """
+        :param attempt: a callable that makes a single request and returns an awaitable of its response.
+        """
+        self._calls += 1
+        self.budget.deposit()
+
+        retries = 0
+        while True:
+            try:
+                return await self._hedged(attempt, self.hedge_delay())
+            except self.retryable:
+                if retries >= self.retries or not self._withdraw():
+                    raise
+
+            retries += 1
+            self._retries += 1
+            await asyncio.sleep(self.retry_backoff * 2 ** (retries - 1) * self._random.uniform(0.5, 1.5))
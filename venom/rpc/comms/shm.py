@@ -0,0 +1,425 @@
+"""
+An RPC transport for processes on the same host that passes message bytes through shared memory::
+
+    server = await create_server(venom, '/run/catalog.sock')
+
+    venom.add(CatalogStub, Client, '/run/catalog.sock')
+
+Every connection has two ring buffers in shared memory, one for each direction, which carry the frames of
+:mod:`venom.rpc.comms.tcp`. The Unix domain socket the connection is made on only carries one-byte notifications that
+new bytes or free space are available, so payloads are never copied through the kernel. Frames larger than a ring
+buffer are streamed through it as space becomes available.
+
+The client creates both buffers and sends their names in a handshake; they are unlinked as soon as the server has
+attached to them. Segments are created with :class:`multiprocessing.shared_memory.SharedMemory` where available
+(Python 3.8+) and as memory-mapped files in ``/dev/shm`` otherwise. The server only attaches to segments with names
+of the form ``venom-<hex>``, so a client cannot make it open any other file.
+"""
+import asyncio
+import mmap
+import os
+import re
+import secrets
+import struct
+import tempfile
+
+from typing import Callable, List, Optional, Sequence, Type
+
+from venom.protocol import JSONProtocol, Protocol
+from venom.rpc.comms import tcp
+
+try:
+    from multiprocessing import resource_tracker
+    from multiprocessing.shared_memory import SharedMemory
+except ImportError:  # Python < 3.8
+    resource_tracker = SharedMemory = None
+
+DEFAULT_BUFFER_SIZE = 1024 * 1024
+
+_SHM_DIRECTORY = '/dev/shm' if os.path.isdir('/dev/shm') else tempfile.gettempdir()
+
+_SEGMENT_NAME_RE = re.compile(r'venom-[0-9a-f]{16}\Z')
+
+_NOTIFICATION = b'\x00'
+_ATTACHED = b'\x01'
+
+
+class Segment(object):
+    """
+    A named block of shared memory.
+
+    :param name: the name of an existing segment to attach to; a new segment of ``size`` bytes is created otherwise.
+    :raises ValueError: if ``name`` is not the name of a segment created by this class.
+    """
+
+    def __init__(self, name: str = None, size: int = 0) -> None:
+        self._shared_memory = self._mmap = None
+
+        create = name is None
+        if create:
+            name = f'venom-{secrets.token_hex(8)}'
+        elif not _SEGMENT_NAME_RE.match(name):
+            raise ValueError(f'Invalid segment name {name!r}')
+
+        self.name = name
+
+        if SharedMemory is not None:
+            self._shared_memory = SharedMemory(name, create=create, size=size)
+            if not create:
+                # the segment belongs to the process that created it, which also unlinks it
+                resource_tracker.unregister(self._shared_memory._name, 'shared_memory')
+            self.buf = self._shared_memory.buf
+            return
+
+        self._path = os.path.join(_SHM_DIRECTORY, name)
+        if create:
+            fd = os.open(self._path, os.O_CREAT | os.O_EXCL | os.O_RDWR | os.O_NOFOLLOW, 0o600)
+            os.ftruncate(fd, size)
+        else:
+            fd = os.open(self._path, os.O_RDWR | os.O_NOFOLLOW)
+            size = os.fstat(fd).st_size
+
+        try:
+            self._mmap = mmap.mmap(fd, size)
+        finally:
+            os.close(fd)
+
+        self.buf = memoryview(self._mmap)
+
+    def unlink(self) -> None:
+        try:
+            if self._shared_memory is not None:
+                self._shared_memory.unlink()
+            else:
+                os.unlink(self._path)
+        except FileNotFoundError:
+            pass
+
+    def close(self) -> None:
+        if self.buf is None:
+            return
+
+        if self._shared_memory is not None:
+            self.buf = None
+            self._shared_memory.close()
+        else:
+            self.buf.release()
+            self.buf = None
+            self._mmap.close()
+
+
+class RingBuffer(object):
+    """
+    A single-producer, single-consumer byte queue in a block of shared memory.
+
+    The block starts with the read position, the write position and a flag the writer sets while it waits for free
+    space. Positions only ever grow; the reader only writes the read position and the writer only the write position.
+    """
+    _POSITIONS = struct.Struct('=QQ')
+    _HEADER = struct.Struct('=QQI')
+
+    def __init__(self, buf: memoryview) -> None:
+        self._buf = buf
+        self.capacity = len(buf) - self._HEADER.size
+
+    @classmethod
+    def size(cls, capacity: int) -> int:
+        return cls._HEADER.size + capacity
+
+    @property
+    def writer_waiting(self) -> bool:
+        return bool(self._buf[self._POSITIONS.size])
+
+    @writer_waiting.setter
+    def writer_waiting(self, value: bool) -> None:
+        self._buf[self._POSITIONS.size] = int(value)
+
+    def write(self, data) -> int:
+        """
+        :returns: the number of bytes written, which is less than ``len(data)`` when the buffer is full.
+        """
+        head, tail = self._POSITIONS.unpack_from(self._buf)
+        count = min(len(data), self.capacity - (tail - head))
+        if count <= 0:
+            return 0
+
+        offset = self._HEADER.size
+        start = tail % self.capacity
+        first = min(count, self.capacity - start)
+
+        with memoryview(data) as view:
+            self._buf[offset + start:offset + start + first] = view[:first]
+            if count > first:
+                self._buf[offset:offset + count - first] = view[first:count]
+
+        struct.pack_into('=Q', self._buf, 8, tail + count)
+        return count
+
+    def read(self) -> bytes:
+        """
+        :returns: all bytes written since the last read.
+        """
+        head, tail = self._POSITIONS.unpack_from(self._buf)
+        count = tail - head
+        if not count:
+            return b''
+
+        offset = self._HEADER.size
+        start = head % self.capacity
+        first = min(count, self.capacity - start)
+
+        data = bytes(self._buf[offset + start:offset + start + first])
+        if count > first:
+            data += bytes(self._buf[offset:offset + count - first])
+
+        struct.pack_into('=Q', self._buf, 0, head + count)
+        return data
+
+
+class SharedMemoryTransport(asyncio.Transport):
+    """
+    A transport that writes to one ring buffer and reads from another, notifying the peer through a socket.
+    """
+
+    def __init__(self,
+                 channel: asyncio.Transport,
+                 send: RingBuffer,
+                 receive: RingBuffer,
+                 segments: Sequence[Segment],
+                 protocol: asyncio.Protocol) -> None:
+        super().__init__()
+        self._channel = channel
+        self._send = send
+        self._receive = receive
+        self._segments = segments
+        self._protocol = protocol
+        self._pending = bytearray()
+        self._notify_scheduled = False
+        self._closing = False
+
+    def get_extra_info(self, name, default=None):
+        return self._channel.get_extra_info(name, default)
+
+    def is_closing(self) -> bool:
+        return self._closing
+
+    def close(self) -> None:
+        if not self._closing:
+            self._closing = True
+            self._channel.close()
+
+    def abort(self) -> None:
+        self._closing = True
+        self._channel.abort()
+
+    def get_write_buffer_size(self) -> int:
+        return len(self._pending)
+
+    def write(self, data) -> None:
+        if self._closing:
+            return
+        self._pending.extend(data)
+        self._flush()
+
+    def _flush(self) -> None:
+        if not self._pending:
+            return
+
+        written = self._send.write(self._pending)
+        if written < len(self._pending):
+            # announce the wait before checking again, so that the reader cannot free space unnoticed in between
+            self._send.writer_waiting = True
+            written += self._send.write(memoryview(self._pending)[written:])
+
+        if written:
+            del self._pending[:written]
+            self._notify()
+
+    def _notify(self) -> None:
+        # coalesce the notifications of all writes in one iteration of the event loop
+        if not self._notify_scheduled:
+            self._notify_scheduled = True
+            asyncio.get_event_loop().call_soon(self._send_notification)
+
+    def _send_notification(self) -> None:
+        self._notify_scheduled = False
+        if not self._channel.is_closing():
+            self._channel.write(_NOTIFICATION)
+
+    def notified(self) -> None:
+        """
+        Reads everything the peer has written and continues writing where free space is now available.
+        """
+        while not self._closing:
+            data = self._receive.read()
+            if not data:
+                break
+            self._protocol.data_received(data)
+
+        if self._receive.writer_waiting:
+            self._receive.writer_waiting = False
+            self._notify()
+
+        self._flush()
+
+    def connection_lost(self, exc: Optional[Exception]) -> None:
+        self._closing = True
+        try:
+            self._protocol.connection_lost(exc)
+        finally:
+            for segment in self._segments:
+                segment.close()
+
+
+class _Channel(asyncio.Protocol):
+    """
+    The socket of a connection, which carries the handshake and then notifications.
+    """
+
+    def __init__(self) -> None:
+        self.transport: Optional[asyncio.Transport] = None
+        self.shared_memory: Optional[SharedMemoryTransport] = None
+
+    def connection_made(self, transport: asyncio.Transport) -> None:
+        self.transport = transport
+
+    def connection_lost(self, exc: Optional[Exception]) -> None:
+        if self.shared_memory is not None:
+            self.shared_memory.connection_lost(exc)
+
+
+class _ServerChannel(_Channel):
+    def __init__(self, protocol_factory: Callable[[], asyncio.Protocol]) -> None:
+        super().__init__()
+        self._protocol_factory = protocol_factory
+        self._handshake = bytearray()
+
+    def data_received(self, data: bytes) -> None:
+        if self.shared_memory is not None:
+            self.shared_memory.notified()
+            return
+
+        self._handshake.extend(data)
+        if b'\n' not in self._handshake:
+            return
+
+        line, _, rest = bytes(self._handshake).partition(b'\n')
+        try:
+            # the client's sending buffer is the server's receiving buffer
+            segments = [Segment(name) for name in line.decode('utf-8').split('\t')]
+        except (OSError, UnicodeDecodeError, ValueError):
+            self.transport.close()
+            return
+
+        protocol = self._protocol_factory()
+        receive, send = (RingBuffer(segment.buf) for segment in segments)
+        self.shared_memory = SharedMemoryTransport(self.transport, send, receive, segments, protocol)
+        self.transport.write(_ATTACHED)
+        protocol.connection_made(self.shared_memory)
+
+        if rest:
+            self.shared_memory.notified()
+
+
+class _ClientChannel(_Channel):
+    def __init__(self, protocol: asyncio.Protocol, segments: List[Segment]) -> None:
+        super().__init__()
+        self.protocol = protocol
+        self.attached = asyncio.get_event_loop().create_future()
+        self._segments = segments
+
+    def connection_made(self, transport: asyncio.Transport) -> None:
+        super().connection_made(transport)
+        transport.write('\t'.join(segment.name for segment in self._segments).encode('utf-8') + b'\n')
+
+    def connection_lost(self, exc: Optional[Exception]) -> None:
+        if self.shared_memory is None:
+            for segment in self._segments:
+                segment.unlink()
+                segment.close()
+            if not self.attached.done():
+                self.attached.set_exception(ConnectionResetError('Connection lost during the handshake'))
+        super().connection_lost(exc)
+
+    def data_received(self, data: bytes) -> None:
+        if self.shared_memory is None:
+            if data[:1] != _ATTACHED:
+                self.transport.close()
+                return
+
+            for segment in self._segments:
+                segment.unlink()
+
+            send, receive = (RingBuffer(segment.buf) for segment in self._segments)
+            self.shared_memory = SharedMemoryTransport(self.transport, send, receive, self._segments, self.protocol)
+            self.protocol.connection_made(self.shared_memory)
+            self.attached.set_result(None)
+            data = data[1:]
+
+        if data:
+            self.shared_memory.notified()
+
+
+async def create_server(venom: 'venom.rpc.Venom',
+                        path: str,
+                        *,
+                        protocol_factories: Sequence[Type[Protocol]] = (JSONProtocol,),
+                        max_frame_size: int = tcp.MAX_FRAME_SIZE,
+                        loop: asyncio.AbstractEventLoop = None,
+                        **server_kwargs) -> asyncio.AbstractServer:
+    """
+    Starts accepting shared-memory connections on a Unix domain socket at ``path``.
+
+    :param protocol_factories: the protocols clients may choose from.
+    :param server_kwargs: keyword arguments for :meth:`asyncio.AbstractEventLoop.create_unix_server`.
+    """
+    if loop is None:
+        loop = asyncio.get_event_loop()
+
+    factories = {protocol_factory.mime: protocol_factory for protocol_factory in protocol_factories}
+
+    def protocol():
+        return tcp.ServerProtocol(venom, factories, max_frame_size)
+
+    return await loop.create_unix_server(lambda: _ServerChannel(protocol), path, **server_kwargs)
+
+
+class Client(tcp.Client):
+    """
+    A client for a Venom served with :func:`create_server`.
+
+    :param path: the path of the Unix domain socket of the server.
+    :param buffer_size: the capacity in bytes of each of the two ring buffers of a connection.
+    :param connections: the number of connections to spread calls over.
+    """
+
+    def __init__(self,
+                 stub: Type['venom.rpc.Service'],
+                 path: str,
+                 *,
+                 buffer_size: int = DEFAULT_BUFFER_SIZE,
+                 protocol_factory: Type[Protocol] = None,
+                 connections: int = 1,
+                 max_frame_size: int = tcp.MAX_FRAME_SIZE):
+        super().__init__(stub,
+                         path=path,
+                         protocol_factory=protocol_factory,
+                         connections=connections,
+                         max_frame_size=max_frame_size)
+        self._buffer_size = buffer_size
+
+    async def _create_connection(self, protocol_factory: Callable[[], tcp.ClientProtocol]) -> tcp.ClientProtocol:
+        loop = asyncio.get_event_loop()
+        segments = [Segment(size=RingBuffer.size(self._buffer_size)) for _ in range(2)]
+        channel = _ClientChannel(protocol_factory(), segments)
+
+        try:
+            await loop.create_unix_connection(lambda: channel, self._path)
+        except BaseException:
+            for segment in segments:
+                segment.unlink()
+                segment.close()
+            raise
+
+        await channel.attached
+        return channel.protocol
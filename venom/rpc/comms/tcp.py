@@ -0,0 +1,407 @@
+"""
+A binary RPC transport that multiplexes many concurrent calls over a few persistent TCP (or Unix domain socket)
+connections, without the parsing and header overhead of HTTP::
+
+    server = await create_server(venom, '0.0.0.0', 50052)
+
+    venom.add(CatalogStub, Client, 'catalog.internal', 50052, connections=2)
+
+Every frame starts with a fixed header --- the length of the rest of the frame, the frame type, a call ID and a code
+--- followed by the payload:
+
+- A connection opens with a ``HELLO`` frame from the client carrying the MIME type of its
+  :class:`venom.protocol.Protocol`. The server answers with a ``HELLO`` frame listing the ``service.method`` names of
+  its dispatch table, one per line; the position of a method in that list is its method index.
+- ``REQUEST`` frames carry the method index as their code and the packed request as their payload.
+- ``RESPONSE`` frames carry the status as their code --- ``200``, or the HTTP status of the error --- and the packed
+  response or :class:`venom.exceptions.ErrorResponse` as their payload.
+
+Clients can send requests without waiting for earlier responses. The server answers each call as soon as it completes,
+so responses may arrive out of order; the client matches them to calls by their call ID.
+
+Streaming methods are not supported.
+"""
+import asyncio
+import itertools
+import logging
+import struct
+
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Type
+
+from venom.exceptions import Error, ErrorResponse, BadRequest, Unauthorized, Forbidden, NotFound, Conflict, \
+    NotImplemented_, ServerError, ServiceUnavailable
+from venom.protocol import JSONProtocol, Protocol
+from venom.rpc import RequestContext
+from venom.rpc.comms import AbstractClient
+from venom.rpc.method import Method
+
+logger = logging.getLogger(__name__)
+
+HELLO, REQUEST, RESPONSE = range(3)
+
+# length of the rest of the frame, frame type, call ID, method index or status
+_HEADER = struct.Struct('!IBIH')
+_LENGTH = struct.Struct('!I')
+
+MAX_FRAME_SIZE = 16 * 1024 * 1024
+
+_STATUS_OK = 200
+_STATUS_UNSUPPORTED_PROTOCOL = 415
+
+_ERRORS = {
+    400: BadRequest,
+    401: Unauthorized,
+    403: Forbidden,
+    404: NotFound,
+    409: Conflict,
+    501: NotImplemented_,
+    503: ServiceUnavailable,
+}
+
+
+def pack_frame(frame_type: int, call_id: int, code: int, payload: bytes = b'') -> bytes:
+    return _HEADER.pack(_HEADER.size - _LENGTH.size + len(payload), frame_type, call_id, code) + payload
+
+
+class _FrameProtocol(asyncio.Protocol):
+    """
+    Splits the incoming byte stream into frames and passes them to :meth:`frame_received`.
+    """
+
+    def __init__(self, max_frame_size: int = MAX_FRAME_SIZE) -> None:
+        self.transport: Optional[asyncio.Transport] = None
+        self.max_frame_size = max_frame_size
+        self._buffer = bytearray()
+
+    def connection_made(self, transport: asyncio.Transport) -> None:
+        self.transport = transport
+
+    def data_received(self, data: bytes) -> None:
+        buffer = self._buffer
+        buffer.extend(data)
+
+        offset = 0
+        while len(buffer) - offset >= _HEADER.size:
+            length, frame_type, call_id, code = _HEADER.unpack_from(buffer, offset)
+            if length > self.max_frame_size:
+                logger.warning('Closing connection after a frame of %d bytes', length)
+                self.transport.close()
+                return
+
+            end = offset + _LENGTH.size + length
+            if len(buffer) < end:
+                break
+
+            payload = bytes(buffer[offset + _HEADER.size:end])
+            offset = end
+            self.frame_received(frame_type, call_id, code, payload)
+
+        del buffer[:offset]
+
+    def frame_received(self, frame_type: int, call_id: int, code: int, payload: bytes) -> None:
+        raise NotImplementedError
+
+    def send(self, frame_type: int, call_id: int, code: int, payload: bytes = b'') -> None:
+        if self.transport is not None and not self.transport.is_closing():
+            self.transport.write(pack_frame(frame_type, call_id, code, payload))
+
+
+class TCPRequestContext(RequestContext):
+    transport: asyncio.Transport
+
+    def __init__(self, transport: asyncio.Transport):
+        self.transport = transport
+
+
+class ServerProtocol(_FrameProtocol):
+    """
+    Serves the calls of one client connection.
+    """
+
+    def __init__(self,
+                 venom: 'venom.rpc.Venom',
+                 protocol_factories: Dict[str, Type[Protocol]],
+                 max_frame_size: int = MAX_FRAME_SIZE) -> None:
+        super().__init__(max_frame_size)
+        self.venom = venom
+        self._protocol_factories = protocol_factories
+        self._protocol_factory: Optional[Type[Protocol]] = None
+        self._error_response: Optional[Protocol] = None
+        self._calls = set()
+
+    def connection_lost(self, exc: Optional[Exception]) -> None:
+        for call in self._calls:
+            call.cancel()
+
+    def frame_received(self, frame_type: int, call_id: int, code: int, payload: bytes) -> None:
+        if frame_type == HELLO:
+            self._hello(payload)
+        elif frame_type == REQUEST and self._protocol_factory is not None:
+            call = asyncio.ensure_future(self._call(call_id, code, payload))
+            self._calls.add(call)
+            call.add_done_callback(self._calls.discard)
+        else:
+            self.transport.close()
+
+    def _hello(self, payload: bytes) -> None:
+        try:
+            self._protocol_factory = self._protocol_factories[payload.decode('utf-8')]
+        except (KeyError, UnicodeDecodeError):
+            self.send(HELLO, 0, _STATUS_UNSUPPORTED_PROTOCOL)
+            self.transport.close()
+            return
+
+        self._error_response = self._protocol_factory(ErrorResponse)
+        names = '\n'.join(entry.name for entry in self.venom.dispatch_table)
+        self.send(HELLO, 0, _STATUS_OK, names.encode('utf-8'))
+
+    async def _call(self, call_id: int, index: int, payload: bytes) -> None:
+        try:
+            try:
+                entry = self.venom.dispatch_table[index]
+            except IndexError:
+                raise NotFound(f'No method with index {index}')
+
+            if entry.method.client_streaming or entry.method.server_streaming:
+                raise NotImplemented_('Streaming methods are not supported by the TCP transport')
+
+            request_protocol, response_protocol = entry.protocols(self._protocol_factory)
+            request = request_protocol.unpack(payload)
+            response = await self.venom.invoke(entry.method, request, context=TCPRequestContext(self.transport))
+            self.send(RESPONSE, call_id, _STATUS_OK, response_protocol.pack(response))
+        except asyncio.CancelledError:
+            raise
+        except Error as e:
+            self.send(RESPONSE, call_id, e.http_status, self._error_response.pack(e.format()))
+        except Exception:
+            logger.exception('Unhandled exception in call #%d', call_id)
+            self.send(RESPONSE, call_id, ServerError.http_status, self._error_response.pack(ServerError().format()))
+
+
+async def create_server(venom: 'venom.rpc.Venom',
+                        host: str = None,
+                        port: int = 50052,
+                        *,
+                        path: str = None,
+                        protocol_factories: Sequence[Type[Protocol]] = (JSONProtocol,),
+                        max_frame_size: int = MAX_FRAME_SIZE,
+                        loop: asyncio.AbstractEventLoop = None,
+                        **server_kwargs) -> asyncio.AbstractServer:
+    """
+    Starts serving the Venom on ``host`` and ``port``, or on a Unix domain socket at ``path``.
+
+    :param protocol_factories: the protocols clients may choose from.
+    :param server_kwargs: keyword arguments for :meth:`asyncio.AbstractEventLoop.create_server` or
+        :meth:`asyncio.AbstractEventLoop.create_unix_server`.
+    """
+    if loop is None:
+        loop = asyncio.get_event_loop()
+
+    factories = {protocol_factory.mime: protocol_factory for protocol_factory in protocol_factories}
+
+    def protocol():
+        return ServerProtocol(venom, factories, max_frame_size)
+
+    if path is not None:
+        return await loop.create_unix_server(protocol, path, **server_kwargs)
+    return await loop.create_server(protocol, host, port, **server_kwargs)
+
+
+class ClientProtocol(_FrameProtocol):
+    """
+    One client connection, with the calls that are waiting for a response.
+    """
+
+    def __init__(self, mime: str, max_frame_size: int = MAX_FRAME_SIZE) -> None:
+        super().__init__(max_frame_size)
+        loop = asyncio.get_event_loop()
+        self.mime = mime
+        self.methods: Dict[str, int] = {}
+        self.ready = loop.create_future()
+        self.closed = False
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._call_ids = itertools.count(1)
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def connection_made(self, transport: asyncio.Transport) -> None:
+        super().connection_made(transport)
+        self.send(HELLO, 0, 0, self.mime.encode('utf-8'))
+
+    def connection_lost(self, exc: Optional[Exception]) -> None:
+        self.closed = True
+        error = ServiceUnavailable('Connection lost')
+
+        if not self.ready.done():
+            self.ready.set_exception(error)
+
+        pending, self._pending = self._pending, {}
+        for future in pending.values():
+            if not future.done():
+                future.set_exception(error)
+
+    def frame_received(self, frame_type: int, call_id: int, code: int, payload: bytes) -> None:
+        if frame_type == RESPONSE:
+            future = self._pending.pop(call_id, None)
+            if future is not None and not future.done():
+                future.set_result((code, payload))
+        elif frame_type == HELLO and not self.ready.done():
+            if code != _STATUS_OK:
+                self.ready.set_exception(ServiceUnavailable(f"The server does not support the protocol '{self.mime}'"))
+                return
+
+            names = payload.decode('utf-8')
+            self.methods = {name: index for index, name in enumerate(names.split('\n'))} if names else {}
+            self.ready.set_result(None)
+
+    def call(self, index: int, payload: bytes) -> asyncio.Future:
+        """
+        Sends a request without waiting for the responses to earlier requests.
+
+        :returns: a future for the ``(status, payload)`` of the response.
+        """
+        if self.closed:
+            raise ServiceUnavailable('Connection lost')
+
+        call_id = next(self._call_ids) & 0xFFFFFFFF
+        self._pending[call_id] = future = asyncio.get_event_loop().create_future()
+        future.add_done_callback(lambda _: self._pending.pop(call_id, None))
+        self.send(REQUEST, call_id, index, payload)
+        return future
+
+    def close(self) -> None:
+        if self.transport is not None:
+            self.transport.close()
+
+
+class Client(AbstractClient):
+    """
+    A client for a Venom served with :func:`create_server`.
+
+    Calls are spread over up to ``connections`` persistent connections, each multiplexing any number of concurrent
+    calls. Connections are opened on first use and reopened after they are lost.
+
+    :param path: the path of a Unix domain socket to connect to instead of ``host`` and ``port``.
+    :param connections: the number of connections to spread calls over.
+    """
+
+    def __init__(self,
+                 stub: Type['venom.rpc.Service'],
+                 host: str = None,
+                 port: int = 50052,
+                 *,
+                 path: str = None,
+                 protocol_factory: Type[Protocol] = None,
+                 connections: int = 1,
+                 max_frame_size: int = MAX_FRAME_SIZE):
+        super().__init__(stub, protocol_factory=protocol_factory)
+
+        if connections < 1:
+            raise ValueError('A client needs at least one connection')
+
+        self._host = host or 'localhost'
+        self._port = port
+        self._path = path
+        self._max_frame_size = max_frame_size
+        self._connections: List[Optional[asyncio.Future]] = [None] * connections
+        self._next_connection = 0
+        self._protocols: Dict[str, Tuple[Protocol, Protocol]] = {}
+        self._error_response = self._protocol_factory(ErrorResponse)
+
+    async def _create_connection(self, protocol_factory: Callable[[], ClientProtocol]) -> ClientProtocol:
+        loop = asyncio.get_event_loop()
+        if self._path is not None:
+            _, connection = await loop.create_unix_connection(protocol_factory, self._path)
+        else:
+            _, connection = await loop.create_connection(protocol_factory, self._host, self._port)
+        return connection
+
+    async def _connect(self) -> ClientProtocol:
+        def protocol():
+            return ClientProtocol(self._protocol_factory.mime, self._max_frame_size)
+
+        try:
+            connection = await self._create_connection(protocol)
+        except OSError as e:
+            raise ServiceUnavailable(f'Unable to connect: {e}')
+
+        try:
+            await connection.ready
+        except BaseException:
+            connection.close()
+            raise
+        return connection
+
+    async def _get_connection(self) -> ClientProtocol:
+        index = self._next_connection
+        self._next_connection = (index + 1) % len(self._connections)
+
+        connecting = self._connections[index]
+        if connecting is not None and connecting.done() and (connecting.cancelled() or
+                                                              connecting.exception() is not None or
+                                                              connecting.result().closed):
+            connecting = None
+
+        if connecting is None:
+            self._connections[index] = connecting = asyncio.ensure_future(self._connect())
+
+        # the connection is shared, so a cancelled call must not cancel the attempt to connect
+        return await asyncio.shield(connecting)
+
+    def _get_protocols(self, method: Method) -> Tuple[Protocol, Protocol]:
+        try:
+            return self._protocols[method.name]
+        except KeyError:
+            self._protocols[method.name] = protocols = (self._protocol_factory(method.request),
+                                                        self._protocol_factory(method.response))
+            return protocols
+
+    def warm_up(self) -> None:
+        for method in self.__methods__.values():
+            self._get_protocols(method)
+
+    def _error(self, status: int, payload: bytes) -> Error:
+        description = self._error_response.unpack(payload).description
+        return _ERRORS.get(status, ServerError)(description or None)
+
+    async def invoke(self,
+                     method: Method,
+                     request: 'venom.message.Message',
+                     *,
+                     context: 'venom.rpc.RequestContext' = None,
+                     loop: asyncio.AbstractEventLoop = None,
+                     timeout: float = None):
+        if method.client_streaming or method.server_streaming:
+            raise NotImplemented_('Streaming methods are not supported by the TCP transport')
+
+        request_protocol, response_protocol = self._get_protocols(method)
+        connection = await self._get_connection()
+
+        try:
+            index = connection.methods[f'{self.stub.__meta__.name}.{method.name}']
+        except KeyError:
+            raise NotImplemented_()
+
+        call = connection.call(index, request_protocol.pack(request))
+        if timeout is not None:
+            status, payload = await asyncio.wait_for(call, timeout)
+        else:
+            status, payload = await call
+
+        if status == _STATUS_OK:
+            return response_protocol.unpack(payload)
+        raise self._error(status, payload)
+
+    async def close(self) -> None:
+        connections = self._connections
+        self._connections = [None] * len(connections)
+        self._next_connection = 0
+        for connecting in connections:
+            if connecting is None:
+                continue
+            if not connecting.done():
+                connecting.cancel()
+            elif not connecting.cancelled() and connecting.exception() is None:
+                connecting.result().close()
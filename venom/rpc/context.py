@@ -1,7 +1,7 @@
 import asyncio
 from weakref import WeakKeyDictionary
 
-from typing import Optional, MutableMapping
+from typing import Optional, MutableMapping, Dict, Type, Any
 
 from venom.rpc.resolver import Resolver
 
@@ -9,6 +9,7 @@ from venom.rpc.resolver import Resolver
 class RequestContext(object):
     __contexts: MutableMapping[asyncio.Task, 'RequestContext'] = WeakKeyDictionary()
     _context_task: asyncio.Task = None
+    _service_instances: Dict[Type['venom.rpc.service.Service'], Any] = None
 
     def __init__(self):
         pass
@@ -0,0 +1,152 @@
+from typing import Type, Dict, Tuple, List, Iterator, Union
+
+from venom.protocol import Protocol
+from venom.rpc.method import Method, HTTPVerb
+from venom.validation import MessageValidator
+
+
+class UnknownMethod(RuntimeError):
+    pass
+
+
+class DispatchEntry(object):
+    """
+    A method registered with a :class:`venom.rpc.Venom`, together with everything a transport needs to invoke it.
+
+    Protocols are built once per protocol factory and then shared by every transport using that factory.
+    """
+    __slots__ = ('index', 'service', 'method', 'validator', '_protocols')
+
+    index: int
+    service: Type['venom.rpc.Service']
+    method: Method
+    validator: MessageValidator
+
+    def __init__(self, index: int, service: Type['venom.rpc.Service'], method: Method) -> None:
+        self.index = index
+        self.service = service
+        self.method = method
+        self.validator = method._request_validator
+        self._protocols = {}
+
+    @property
+    def name(self) -> str:
+        return f'{self.service.__meta__.name}.{self.method.name}'
+
+    def protocols(self, protocol_factory: Type[Protocol]) -> Tuple[Protocol, Protocol]:
+        """
+        :returns: a ``(request_protocol, response_protocol)`` tuple for the given protocol factory.
+        """
+        try:
+            return self._protocols[protocol_factory]
+        except KeyError:
+            pass
+
+        self._protocols[protocol_factory] = protocols = (protocol_factory(self.method.request),
+                                                         protocol_factory(self.method.response))
+        return protocols
+
+    def __repr__(self):
+        return f'<DispatchEntry #{self.index} [{self.name}]>'
+
+
+class DispatchTable(object):
+    """
+    Constant-time index of the methods of all public services in a :class:`venom.rpc.Venom`.
+
+    Entries can be looked up by position, by ``(service_name, method_name)`` or by ``(HTTP verb, HTTP path)``.
+
+    Services with ``Meta.lazy = True`` are indexed --- and their methods thereby prepared --- only once one of their
+    methods is first looked up by name, or once any lookup requires the full table. Their HTTP routes are still checked
+    for conflicts when they are added.
+    """
+
+    def __init__(self) -> None:
+        self._entries: List[DispatchEntry] = []
+        self._names: Dict[Tuple[str, str], DispatchEntry] = {}
+        self._http_routes: Dict[Tuple[HTTPVerb, str], DispatchEntry] = {}
+        self._route_owners: Dict[Tuple[HTTPVerb, str], str] = {}
+        self._pending: Dict[str, Type['venom.rpc.Service']] = {}
+
+    @staticmethod
+    def _routes(service: Type['venom.rpc.Service']) -> Iterator[Tuple[Tuple[HTTPVerb, str], str]]:
+        service_name = service.__meta__.name
+        if service.__meta__.lazy:
+            for attr_name, descriptor in service.__method_descriptors__.items():
+                yield descriptor.http_route(service, attr_name), f'{service_name}.{attr_name}'
+        else:
+            for method in service.__methods__.values():
+                yield (method.http_method, method.http_path), f'{service_name}.{method.name}'
+
+    def check(self, service: Type['venom.rpc.Service']) -> Dict[Tuple[HTTPVerb, str], str]:
+        """
+        :returns: the HTTP routes of the service, mapped to the names of their methods.
+        :raises ValueError: if a route is used twice or is already used by another service.
+        """
+        routes = {}
+        for route, name in self._routes(service):
+            owner = routes.get(route) or self._route_owners.get(route)
+            if owner is not None:
+                raise ValueError(f"HTTP route '{route[0].value} {route[1]}' of {name} is already used by {owner}")
+            routes[route] = name
+        return routes
+
+    def add(self, service: Type['venom.rpc.Service']) -> None:
+        self._route_owners.update(self.check(service))
+
+        if service.__meta__.lazy:
+            self._pending[service.__meta__.name] = service
+        else:
+            self._index(service)
+
+    def _index_pending(self) -> None:
+        while self._pending:
+            self._index(self._pending.pop(next(iter(self._pending))))
+
+    def _index(self, service: Type['venom.rpc.Service']) -> None:
+        service_name = service.__meta__.name
+
+        for method in service.__methods__.values():
+            entry = DispatchEntry(len(self._entries), service, method)
+            self._entries.append(entry)
+            self._names[(service_name, method.name)] = entry
+            self._http_routes[(method.http_method, method.http_path)] = entry
+
+    def get(self, service_name: str, method_name: str) -> DispatchEntry:
+        try:
+            return self._names[(service_name, method_name)]
+        except KeyError:
+            pass
+
+        if service_name in self._pending:
+            self._index(self._pending.pop(service_name))
+            return self.get(service_name, method_name)
+
+        raise UnknownMethod(f"No method '{method_name}' in a service named '{service_name}'")
+
+    def get_http(self, verb: Union[HTTPVerb, str], http_path: str) -> DispatchEntry:
+        if isinstance(verb, str):
+            verb = HTTPVerb[verb]
+
+        if self._pending:
+            self._index_pending()
+
+        try:
+            return self._http_routes[(verb, http_path)]
+        except KeyError:
+            raise UnknownMethod(f"No method routed at '{verb.value} {http_path}'")
+
+    def __getitem__(self, index: int) -> DispatchEntry:
+        if self._pending:
+            self._index_pending()
+        return self._entries[index]
+
+    def __iter__(self) -> Iterator[DispatchEntry]:
+        if self._pending:
+            self._index_pending()
+        return iter(self._entries)
+
+    def __len__(self) -> int:
+        if self._pending:
+            self._index_pending()
+        return len(self._entries)
@@ -1,8 +1,10 @@
 import asyncio
+import collections.abc
 from functools import wraps
-from inspect import signature, Parameter
+from inspect import signature, Parameter, isasyncgenfunction, isawaitable
 
-from typing import Callable, Any, Sequence, get_type_hints, Type, NamedTuple, Optional, List, Dict
+from typing import Callable, Any, Sequence, get_type_hints, Type, NamedTuple, Optional, List, Dict, AsyncIterator, \
+    AsyncIterable, AsyncGenerator
 from typing import Tuple
 from typing import Union
 
@@ -16,10 +18,33 @@ from venom.validation import Schema
 MessageFunction = NamedTuple('MessageFunction', [
     ('request', Type[Message]),
     ('response', Type[Message]),
-    ('invokable', Callable[[Any, Message, Optional['asyncio.AbstractEventLoop']], Message])
+    ('invokable', Callable[[Any, Message, Optional['asyncio.AbstractEventLoop']], Message]),
     # TODO update to typing.Coroutine in Python 3.6
+    ('client_streaming', bool),
+    ('server_streaming', bool)
 ])
 
+_ASYNC_ITERABLE_TYPES = (AsyncIterator, AsyncIterable, AsyncGenerator,
+                         collections.abc.AsyncIterator, collections.abc.AsyncIterable, collections.abc.AsyncGenerator)
+
+
+def _stream_item_type(type_hint: Any) -> Optional[Any]:
+    """
+    :returns: the item type of an ``AsyncIterator[T]``, ``AsyncIterable[T]`` or ``AsyncGenerator[T, None]`` type
+        hint, or ``None`` if the type hint is not one of these.
+    """
+    if getattr(type_hint, '__origin__', None) in _ASYNC_ITERABLE_TYPES:
+        return type_hint.__args__[0] if type_hint.__args__ else Any
+    return None
+
+
+async def _stream(result, wrap_response):
+    if isawaitable(result):
+        result = await result
+
+    async for item in result:
+        yield wrap_response(item)
+
 
 def dynamic(name: str, expression: Union[type, Callable[[Type[Any]], type]]) \
         -> Callable[[Callable[..., Any]], Callable[..., Any]]:  # TODO type annotations for pass-through decorator
@@ -117,11 +142,35 @@ def magic_normalize(func: Callable[..., Any],
     request_converter = None
     func_parameters = tuple(func_signature.parameters.items())[1 + len(additional_args):]
 
-    if len(func_parameters):
+    return_type = func_type_hints.get('return', Any)
+    server_streaming = isasyncgenfunction(func) or _stream_item_type(return_type) is not None
+    client_streaming = False
+
+    if server_streaming:
+        return_type = _stream_item_type(return_type) or Any
+
+    unpack_request: Union[bool, Tuple[str, ...]] = False
+
+    if len(func_parameters) and _stream_item_type(func_type_hints.get(func_parameters[0][0], Any)) is not None:
+        # func(self, requests: AsyncIterator[MessageType])
         name, param = func_parameters[0]
-        param_type = func_type_hints.get(name, Any)
+        client_streaming = True
+        param_type = _stream_item_type(func_type_hints[name])
 
-        unpack_request: Union[bool, Tuple[str, ...]] = False
+        if request is None:
+            request = param_type
+        if param_type != Any and param_type != request:
+            raise RuntimeError(f"Bad argument in {func}: "
+                               f"'{name}' should be an iterator of {request}, but got {param_type}")
+        if request in (None, Any) or not issubclass(request, Message):
+            raise RuntimeError(f"Unable to determine request message of streaming argument '{name}' in {func}")
+
+        for name, param in func_parameters[1:]:
+            if param.default is Parameter.empty:
+                raise RuntimeError(f"Unexpected required argument in {func}: '{name}'")
+    elif len(func_parameters):
+        name, param = func_parameters[0]
+        param_type = func_type_hints.get(name, Any)
 
         # TODO param_type != Any is a workaround for https://github.com/python/typing/issues/345
         if param_type != Any and issubclass(param_type, Message) and name == 'request':
@@ -222,7 +271,6 @@ def magic_normalize(func: Callable[..., Any],
         # either request is Empty, or otherwise all request fields are discarded -- strange, but valid
         unpack_request = ()
 
-    return_type = func_type_hints.get('return', Any)
     response_converter = None
 
     if response is None:
@@ -284,6 +332,19 @@ def magic_normalize(func: Callable[..., Any],
     else:
         wrap_response = lambda res: res
 
+    if server_streaming:
+        stream_func = func
+
+        if additional_args:
+            async def invokable(inst, req: Message, loop: 'asyncio.AbstractEventLoop' = None) -> AsyncIterator[Message]:
+                args = await asyncio.gather(*[arg.resolve(inst, req) for arg in additional_args], loop=loop)
+                return _stream(stream_func(inst, *args, *wrap_args(req), **wrap_kwargs(req)), wrap_response)
+        else:
+            async def invokable(inst, req: Message, loop: 'asyncio.AbstractEventLoop' = None) -> AsyncIterator[Message]:
+                return _stream(stream_func(inst, *wrap_args(req), **wrap_kwargs(req)), wrap_response)
+
+        return MessageFunction(request, response, wraps(func)(invokable), client_streaming, server_streaming)
+
     if not asyncio.iscoroutinefunction(func):
         func_ = func
 
@@ -303,4 +364,4 @@ def magic_normalize(func: Callable[..., Any],
         async def invokable(inst, req: Message, loop: 'asyncio.AbstractEventLoop' = None) -> Message:
             return wrap_response(await func(inst, *wrap_args(req), **wrap_kwargs(req)))
 
-    return MessageFunction(request, response, wraps(func)(invokable))
+    return MessageFunction(request, response, wraps(func)(invokable), client_streaming, server_streaming)
@@ -4,7 +4,8 @@ import re
 from abc import ABCMeta
 
 from types import MethodType
-from typing import Callable, Any, Type, Union, Set, Dict, Sequence, Tuple, Awaitable, TypeVar, Generic, overload
+from typing import Callable, Any, Type, Union, Set, Dict, Sequence, Tuple, Awaitable, TypeVar, Generic, overload, \
+    AsyncIterator
 
 from venom.converter import Converter
 from venom.exceptions import NotImplemented_
@@ -59,6 +60,14 @@ class MethodDescriptor(Generic[Req, Res], metaclass=ABCMeta):
 
         self._attr_name = None
 
+    @property
+    def client_streaming(self) -> bool:
+        return self.options.get('client_streaming', False)
+
+    @property
+    def server_streaming(self) -> bool:
+        return self.options.get('server_streaming', False)
+
     def __set_name__(self, owner: Any, name: str):
         self._attr_name = name
 
@@ -121,6 +130,12 @@ class MethodDescriptor(Generic[Req, Res], metaclass=ABCMeta):
             return 200  # OK
         return self.http_status
 
+    def http_route(self, service: Type[Service], attr_name: str) -> Tuple[HTTPVerb, str]:
+        """
+        :returns: the ``(HTTP verb, HTTP path)`` the method is routed at in ``service``, without preparing the method.
+        """
+        return self._get_http_method(), self._get_http_path(service, self._get_name(service, attr_name))
+
     def prepare(self, service: Type[Service], attr_name: str) -> 'Method':
         name = self._get_name(service, attr_name)
         return Method(name,
@@ -241,6 +256,28 @@ class Method(Generic[S, Req, Res], MethodDescriptor[Req, Res]):
         #        f'[{self.name}({self.request.__meta__.name}) -> {self.response.__meta__.name}]>'
 
 
+def _streaming_options(options: Dict[str, Any], magic_func: 'venom.rpc.inspection.MessageFunction') -> Dict[str, Any]:
+    if magic_func.client_streaming:
+        options = dict(options, client_streaming=True)
+    if magic_func.server_streaming:
+        options = dict(options, server_streaming=True)
+    return options
+
+
+async def _validated_stream(validator: MessageValidator, requests: AsyncIterator[Message]) -> AsyncIterator[Message]:
+    async for request in requests:
+        validator.validate(request)
+        yield request
+
+
+async def _implemented_stream(responses: AsyncIterator[Message]) -> AsyncIterator[Message]:
+    try:
+        async for response in responses:
+            yield response
+    except NotImplementedError:
+        raise NotImplemented_()
+
+
 class ServiceMethodDescriptor(MethodDescriptor[Req, Res]):
     def __init__(self,
                  func: Callable[..., Any],
@@ -296,7 +333,7 @@ class ServiceMethodDescriptor(MethodDescriptor[Req, Res]):
                              http_path=self._get_http_path(service, name),
                              http_method=self._get_http_method(),
                              http_status=self._get_http_status(magic_func.response),
-                             **self.options)
+                             **_streaming_options(self.options, magic_func))
 
     def stub(self, stub: Type[Service], name: str) -> 'Method':
         magic_func = magic_normalize(self._func,
@@ -313,7 +350,7 @@ class ServiceMethodDescriptor(MethodDescriptor[Req, Res]):
                       http_path=self._get_http_path(stub, name),
                       http_method=self._get_http_method(),
                       http_status=self._get_http_status(magic_func.response),
-                      **self.options)
+                      **_streaming_options(self.options, magic_func))
 
         # def __call__(self, *args, **kwargs):
         #     return self._func(*args, **kwargs)
@@ -355,13 +392,24 @@ class ServiceMethod(Method[S, Req, Res]):
                              **self.options)
 
     async def invoke(self, instance: S, request: Message, loop: 'asyncio.AbstractEventLoop' = None):
-        self.validate(request)
+        """
+        For client-streaming methods, ``request`` is an async iterator of request messages; server-streaming methods
+        return an async iterator of response messages.
+        """
+        if self.client_streaming:
+            request = _validated_stream(self._request_validator, request)
+        else:
+            self.validate(request)
 
         try:
-            return await self.implementation(instance, request, loop=loop)
+            response = await self.implementation(instance, request, loop=loop)
         except NotImplementedError:
             raise NotImplemented_()
 
+        if self.server_streaming:
+            return _implemented_stream(response)
+        return response
+
 
 class MethodDecorator(object):
     def __init__(self, descriptor=ServiceMethodDescriptor, **method_options):
@@ -0,0 +1,88 @@
+import asyncio
+from collections import deque
+
+from typing import Type, List, Deque, Callable, Awaitable
+
+from venom.message import Message
+from venom.rpc.method import Method
+from venom.rpc.service import Service
+
+
+class ServicePool(object):
+    """
+    A bounded pool of instances of a service with ``Meta.scope = ServiceScope.POOLED``.
+
+    Instances are created on demand up to ``size``; once all of them are checked out, callers wait for one to be
+    released. Methods accessed on the pool check out an instance for the duration of each call, so a pool can be used
+    in place of an instance, e.g. through a :class:`venom.rpc.ServiceProxy`.
+    """
+
+    def __init__(self, service: Type[Service], venom: 'venom.rpc.Venom', size: int) -> None:
+        if size < 1:
+            raise ValueError('The size of a service pool must be at least 1')
+
+        self.service = service
+        self.venom = venom
+        self.size = size
+        self.__methods__ = service.__methods__
+        self._idle: List[Service] = []
+        self._waiters: Deque[asyncio.Future] = deque()
+        self._created = 0
+
+    @property
+    def available(self) -> int:
+        return len(self._idle) + self.size - self._created
+
+    async def acquire(self, *, loop: 'asyncio.AbstractEventLoop' = None) -> Service:
+        if self._idle:
+            return self._idle.pop()
+
+        if self._created < self.size:
+            instance = self.service(self.venom)
+            self._created += 1
+            return instance
+
+        if loop is None:
+            loop = asyncio.get_event_loop()
+
+        waiter = loop.create_future()
+        self._waiters.append(waiter)
+
+        try:
+            return await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                self.release(waiter.result())
+            raise
+
+    def release(self, instance: Service) -> None:
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(instance)
+                return
+        self._idle.append(instance)
+
+    async def invoke(self, method: Method, request: Message, loop: 'asyncio.AbstractEventLoop' = None) -> Message:
+        instance = await self.acquire(loop=loop)
+        try:
+            return await method.invoke(instance, request, loop=loop)
+        finally:
+            self.release(instance)
+
+    def __getattr__(self, name: str) -> Callable[[Message], Awaitable[Message]]:
+        if name.startswith('__'):
+            raise AttributeError(name)
+
+        try:
+            method = self.__methods__[name]
+        except KeyError:
+            raise AttributeError(name)
+
+        async def invoke(request: Message, loop: 'asyncio.AbstractEventLoop' = None) -> Message:
+            return await self.invoke(method, request, loop=loop)
+
+        return invoke
+
+    def __repr__(self):
+        return f'<ServicePool [{self.service.__meta__.name}] {self.available}/{self.size} available>'
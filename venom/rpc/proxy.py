@@ -6,12 +6,31 @@ S = TypeVar('S', bound=Service)
 
 
 class ServiceProxy(Generic[S]):
-    # TODO define life-time. can be global or request or session.
+    """
+    Resolves to an instance of another service in the same :class:`venom.rpc.Venom`.
+
+    The life-time of the instance is defined by the ``Meta.scope`` of the referenced service. When the referenced
+    service always resolves to the same object --- a singleton, a pool or a client --- the reference is cached on the
+    accessing instance after the first access.
+    """
+
     def __init__(self, reference: Union[str, Type[S]]) -> None:
         self.reference = reference
+        self._attr_name = None
+
+    def __set_name__(self, owner: Any, name: str):
+        self._attr_name = name
 
     def __get__(self, service: Service, owner: Any = None) -> S:
-        return cast(S, service.venom.get_instance(self.reference))
+        if service is None:
+            return self
+
+        venom = service.venom
+        instance = venom.get_instance(self.reference)
+
+        if self._attr_name and venom.is_static(self.reference):
+            setattr(service, self._attr_name, instance)
+        return cast(S, instance)
 
 
 def proxy(service: Type[S]) -> S:
@@ -1,14 +1,14 @@
-from typing import Type, Set
+from typing import Type, Set, Union
 
 from venom import Message
 from venom.fields import FieldDescriptor
 from venom.message import fields
-from venom.rpc import Service
+from venom.rpc import Service, ServicePool
 from venom.rpc.method import Method
 
 
 class Reflect(object):
-    services: Set[Service]
+    services: Set[Union[Service, ServicePool, Type[Service]]]
     methods: Set[Type[Method]]
     messages: Set[Type[Message]]
 
@@ -34,7 +34,7 @@ class Reflect(object):
         self._add_message(method.response)
         self.methods.add(method)
 
-    def add(self, service: Service):
+    def add(self, service: Union[Service, ServicePool, Type[Service]]):
         for method in service.__methods__.values():
             self._add_method(method)
         self.services.add(service)
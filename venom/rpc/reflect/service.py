@@ -1,4 +1,6 @@
-from venom.rpc import Service, Venom
+from typing import Type, Union
+
+from venom.rpc import Service, Venom, ServicePool
 from venom.rpc import http
 from venom.rpc.reflect.openapi import make_openapi_schema
 from venom.rpc.reflect.reflect import Reflect
@@ -21,7 +23,7 @@ class ReflectService(Service):
 
         Venom.on_add_public_service.connect(self._reflect_service, sender=venom)
 
-    def _reflect_service(self, sender: Venom, service: Service):
+    def _reflect_service(self, sender: Venom, service: Union[Service, ServicePool, Type[Service]]):
         self.reflect.add(service)
 
     @http.GET('/openapi.json')
@@ -0,0 +1,198 @@
+import re
+from urllib.parse import unquote
+
+from typing import Any, Dict, List, Tuple, Optional, Callable, Union, Set
+
+from venom.rpc.method import Method, HTTPVerb, _RULE_PARAMETER_RE
+
+_PathParameters = Dict[str, Any]
+
+
+def _parse_int(segment: str) -> Optional[int]:
+    if segment.isdecimal():
+        return int(segment)
+    return None
+
+
+def _parse_str(segment: str) -> Optional[str]:
+    if segment:
+        return unquote(segment)
+    return None
+
+
+class _Parameter(object):
+    """
+    A path segment that is entirely made up of one parameter, e.g. ``{id}``.
+    """
+    __slots__ = ('key', 'name', 'parse')
+
+    def __init__(self, name: str, parse: Callable[[str], Any]) -> None:
+        self.key = name
+        self.name = name
+        self.parse = parse
+
+    def match(self, segment: str, params: _PathParameters) -> bool:
+        value = self.parse(segment)
+        if value is None:
+            return False
+        params[self.name] = value
+        return True
+
+
+class _PatternParameter(object):
+    """
+    A path segment that mixes one or more parameters with literal text, e.g. ``{name}.json``.
+    """
+    __slots__ = ('key', 'pattern', 'parsers')
+
+    def __init__(self, segment: str, parsers: List[Tuple[str, Callable[[str], Any]]]) -> None:
+        self.key = segment
+        self.parsers = parsers
+
+        pattern = []
+        for i, part in enumerate(re.split(r'{[^}]+}', segment)):
+            if i > 0:
+                pattern.append('([^/]+?)')
+            pattern.append(re.escape(part))
+        self.pattern = re.compile(''.join(pattern) + '$')
+
+    def match(self, segment: str, params: _PathParameters) -> bool:
+        m = self.pattern.match(segment)
+        if m is None:
+            return False
+
+        values = {}
+        for (name, parse), group in zip(self.parsers, m.groups()):
+            value = parse(group)
+            if value is None:
+                return False
+            values[name] = value
+
+        params.update(values)
+        return True
+
+
+class _Node(object):
+    __slots__ = ('children', 'parameters', 'value')
+
+    def __init__(self) -> None:
+        self.children: Dict[str, '_Node'] = {}
+        self.parameters: List[Tuple[Union[_Parameter, _PatternParameter], '_Node']] = []
+        self.value: Any = None
+
+    def child(self, segment: str) -> '_Node':
+        try:
+            return self.children[segment]
+        except KeyError:
+            self.children[segment] = node = _Node()
+            return node
+
+    def parameter_child(self, parameter: Union[_Parameter, _PatternParameter]) -> '_Node':
+        for other, node in self.parameters:
+            if other.key == parameter.key:
+                return node
+
+        node = _Node()
+        if isinstance(parameter, _PatternParameter):
+            # segments with literal text are more specific and are therefore tried first
+            position = sum(1 for other, _ in self.parameters if isinstance(other, _PatternParameter))
+            self.parameters.insert(position, (parameter, node))
+        else:
+            self.parameters.append((parameter, node))
+        return node
+
+    def match(self, segments: List[str], index: int, params: _PathParameters) -> Any:
+        if index == len(segments):
+            return self.value
+
+        segment = segments[index]
+
+        try:
+            value = self.children[segment].match(segments, index + 1, params)
+            if value is not None:
+                return value
+        except KeyError:
+            pass
+
+        for parameter, node in self.parameters:
+            size = len(params)
+            if parameter.match(segment, params):
+                value = node.match(segments, index + 1, params)
+                if value is not None:
+                    return value
+
+                # discard parameters picked up along a branch that did not match
+                for name in list(params)[size:]:
+                    del params[name]
+        return None
+
+
+class Router(object):
+    """
+    HTTP router for the methods of a :class:`venom.rpc.Venom`.
+
+    Routes are kept in one prefix tree per HTTP verb with a node for every path segment. Static segments are resolved
+    with a dictionary lookup, so the time taken to route a request depends on the length of its path rather than on
+    the number of routes. Path parameters of integer fields only match segments made up of digits and are passed on
+    as ``int``; all other path parameters are passed on as (unquoted) strings. Parameters are keyed by JSON name.
+
+    Static segments take precedence over segments with parameters, and segments that mix parameters with literal text
+    take precedence over segments made up of a single parameter.
+    """
+
+    def __init__(self) -> None:
+        self._trees: Dict[HTTPVerb, _Node] = {}
+
+    @staticmethod
+    def _segment_parser(method: Method, name: str) -> Tuple[str, Callable[[str], Any]]:
+        field = method.request.__fields__[name]
+        if not field.repeated and field.type == int:
+            return field.json_name, _parse_int
+        return field.json_name, _parse_str
+
+    def add(self, method: Method, value: Any) -> None:
+        node = self._trees.setdefault(method.http_method, _Node())
+
+        for segment in method.http_path.split('/'):
+            names = [m.group(1) for m in re.finditer(_RULE_PARAMETER_RE, segment)]
+            if not names:
+                node = node.child(segment)
+            elif _RULE_PARAMETER_RE.fullmatch(segment):
+                node = node.parameter_child(_Parameter(*self._segment_parser(method, names[0])))
+            else:
+                node = node.parameter_child(_PatternParameter(segment, [self._segment_parser(method, name)
+                                                                        for name in names]))
+
+        if node.value is not None:
+            raise ValueError(f"HTTP route '{method.http_method.value} {method.http_path}' is already in use")
+        node.value = value
+
+    def match(self, verb: Union[HTTPVerb, str], path: str) -> Optional[Tuple[Any, _PathParameters]]:
+        """
+        :param verb: the HTTP verb
+        :param path: the raw (percent-encoded) path of the request
+        :returns: a ``(value, path_parameters)`` tuple or ``None`` if no route matches.
+        """
+        if isinstance(verb, str):
+            try:
+                verb = HTTPVerb[verb]
+            except KeyError:
+                return None
+
+        try:
+            tree = self._trees[verb]
+        except KeyError:
+            return None
+
+        params = {}
+        value = tree.match(path.split('/'), 0, params)
+        if value is None:
+            return None
+        return value, params
+
+    def allowed_verbs(self, path: str) -> Set[HTTPVerb]:
+        """
+        :returns: the HTTP verbs that have a route matching the path.
+        """
+        segments = path.split('/')
+        return {verb for verb, tree in self._trees.items() if tree.match(segments, 0, {}) is not None}
@@ -0,0 +1,195 @@
+"""
+Fan-out of one method call to several shards of a service, with the repeated results merged in order.
+
+Each shard is a client with the method --- such as :class:`venom.rpc.comms.aiohttp.HTTPClient` --- or the client of a
+stub resolved through a :class:`venom.rpc.proxy.ServiceProxy`. Every shard must return its results sorted by the
+same sort key; the merged results are then sorted too::
+
+    clients = [HTTPClient(SearchStub, url) for url in shard_urls]
+    async for hit in scatter_gather(clients, 'search', SearchRequest(query='venom', page_size=50),
+                                    field='hits', sort_key='score', descending=True, timeout=0.5):
+        ...
+
+Results are merged lazily. When the request has a ``page_token`` field and the response a ``next_page_token`` field,
+the next page of a shard is only requested once the merge has consumed the previous one, so that at most one page per
+shard is held in memory. Shards that time out are left out of the results and recorded in
+:attr:`ScatterGather.failures`.
+"""
+import asyncio
+import heapq
+
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, Optional, Sequence, Tuple, Type, Union
+
+from venom.message import Message
+
+
+class _Descending(object):
+    __slots__ = ('value',)
+
+    def __init__(self, value):
+        self.value = value
+
+    def __lt__(self, other: '_Descending'):
+        return other.value < self.value
+
+    def __eq__(self, other: '_Descending'):
+        return self.value == other.value
+
+
+class ScatterGather(AsyncIterator[Any]):
+    """
+    An async iterator over the merged results of a method called on several shards.
+
+    :param shards: the objects to call the method on.
+    :param method: the name of the method.
+    :param request: the request sent to every shard; it is copied for every page.
+    :param field: the repeated response field to merge. Defaults to the ``gather_field`` option of the method.
+    :param sort_key: the name of the field to sort items by, or a function returning the sort key of an item. Defaults
+        to the ``sort_key`` option of the method; without one, items are compared directly.
+    :param descending: whether items are sorted in descending order. Defaults to the ``descending`` option of the
+        method.
+    :param timeout: the number of seconds to wait for each page of a shard.
+    :param limit: the maximum number of items to return.
+    :param tolerate: the exceptions after which a shard is left out instead of failing the whole call.
+    """
+
+    def __init__(self,
+                 shards: Sequence[Any],
+                 method: str,
+                 request: Message,
+                 *,
+                 field: str = None,
+                 sort_key: Union[str, Callable[[Any], Any]] = None,
+                 descending: bool = None,
+                 timeout: float = None,
+                 limit: int = None,
+                 page_token: str = 'page_token',
+                 next_page_token: str = 'next_page_token',
+                 tolerate: Tuple[Type[BaseException], ...] = (asyncio.TimeoutError,)) -> None:
+        self.shards = list(shards)
+        self.method = method
+        self.request = request
+
+        options = self._method_options()
+        self.field = field or options.get('gather_field')
+        if self.field is None:
+            raise ValueError(f'No repeated response field given to merge the results of {method}')
+
+        if sort_key is None:
+            sort_key = options.get('sort_key')
+        if isinstance(sort_key, str):
+            name = sort_key
+            sort_key = lambda item: item.get(name)
+        self.sort_key = sort_key or (lambda item: item)
+        self.descending = options.get('descending', False) if descending is None else descending
+
+        self.timeout = timeout
+        self.limit = limit
+        self.page_token = page_token
+        self.next_page_token = next_page_token
+        self.tolerate = tolerate
+        self.failures: Dict[int, BaseException] = {}
+
+        self._iterator: Optional[AsyncIterator[Any]] = None
+
+    def _method_options(self) -> Dict[str, Any]:
+        for shard in self.shards:
+            methods = getattr(shard, '__methods__', None)
+            if methods and self.method in methods:
+                return methods[self.method].options
+        return {}
+
+    def _key(self, item):
+        key = self.sort_key(item)
+        return _Descending(key) if self.descending else key
+
+    async def _fetch(self, index: int, token: str = None) -> Tuple[Iterator[Any], Optional[str]]:
+        """
+        :returns: an iterator over the items of a page and the token of the next page, if any.
+        """
+        request = self.request
+        if token is not None:
+            request = type(request)()
+            for key in self.request:
+                request[key] = self.request[key]
+            request[self.page_token] = token
+
+        call = getattr(self.shards[index], self.method)(request)
+        if self.timeout is not None:
+            call = asyncio.wait_for(call, self.timeout)
+
+        response = await call
+        next_token = None
+        if self.page_token in request.__fields__ and self.next_page_token in response.__fields__:
+            next_token = response.get(self.next_page_token) or None
+        return iter(getattr(response, self.field)), next_token
+
+    async def _next_item(self, index: int, pages: List) -> Optional[Tuple[Any]]:
+        """
+        :returns: a ``(key, index, item)`` heap entry for the next item of a shard, or ``None`` once it is exhausted.
+        """
+        while True:
+            items, token = pages[index]
+            for item in items:
+                return self._key(item), index, item
+
+            if token is None:
+                return None
+
+            try:
+                pages[index] = await self._fetch(index, token)
+            except self.tolerate as e:
+                self.failures[index] = e
+                return None
+
+    async def _merge(self) -> AsyncIterator[Any]:
+        first_pages = await asyncio.gather(*(self._fetch(index) for index in range(len(self.shards))),
+                                           return_exceptions=True)
+
+        pages: List[Tuple[Iterator[Any], Optional[str]]] = []
+        for index, page in enumerate(first_pages):
+            if isinstance(page, BaseException):
+                if not isinstance(page, self.tolerate):
+                    raise page
+                self.failures[index] = page
+                page = (iter(()), None)
+            pages.append(page)
+
+        heap = []
+        for index in range(len(pages)):
+            entry = await self._next_item(index, pages)
+            if entry is not None:
+                heap.append(entry)
+        heapq.heapify(heap)
+
+        count = 0
+        while heap and (self.limit is None or count < self.limit):
+            key, index, item = heap[0]
+            yield item
+            count += 1
+
+            entry = await self._next_item(index, pages)
+            if entry is None:
+                heapq.heappop(heap)
+            else:
+                heapq.heapreplace(heap, entry)
+
+    def __aiter__(self) -> 'ScatterGather':
+        return self
+
+    async def __anext__(self):
+        if self._iterator is None:
+            self._iterator = self._merge()
+        return await self._iterator.__anext__()
+
+    async def all(self) -> List[Any]:
+        return [item async for item in self]
+
+
+def scatter_gather(shards: Sequence[Any], method: str, request: Message, **kwargs) -> ScatterGather:
+    """
+    Calls ``method`` on every shard concurrently and merges the repeated response fields in sort order.
+
+    See :class:`ScatterGather` for the keyword arguments.
+    """
+    return ScatterGather(shards, method, request, **kwargs)
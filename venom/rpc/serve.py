@@ -0,0 +1,392 @@
+"""
+Runs a Venom over HTTP in several pre-forked worker processes::
+
+    python -m venom.rpc.serve myapp.api:venom --workers 4 --port 8080
+
+The Venom (or a callable returning one) is loaded and frozen once in the supervising process and then shared by forked
+workers. Workers accept connections on the same port --- by default with one ``SO_REUSEPORT`` socket each, so that the
+kernel balances connections between them, or otherwise on a single listening socket they inherit. Given ``--path``,
+workers accept connections on a Unix domain socket instead, for clients on the same host such as sidecars; these
+connect with an :class:`venom.rpc.comms.aiohttp.HTTPClient` base URL of ``unix:///path/to/socket``. Workers that exit
+are restarted. Request counters are kept per worker in shared memory and can be read from the supervisor.
+"""
+import argparse
+import asyncio
+import ctypes
+import logging
+import os
+import signal
+import socket
+import stat
+import sys
+import time
+from importlib import import_module
+from multiprocessing.sharedctypes import RawArray
+
+from typing import Union, Callable, List, Optional, Type, Tuple, NamedTuple
+
+from venom.protocol import JSONProtocol, Protocol
+
+logger = logging.getLogger(__name__)
+
+_REQUESTS, _ERRORS, _LATENCY_US, _RESTARTS = range(4)
+_COUNTERS = 4
+
+
+class WorkerMetrics(NamedTuple):
+    index: int
+    pid: Optional[int]
+    requests: int
+    errors: int
+    latency_us: int
+    restarts: int
+
+
+class Metrics(NamedTuple):
+    requests: int
+    errors: int
+    latency_us: int
+    restarts: int
+    workers: Tuple[WorkerMetrics, ...]
+
+    @property
+    def mean_latency_ms(self) -> float:
+        if not self.requests:
+            return 0.0
+        return self.latency_us / self.requests / 1000
+
+
+def load_venom(spec: Union[str, 'venom.rpc.Venom', Callable[[], 'venom.rpc.Venom']]) -> 'venom.rpc.Venom':
+    """
+    :param spec: a :class:`venom.rpc.Venom`, a callable returning one, or a ``'module:attribute'`` string referring to
+        either.
+    """
+    from venom.rpc import Venom
+
+    if isinstance(spec, str):
+        module_name, _, attribute = spec.partition(':')
+        spec = getattr(import_module(module_name), attribute or 'venom')
+
+    if not isinstance(spec, Venom):
+        spec = spec()
+
+    if not isinstance(spec, Venom):
+        raise ValueError(f'Expected a Venom instance, got {spec!r}')
+    return spec
+
+
+class Server(object):
+    """
+    Supervises ``workers`` forked processes serving the same :class:`venom.rpc.Venom` over HTTP.
+
+    :param reuse_port: when ``True``, every worker binds its own socket with ``SO_REUSEPORT``; otherwise the server
+        binds one socket that all workers accept from. Defaults to ``True`` where ``SO_REUSEPORT`` is available and a
+        fixed port is given.
+    :param path: the path of a Unix domain socket to serve on instead of ``host`` and ``port``. An existing socket file
+        at the path is replaced.
+    """
+
+    def __init__(self,
+                 venom: Union[str, 'venom.rpc.Venom', Callable[[], 'venom.rpc.Venom']],
+                 host: str = '0.0.0.0',
+                 port: int = 8080,
+                 *,
+                 workers: int = None,
+                 path: str = None,
+                 reuse_port: bool = None,
+                 protocol_factory: Type[Protocol] = JSONProtocol,
+                 backlog: int = 128,
+                 shutdown_timeout: float = 10.0,
+                 restart_delay: float = 1.0) -> None:
+        if workers is None:
+            workers = os.cpu_count() or 1
+
+        if workers < 1:
+            raise ValueError('A server needs at least one worker')
+
+        if path is not None:
+            if reuse_port:
+                raise ValueError('SO_REUSEPORT cannot be used with a Unix domain socket')
+            reuse_port = False
+        elif reuse_port is None:
+            reuse_port = hasattr(socket, 'SO_REUSEPORT') and port != 0
+        elif reuse_port and not hasattr(socket, 'SO_REUSEPORT'):
+            raise RuntimeError('SO_REUSEPORT is not supported on this platform')
+
+        self.venom = load_venom(venom)
+        self.host = host
+        self.port = port
+        self.path = path
+        self.workers = workers
+        self.reuse_port = reuse_port
+        self.protocol_factory = protocol_factory
+        self.backlog = backlog
+        self.shutdown_timeout = shutdown_timeout
+        self.restart_delay = restart_delay
+
+        self._counters = RawArray(ctypes.c_uint64, workers * _COUNTERS)
+        self._pids: List[Optional[int]] = [None] * workers
+        self._started_at: List[float] = [0.0] * workers
+        self._socket: Optional[socket.socket] = None
+        self._stopping = False
+
+    @property
+    def address(self) -> Tuple[str, int]:
+        return self.host, self.port
+
+    @property
+    def pids(self) -> List[Optional[int]]:
+        return list(self._pids)
+
+    def _bind(self, reuse_port: bool) -> socket.socket:
+        if self.path is not None:
+            if os.path.exists(self.path) and stat.S_ISSOCK(os.stat(self.path).st_mode):
+                os.unlink(self.path)
+
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.bind(self.path)
+            sock.listen(self.backlog)
+            sock.setblocking(False)
+            return sock
+
+        sock = socket.socket(socket.AF_INET6 if ':' in self.host else socket.AF_INET, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        if reuse_port:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        sock.bind((self.host, self.port))
+        sock.listen(self.backlog)
+        sock.setblocking(False)
+        return sock
+
+    def start(self) -> None:
+        """
+        Freezes the Venom, binds the listening socket and forks all workers.
+        """
+        if not self.venom.frozen:
+            self.venom.freeze(protocols=(self.protocol_factory,))
+
+        if not self.reuse_port:
+            self._socket = self._bind(reuse_port=False)
+            if self.path is None:
+                self.port = self._socket.getsockname()[1]
+
+        for index in range(self.workers):
+            self._spawn(index)
+
+    def _spawn(self, index: int) -> None:
+        pid = os.fork()
+        if pid == 0:
+            status = 1
+            try:
+                self._run_worker(index)
+                status = 0
+            except BaseException:
+                logger.exception('Worker %d failed', index)
+            finally:
+                os._exit(status)
+
+        self._pids[index] = pid
+        self._started_at[index] = time.monotonic()
+
+    def _run_worker(self, index: int) -> None:
+        from aiohttp import web
+        from venom.rpc.comms.aiohttp import create_app
+
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(signum, signal.SIG_DFL)
+
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+
+        sock = self._socket if self._socket is not None else self._bind(reuse_port=True)
+        counters = self._counters
+        offset = index * _COUNTERS
+
+        @web.middleware
+        async def count_requests(request, handler):
+            start = time.monotonic()
+            status = 500
+            try:
+                response = await handler(request)
+                status = response.status
+                return response
+            except web.HTTPException as e:
+                status = e.status
+                raise
+            finally:
+                counters[offset + _REQUESTS] += 1
+                counters[offset + _LATENCY_US] += int((time.monotonic() - start) * 1000000)
+                if status >= 500:
+                    counters[offset + _ERRORS] += 1
+
+        app = create_app(self.venom, web.Application(middlewares=[count_requests]), self.protocol_factory)
+        runner = web.AppRunner(app, handle_signals=False)
+
+        stopped = asyncio.Event()
+        loop.add_signal_handler(signal.SIGTERM, stopped.set)
+        loop.add_signal_handler(signal.SIGINT, stopped.set)
+
+        async def serve():
+            await runner.setup()
+            await web.SockSite(runner, sock, shutdown_timeout=self.shutdown_timeout).start()
+            await stopped.wait()
+            await runner.cleanup()
+
+        try:
+            loop.run_until_complete(serve())
+        finally:
+            loop.close()
+
+    def poll(self) -> None:
+        """
+        Reaps workers that have exited and restarts them, unless the server is stopping.
+
+        Workers that exit within ``restart_delay`` seconds of being started are restarted only once that delay has
+        passed, so that a crashing worker does not keep the supervisor busy.
+        """
+        for index, pid in enumerate(self._pids):
+            if pid is None:
+                if not self._stopping and time.monotonic() - self._started_at[index] >= self.restart_delay:
+                    self._counters[index * _COUNTERS + _RESTARTS] += 1
+                    self._spawn(index)
+                continue
+
+            try:
+                exited, status = os.waitpid(pid, os.WNOHANG)
+            except ChildProcessError:
+                exited, status = pid, 0
+
+            if exited == 0:
+                continue
+
+            self._pids[index] = None
+            if not self._stopping:
+                logger.warning('Worker %d (pid %d) exited with status %d; restarting', index, pid, status)
+
+    def stop(self) -> None:
+        """
+        Asks all workers to finish their requests and exit, and waits for them. Workers still running after
+        ``shutdown_timeout`` seconds are killed.
+        """
+        self._stopping = True
+
+        for pid in self._pids:
+            if pid is not None:
+                try:
+                    os.kill(pid, signal.SIGTERM)
+                except ProcessLookupError:
+                    pass
+
+        deadline = time.monotonic() + self.shutdown_timeout
+        while any(pid is not None for pid in self._pids):
+            if time.monotonic() > deadline:
+                for pid in self._pids:
+                    if pid is not None:
+                        try:
+                            os.kill(pid, signal.SIGKILL)
+                        except ProcessLookupError:
+                            pass
+                deadline = float('inf')
+            self.poll()
+            time.sleep(0.01)
+
+        if self._socket is not None:
+            self._socket.close()
+            self._socket = None
+
+            if self.path is not None and os.path.exists(self.path):
+                os.unlink(self.path)
+
+    def metrics(self) -> Metrics:
+        """
+        :returns: the counters of all workers, including those of previous processes in the same worker slot.
+        """
+        workers = []
+        for index in range(self.workers):
+            values = self._counters[index * _COUNTERS:(index + 1) * _COUNTERS]
+            workers.append(WorkerMetrics(index,
+                                         self._pids[index],
+                                         values[_REQUESTS],
+                                         values[_ERRORS],
+                                         values[_LATENCY_US],
+                                         values[_RESTARTS]))
+
+        return Metrics(sum(worker.requests for worker in workers),
+                       sum(worker.errors for worker in workers),
+                       sum(worker.latency_us for worker in workers),
+                       sum(worker.restarts for worker in workers),
+                       tuple(workers))
+
+    def run(self, *, metrics_interval: float = None) -> None:
+        """
+        Starts the server and supervises the workers until the process receives ``SIGINT`` or ``SIGTERM``.
+
+        :param metrics_interval: when given, aggregated metrics are logged every ``metrics_interval`` seconds.
+        """
+        def request_stop(signum, frame):
+            self._stopping = True
+
+        previous_handlers = {signum: signal.signal(signum, request_stop) for signum in (signal.SIGINT, signal.SIGTERM)}
+
+        self.start()
+        if self.path is not None:
+            logger.info('Serving on %s with %d workers', self.path, self.workers)
+        else:
+            logger.info('Serving on %s:%d with %d workers', self.host, self.port, self.workers)
+
+        last_report = time.monotonic()
+        try:
+            while not self._stopping:
+                self.poll()
+                time.sleep(0.1)
+
+                if metrics_interval and time.monotonic() - last_report >= metrics_interval:
+                    last_report = time.monotonic()
+                    metrics = self.metrics()
+                    logger.info('%d requests, %d errors, %.2f ms mean latency, %d restarts',
+                                metrics.requests, metrics.errors, metrics.mean_latency_ms, metrics.restarts)
+        finally:
+            self.stop()
+            for signum, handler in previous_handlers.items():
+                signal.signal(signum, handler)
+
+
+def serve(venom: Union[str, 'venom.rpc.Venom', Callable[[], 'venom.rpc.Venom']],
+          host: str = '0.0.0.0',
+          port: int = 8080,
+          *,
+          metrics_interval: float = None,
+          **kwargs) -> None:
+    """
+    Serves the Venom with a pre-forking :class:`Server` until interrupted.
+    """
+    Server(venom, host, port, **kwargs).run(metrics_interval=metrics_interval)
+
+
+def main(argv: List[str] = None) -> None:
+    parser = argparse.ArgumentParser(prog='python -m venom.rpc.serve',
+                                     description='Serve a Venom over HTTP from several worker processes.')
+    parser.add_argument('venom', help="'module:attribute' of a Venom or of a callable returning one")
+    parser.add_argument('--host', default='0.0.0.0')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--path', default=None, help='serve on a Unix domain socket at this path instead')
+    parser.add_argument('--workers', type=int, default=None, help='number of workers; defaults to the CPU count')
+    parser.add_argument('--no-reuse-port', dest='reuse_port', action='store_false', default=None,
+                        help='accept from a single shared socket instead of one SO_REUSEPORT socket per worker')
+    parser.add_argument('--metrics-interval', type=float, default=None, help='log metrics every N seconds')
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(process)d %(levelname)s %(message)s')
+    sys.path.insert(0, os.getcwd())
+
+    serve(args.venom,
+          args.host,
+          args.port,
+          workers=args.workers,
+          path=args.path,
+          reuse_port=args.reuse_port,
+          metrics_interval=args.metrics_interval)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,10 +1,26 @@
-from typing import Dict, ClassVar, Type
+import enum
+from functools import partial
+
+from typing import Dict, ClassVar, Type, Mapping, Callable, Any
 
 from venom.common import IntegerValueConverter, BoolValueConverter, DateTimeConverter, DateConverter
 from venom.common import StringValueConverter, NumberValueConverter
 from venom.rpc.context import RequestContextDescriptor
 from venom.rpc.method import Method, MethodDescriptor
-from venom.util import meta, MetaDict
+from venom.util import meta, MetaDict, LazyMapping
+
+
+class ServiceScope(enum.Enum):
+    """
+    The life-time of the instances of a public service.
+
+    - ``SINGLETON``: one instance is shared by all requests.
+    - ``REQUEST``: a new instance is created for, and cached in, each :class:`venom.rpc.RequestContext`.
+    - ``POOLED``: instances are checked out of a pool of at most ``Meta.pool_size`` instances for each invocation.
+    """
+    SINGLETON = 'singleton'
+    REQUEST = 'request'
+    POOLED = 'pooled'
 
 
 class ServiceManager(object):
@@ -26,6 +42,8 @@ class ServiceManager(object):
 
         if not meta_changes.get('http_path', None):
             meta.http_path = f"/{meta.name.lower().replace('_', '-')}"
+
+        meta.scope = ServiceScope(meta.scope)
         return meta
 
     def prepare_method(self, service: Type['Service'], method: MethodDescriptor, name: str):
@@ -35,36 +53,68 @@ class ServiceManager(object):
         pass
 
 
+def _deferred_items(mapping: Mapping[str, Any]) -> Dict[str, Callable[[], Any]]:
+    return {name: partial(mapping.__getitem__, name) for name in mapping}
+
+
+class _LazyMethod(object):
+    """
+    Stands in for a method of a lazy service until the method is prepared on first access.
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+    def __get__(self, instance, owner):
+        return owner.__methods__[self.name].__get__(instance, owner)
+
+
 class ServiceMeta(type):
     def __new__(metacls, what, bases=(), members=None):
         meta_, meta_changes = meta(bases, members)
         meta_ = meta_.manager.prepare_meta(what, meta_, meta_changes)
         manager = meta_.manager(meta_, meta_changes)
-        method_descriptors = {}
+        descriptor_factories = {}
 
         for base in bases:
             if isinstance(base, ServiceMeta):
-                method_descriptors.update(base.__method_descriptors__)
+                descriptor_factories.update(_deferred_items(base.__method_descriptors__))
 
-        for name, member in members.items():
-            if isinstance(member, MethodDescriptor):
-                method_descriptors[name] = member
+        descriptor_factories.update(_deferred_items({name: member
+                                                     for name, member in members.items()
+                                                     if isinstance(member, MethodDescriptor)}))
 
         stub = meta_changes.get('stub')
         if stub:
             if not isinstance(stub, type) and issubclass(stub, Service):
                 raise TypeError('Meta.stub must be a Service')
 
+            for name, factory in _deferred_items(stub.__method_descriptors__).items():
+                if name not in descriptor_factories:
+                    descriptor_factories[name] = factory
+
+        # NOTE in lazy mode, descriptors inherited from other lazy services or stubs are only resolved when needed.
+        method_descriptors = LazyMapping(descriptor_factories)
+        if not meta_.lazy:
+            method_descriptors = dict(method_descriptors)
+
         members['__manager__'] = manager
         members['__meta__'] = manager.meta
         members['__method_descriptors__'] = method_descriptors
         members['__stub__'] = stub
-        cls = super(ServiceMeta, metacls).__new__(metacls, name, bases, members)
+        cls = super(ServiceMeta, metacls).__new__(metacls, what, bases, members)
 
-        if stub:
-            for name, method in stub.__method_descriptors__.items():
-                if name not in method_descriptors:
-                    method_descriptors[name] = method
+        if meta_.lazy:
+            def prepare(name):
+                method = manager.prepare_method(cls, method_descriptors[name], name)
+                setattr(cls, name, method)
+                return method
+
+            cls.__methods__ = LazyMapping({name: partial(prepare, name) for name in method_descriptors})
+
+            for name in method_descriptors:
+                setattr(cls, name, _LazyMethod(name))
+            return cls
 
         cls.__methods__ = methods = {
             name: manager.prepare_method(cls, method, name)
@@ -83,8 +133,8 @@ class Service(object, metaclass=ServiceMeta):
     """
     __meta__: ClassVar['venom.util.AttributeDict'] = None
     __manager__: ClassVar[ServiceManager] = None
-    __method_descriptors__: ClassVar[Dict[str, MethodDescriptor]] = None
-    __methods__: ClassVar[Dict[str, Method]] = None
+    __method_descriptors__: ClassVar[Mapping[str, MethodDescriptor]] = None
+    __methods__: ClassVar[Mapping[str, Method]] = None
     __stub__: ClassVar[Type['Service']] = None
 
     context = RequestContextDescriptor()
@@ -105,6 +155,9 @@ class Service(object, metaclass=ServiceMeta):
             DateConverter)
         stub = None
         http_path = None
+        scope = ServiceScope.SINGLETON
+        pool_size = 8
+        lazy = False
 
     def __repr__(self):
         return f'<Service [{self.__meta__.name}]>'
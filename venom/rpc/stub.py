@@ -1,7 +1,10 @@
+from functools import partial
+
 from typing import Type
 
 from venom.rpc.method import MethodDescriptor
 from venom.rpc.service import Service, ServiceMeta, ServiceManager
+from venom.util import LazyMapping
 
 
 class StubManager(ServiceManager):
@@ -12,10 +15,18 @@ class StubManager(ServiceManager):
 class StubMeta(ServiceMeta):
     def __new__(metacls, what, bases=None, members=None):
         cls = super().__new__(metacls, what, bases, members)
-        cls.__method_descriptors__ = {
-            name: method.stub(cls, name)
-            for name, method in cls.__method_descriptors__.items()
-        }
+        method_descriptors = cls.__method_descriptors__
+
+        if cls.__meta__.lazy:
+            cls.__method_descriptors__ = LazyMapping({
+                name: partial(lambda name: method_descriptors[name].stub(cls, name), name)
+                for name in method_descriptors
+            })
+        else:
+            cls.__method_descriptors__ = {
+                name: method.stub(cls, name)
+                for name, method in method_descriptors.items()
+            }
         return cls
 
 
@@ -55,6 +55,18 @@ def mock_instance(service: Type[Service], *dependencies: Iterable[Type[Service]]
     return venom.get_instance(service)
 
 
+class Clock(object):
+    """
+    A clock for tests that only moves when ``now`` is set, for code that takes a ``clock`` callable.
+    """
+
+    def __init__(self, now: float = 0.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
 def sync(coro):
     try:
         loop = asyncio.get_event_loop()
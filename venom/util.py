@@ -1,4 +1,6 @@
-from typing import Tuple
+from collections.abc import Mapping
+
+from typing import Tuple, Callable, Dict, Any, Iterator
 
 
 # FIXME should be Generic
@@ -62,3 +64,34 @@ class cached_property(object):
         setattr(instance, self._attr_name, attr)
 
         return attr
+
+
+class LazyMapping(Mapping):
+    """
+    Read-only mapping with a fixed set of keys whose values are built on first access by calling a factory.
+    """
+
+    def __init__(self, factories: Dict[Any, Callable[[], Any]]):
+        self._factories = dict(factories)
+        self._values = {}
+
+    def __getitem__(self, key):
+        try:
+            return self._values[key]
+        except KeyError:
+            pass
+
+        value = self._values[key] = self._factories[key]()
+        return value
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._factories)
+
+    def __len__(self) -> int:
+        return len(self._factories)
+
+    def __contains__(self, key) -> bool:
+        return key in self._factories
+
+    def __repr__(self):
+        return f'LazyMapping({list(self._factories)})'